@@ -0,0 +1,248 @@
+"""
+Watch-history analytics from pre-aggregated, array-backed day buckets.
+
+Every series (all videos, each category, each channel) is an array of daily
+counts starting at a shared origin day; hour-of-day counts are 24 slots per
+day in one flat array, so any date range is a slice.
+
+The buckets are saved to ANALYTICS_FILE together with how many history
+entries they cover, so each run only folds in videos watched since.
+"""
+
+import base64
+import json
+import os
+import zlib
+from array import array
+from datetime import date, datetime, timedelta
+from focus_manager import HISTORY_FILE, LEARNING_LOG_PLACEHOLDER, get_watch_history, write_json_atomic
+
+ANALYTICS_FILE = "analytics_cache.json"
+ANALYTICS_VERSION = 2
+
+# Same assumption as get_watch_stats: an average video is 10 minutes.
+MINUTES_PER_VIDEO = 10
+
+DIMENSIONS = ("category", "channel")
+
+SPARK_CHARS = "▁▂▃▄▅▆▇█"
+
+# Process-level aggregates plus the history stamp they were built from.
+_cache = {"stamp": None, "data": None}
+
+def _history_stamp():
+    try:
+        st = os.stat(HISTORY_FILE)
+    except FileNotFoundError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+# Most channel-days are zero, so buckets are stored deflated.
+def _pack(values):
+    return base64.b64encode(zlib.compress(values.tobytes(), 1)).decode("ascii")
+
+def _unpack(text):
+    values = array("I")
+    values.frombytes(zlib.decompress(base64.b64decode(text)))
+    return values
+
+def _empty():
+    return {
+        "processed": 0,
+        "last": None,
+        "origin": None,
+        "total": array("I"),
+        "hours": array("I"),
+        "category": {},
+        "channel": {}
+    }
+
+def _load_saved():
+    if not os.path.exists(ANALYTICS_FILE):
+        return None, None
+    with open(ANALYTICS_FILE, "r", encoding="utf-8") as f:
+        try:
+            saved = json.load(f)
+        except json.JSONDecodeError:
+            return None, None
+    if saved.get("version") != ANALYTICS_VERSION:
+        return None, None
+    data = {
+        "processed": saved["processed"],
+        "last": saved["last"],
+        "origin": saved["origin"],
+        "total": _unpack(saved["total"]),
+        "hours": _unpack(saved["hours"]),
+        **{dim: {name: _unpack(v) for name, v in saved[dim].items()} for dim in DIMENSIONS}
+    }
+    return data, saved.get("stamp")
+
+def _save(data, stamp):
+    write_json_atomic(ANALYTICS_FILE, {
+        "version": ANALYTICS_VERSION,
+        "stamp": stamp,
+        "processed": data["processed"],
+        "last": data["last"],
+        "origin": data["origin"],
+        "total": _pack(data["total"]),
+        "hours": _pack(data["hours"]),
+        **{dim: {name: _pack(v) for name, v in data[dim].items()} for dim in DIMENSIONS}
+    })
+
+def _bump(series, offset):
+    if len(series) <= offset:
+        series.extend([0] * (offset + 1 - len(series)))
+    series[offset] += 1
+
+def _fold(data, entries):
+    """Add history entries to the buckets. Returns False if one predates the origin."""
+    for entry in entries:
+        timestamp = entry.get("timestamp") or ""
+        try:
+            watched = datetime.fromisoformat(timestamp)
+        except ValueError:
+            continue
+        day = watched.date().toordinal()
+        if data["origin"] is None:
+            data["origin"] = day
+        offset = day - data["origin"]
+        if offset < 0:
+            return False
+        _bump(data["total"], offset)
+        _bump(data["hours"], offset * 24 + watched.hour)
+        if entry.get("category") == LEARNING_LOG_PLACEHOLDER:
+            # A real watch, but its channel and category were placeholders.
+            continue
+        for dim in DIMENSIONS:
+            name = entry.get(dim) or "Unknown"
+            _bump(data[dim].setdefault(name, array("I")), offset)
+    return True
+
+def load():
+    """Aggregates covering the whole watch history, updated incrementally."""
+    stamp = _history_stamp()
+    if _cache["data"] is not None and _cache["stamp"] == stamp:
+        return _cache["data"]
+
+    data, saved_stamp = _load_saved()
+    if data is not None and saved_stamp == stamp:
+        _cache.update(stamp=stamp, data=data)
+        return data
+
+    history = get_watch_history()
+    # History is append-only; if the entry we stopped at moved, start over.
+    resumable = (
+        data is not None
+        and data["processed"] <= len(history)
+        and (data["processed"] == 0 or history[data["processed"] - 1].get("timestamp") == data["last"])
+    )
+    if not resumable or not _fold(data, history[data["processed"]:]):
+        data = _empty()
+        _fold(data, sorted(history, key=lambda e: e.get("timestamp") or ""))
+    data["processed"] = len(history)
+    data["last"] = history[-1].get("timestamp") if history else None
+
+    _save(data, stamp)
+    _cache.update(stamp=stamp, data=data)
+    return data
+
+def parse_since(text, today=None):
+    """Start date for '30d', '12w', '6m', '1y' or 'YYYY-MM-DD'."""
+    today = today or date.today()
+    text = text.strip().lower()
+    units = {"d": 1, "w": 7, "m": 30, "y": 365}
+    if text[:-1].isdigit() and text[-1] in units:
+        return today - timedelta(days=int(text[:-1]) * units[text[-1]] - 1)
+    return date.fromisoformat(text)
+
+def _window(data, since, until):
+    """Array offsets [start, end) for dates since..until inclusive."""
+    origin = data["origin"] or date.today().toordinal()
+    start = max(0, since.toordinal() - origin) if since else 0
+    end = until.toordinal() - origin + 1
+    return start, max(start, end)
+
+def series(values, start, end):
+    """Daily counts for offsets [start, end), zero-filled past the recorded days."""
+    window = values[start:end].tolist()
+    return window + [0] * (end - start - len(window))
+
+def resample(daily, width):
+    """(days per bucket, sums) with at most `width` buckets; the last bucket ends on the last day."""
+    size = max(1, -(-len(daily) // width))
+    head = len(daily) % size
+    buckets = [sum(daily[:head])] if head else []
+    return size, buckets + [sum(daily[i:i + size]) for i in range(head, len(daily), size)]
+
+def sparkline(values):
+    top = max(values, default=0)
+    if not top:
+        return SPARK_CHARS[0] * len(values)
+    return "".join(SPARK_CHARS[min(len(SPARK_CHARS) - 1, v * (len(SPARK_CHARS) - 1) // top)] for v in values)
+
+def streaks(data, today=None):
+    """(current, longest) runs of consecutive days with at least one video."""
+    total = data["total"]
+    longest = run = 0
+    for count in total:
+        run = run + 1 if count else 0
+        longest = max(longest, run)
+    today = (today or date.today()).toordinal()
+    offset = today - (data["origin"] or today)
+    current = 0
+    # Today without a video yet doesn't break a streak that ran until yesterday.
+    if offset >= len(total) or not total[offset]:
+        offset -= 1
+    while 0 <= offset < len(total) and total[offset]:
+        current += 1
+        offset -= 1
+    return current, longest
+
+def breakdown(by="category", since=None, until=None, data=None):
+    """
+    Per-key totals for a date range, biggest first.
+    by: 'category', 'channel' or 'hour'. Rows are dicts with name, videos,
+    minutes, daily counts and the change versus the preceding window.
+    """
+    data = data or load()
+    until = until or date.today()
+    start, end = _window(data, since, until)
+    if by == "hour":
+        window = series(data["hours"], start * 24, end * 24)
+        return [
+            {"name": f"{hour:02d}:00", "videos": count, "minutes": count * MINUTES_PER_VIDEO}
+            for hour, count in enumerate(sum(window[hour::24]) for hour in range(24)) if count
+        ]
+
+    span = end - start
+    rows = []
+    for name, values in data[by].items():
+        total = sum(values[start:end])
+        if not total:
+            continue
+        previous = sum(values[max(0, start - span):start]) if start else 0
+        rows.append({
+            "name": name,
+            "videos": total,
+            "minutes": total * MINUTES_PER_VIDEO,
+            "daily": series(values, start, end),
+            "trend": (total - previous) / previous if previous else None
+        })
+    rows.sort(key=lambda row: row["videos"], reverse=True)
+    return rows
+
+def overview(since=None, until=None, data=None):
+    """Totals, daily counts and streaks for the dashboard."""
+    data = data or load()
+    until = until or date.today()
+    start, end = _window(data, since, until)
+    daily = series(data["total"], start, end)
+    current, longest = streaks(data, until)
+    return {
+        "videos": sum(daily),
+        "minutes": sum(daily) * MINUTES_PER_VIDEO,
+        "daily": daily,
+        "current_streak": current,
+        "longest_streak": longest,
+        "active_days": sum(1 for count in daily if count)
+    }
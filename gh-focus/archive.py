@@ -0,0 +1,167 @@
+import sqlite3
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+# Every video ever seen during fetches, indexed by channel and publish time.
+ARCHIVE_FILE = "video_archive.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS videos (
+    video_id     TEXT PRIMARY KEY,
+    channel_id   TEXT NOT NULL,
+    channel      TEXT NOT NULL,
+    title        TEXT NOT NULL,
+    published    TEXT,
+    published_ts REAL,
+    first_seen   REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS videos_by_channel ON videos (channel_id, published_ts);
+CREATE INDEX IF NOT EXISTS videos_by_time ON videos (published_ts);
+CREATE TABLE IF NOT EXISTS backfills (
+    channel_id TEXT PRIMARY KEY,
+    done_at    REAL NOT NULL,
+    videos     INTEGER NOT NULL
+);
+"""
+
+@contextmanager
+def connect():
+    """Connection for one `with` block: committed (or rolled back), then closed."""
+    conn = sqlite3.connect(ARCHIVE_FILE, timeout=10)
+    try:
+        conn.executescript(SCHEMA)
+        with conn:
+            yield conn
+    finally:
+        conn.close()
+
+def parse_published(published):
+    """Epoch seconds for an RSS timestamp or a yt-dlp YYYYMMDD date, else None."""
+    if not published:
+        return None
+    try:
+        if len(published) == 8 and published.isdigit():
+            return datetime.strptime(published, "%Y%m%d").replace(tzinfo=timezone.utc).timestamp()
+        parsed = datetime.fromisoformat(published)
+        if parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=timezone.utc)
+        return parsed.timestamp()
+    except ValueError:
+        return None
+
+def record(by_channel):
+    """
+    Add fetched videos to the archive in one transaction.
+    by_channel: {channel_id: [Video, ...]}
+    """
+    rows = [
+        (v.video_id, channel_id, v.channel, v.title, v.published, parse_published(v.published), time.time())
+        for channel_id, videos in by_channel.items()
+        for v in videos
+    ]
+    if not rows:
+        return
+    with connect() as conn:
+        conn.executemany(
+            "INSERT INTO videos VALUES (?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(video_id) DO UPDATE SET title = excluded.title, channel = excluded.channel",
+            rows
+        )
+
+def query(channel_ids=None, since=None, until=None, exclude_ids=None, limit=None):
+    """
+    Archived videos, newest first, as dicts.
+    channel_ids: restrict to these channels; since/until: epoch bounds;
+    exclude_ids: video IDs to leave out (e.g. already watched).
+    """
+    clauses, params = [], []
+    if channel_ids is not None:
+        if not channel_ids:
+            return []
+        clauses.append(f"channel_id IN ({','.join('?' * len(channel_ids))})")
+        params.extend(channel_ids)
+    if since is not None:
+        clauses.append("published_ts >= ?")
+        params.append(since)
+    if until is not None:
+        clauses.append("published_ts < ?")
+        params.append(until)
+
+    sql = "SELECT video_id, channel_id, channel, title, published FROM videos"
+    if clauses:
+        sql += " WHERE " + " AND ".join(clauses)
+    sql += " ORDER BY published_ts DESC"
+
+    exclude_ids = exclude_ids or set()
+    results = []
+    with connect() as conn:
+        for video_id, channel_id, channel, title, published in conn.execute(sql, params):
+            if video_id in exclude_ids:
+                continue
+            results.append({
+                "video_id": video_id,
+                "channel_id": channel_id,
+                "channel": channel,
+                "title": title,
+                "published": published
+            })
+            if limit and len(results) >= limit:
+                break
+    return results
+
+def backfill(channel, max_videos=200, force=False):
+    """
+    One-time import of a channel's older uploads through yt-dlp's playlist
+    pagination (in-process, flat extraction). Returns the number of videos added,
+    or None if the channel was already backfilled.
+    """
+    from yt_dlp import YoutubeDL
+
+    with connect() as conn:
+        done = conn.execute("SELECT 1 FROM backfills WHERE channel_id = ?", (channel["id"],)).fetchone()
+    if done and not force:
+        return None
+
+    options = {
+        "extract_flat": "in_playlist",
+        "playlistend": max_videos,
+        "quiet": True,
+        "no_warnings": True,
+        "skip_download": True
+    }
+    with YoutubeDL(options) as ydl:
+        info = ydl.extract_info(f"https://www.youtube.com/channel/{channel['id']}/videos", download=False)
+
+    rows = []
+    now = time.time()
+    for entry in info.get("entries") or []:
+        if not entry or not entry.get("id"):
+            continue
+        timestamp = entry.get("timestamp") or entry.get("release_timestamp")
+        published = entry.get("upload_date")
+        if timestamp:
+            published = datetime.fromtimestamp(timestamp, timezone.utc).isoformat()
+        rows.append((
+            entry["id"], channel["id"], channel["name"], entry.get("title") or "Unknown",
+            published, timestamp or parse_published(published), now
+        ))
+
+    with connect() as conn:
+        before = conn.total_changes
+        conn.executemany("INSERT OR IGNORE INTO videos VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+        added = conn.total_changes - before
+        conn.execute("INSERT OR REPLACE INTO backfills VALUES (?, ?, ?)", (channel["id"], now, len(rows)))
+    return added
+
+def channels_for(video_ids):
+    """{video_id: channel name} for the archived videos among `video_ids`."""
+    video_ids = list(video_ids)
+    found = {}
+    with connect() as conn:
+        # Stay under SQLite's bound-parameter limit.
+        for i in range(0, len(video_ids), 500):
+            chunk = video_ids[i:i + 500]
+            sql = f"SELECT video_id, channel FROM videos WHERE video_id IN ({','.join('?' * len(chunk))})"
+            found.update(conn.execute(sql, chunk).fetchall())
+    return found
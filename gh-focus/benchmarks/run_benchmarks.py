@@ -0,0 +1,784 @@
+#!/usr/bin/env python3
+"""
+Reproducible benchmark suite for gh-focus.
+
+Runs every scenario against a local YouTube stand-in (stub_server.py) with a
+fake `gh` and `yt-dlp` on PATH, inside a throwaway working directory, and
+compares the numbers with benchmarks/baseline.json.
+
+Usage:
+    python benchmarks/run_benchmarks.py                  Run and diff against baseline
+    python benchmarks/run_benchmarks.py --save-baseline  Run and overwrite baseline
+    python benchmarks/run_benchmarks.py --only get_videos
+"""
+
+import argparse
+import contextlib
+import glob
+import importlib.util
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+APP_DIR = os.path.dirname(BENCH_DIR)
+FAKES_DIR = os.path.join(BENCH_DIR, "fakes")
+CORPUS_DIR = os.path.join(BENCH_DIR, "corpus")
+BASELINE_FILE = os.path.join(BENCH_DIR, "baseline.json")
+RESULTS_FILE = os.path.join(BENCH_DIR, "results", "latest.json")
+
+sys.path.insert(0, APP_DIR)
+sys.path.insert(0, BENCH_DIR)
+
+from stub_server import StubSettings, make_feed, start_server  # noqa: E402
+
+SCENARIOS = {}
+
+
+def scenario(func):
+    """Register a benchmark scenario by function name."""
+    SCENARIOS[func.__name__] = func
+    return func
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of a list of numbers."""
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+def timed(func, *args, **kwargs):
+    """Run func once and return (elapsed_seconds, result)."""
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+
+def make_channels(count, prefix="UCbench"):
+    """Synthetic channel list shaped like config.json entries."""
+    return [{"name": f"Bench Channel {i}", "id": f"{prefix}{i:017d}"} for i in range(count)]
+
+
+def load_app():
+    """Import gh-focus.py (hyphenated, so not importable by name)."""
+    spec = importlib.util.spec_from_file_location("gh_focus_app", os.path.join(APP_DIR, "gh-focus.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@scenario
+def get_videos(ctx):
+    """Throughput and tail latency of a full parallel refresh."""
+    import fetcher
+
+    results = {}
+    for channels, latency in ((50, 0.05), (200, 0.05)):
+        ctx.settings.latency, ctx.settings.error_rate = latency, 0.0
+        chans = make_channels(channels)
+        samples = []
+        count = 0
+        for _ in range(ctx.repeats):
+            elapsed, videos = timed(fetcher.get_videos, chans)
+            samples.append(elapsed)
+            count = len(videos)
+        key = f"{channels}ch_{int(latency * 1000)}ms"
+        results[f"{key}.p50_s"] = statistics.median(samples)
+        results[f"{key}.p95_s"] = percentile(samples, 95)
+        results[f"{key}.videos_per_s"] = count / statistics.median(samples)
+    return results
+
+
+@scenario
+def get_videos_processes(ctx):
+    """Large refresh: one process with threads vs a process pool."""
+    import fetcher
+
+    ctx.settings.latency, ctx.settings.error_rate = 0.0, 0.0
+    chans = make_channels(600, prefix="UCproc")
+    workers = max(2, os.cpu_count() or 1)
+    results = {"cpu_count": os.cpu_count() or 1}
+    for label, processes in (("threads", 1), ("processes", workers)):
+        samples = []
+        count = 0
+        for _ in range(ctx.repeats):
+            elapsed, videos = timed(fetcher.get_videos, chans, processes=processes)
+            samples.append(elapsed)
+            count = len(videos)
+        results[f"600ch.{label}.p50_s"] = statistics.median(samples)
+        results[f"600ch.{label}.videos_per_s"] = count / statistics.median(samples)
+    return results
+
+
+@scenario
+def get_videos_errors(ctx):
+    """Refresh with a failing RSS endpoint so channels fall back to yt-dlp."""
+    import fetcher
+
+    ctx.settings.latency, ctx.settings.error_rate = 0.02, 0.2
+    chans = make_channels(50, prefix="UCerr")
+    samples = [timed(fetcher.get_videos, chans)[0] for _ in range(ctx.repeats)]
+    ctx.settings.error_rate = 0.0
+    return {
+        "50ch_20pct_errors.p50_s": statistics.median(samples),
+        "50ch_20pct_errors.p95_s": percentile(samples, 95),
+    }
+
+
+@scenario
+def get_videos_throttled(ctx):
+    """
+    Refresh against a feed endpoint that rate limits with 429 + Retry-After.
+    yt-dlp fallbacks cost 2 s each here, roughly what a real channel extraction takes.
+    """
+    import fetcher
+    import net
+
+    ctx.settings.latency, ctx.settings.error_rate = 0.02, 0.0
+    ctx.settings.rate_limit, ctx.settings.burst, ctx.settings.retry_after = 60, 20, 1
+    chans = make_channels(200, prefix="UCthr")
+    os.environ["FAKE_YTDLP_LATENCY"] = "2"
+    samples, throttled, complete = [], [], []
+    for _ in range(ctx.repeats):
+        net._buckets.clear()
+        ctx.settings.throttled, ctx.settings.tokens = 0, float(ctx.settings.burst)
+        elapsed, videos = timed(fetcher.get_videos, chans)
+        samples.append(elapsed)
+        throttled.append(ctx.settings.throttled)
+        complete.append(len({v.channel for v in videos}) / len(chans))
+    ctx.settings.rate_limit = None
+    del os.environ["FAKE_YTDLP_LATENCY"]
+    return {
+        "200ch_60rps.p50_s": statistics.median(samples),
+        "200ch_60rps.429s_p50": statistics.median(throttled),
+        "200ch_60rps.channels_ok_pct": min(complete) * 100,
+    }
+
+
+def load_corpus():
+    """Saved real feeds from benchmarks/corpus, or synthetic ones if none were saved."""
+    paths = sorted(glob.glob(os.path.join(CORPUS_DIR, "*.xml")))
+    if paths:
+        feeds = []
+        for path in paths:
+            with open(path, "rb") as f:
+                feeds.append(f.read())
+        return "saved", feeds
+    return "synthetic", [make_feed(f"UCcorpus{i:016d}").encode("utf-8") for i in range(100)]
+
+
+def parse_cost(parse, feeds, repeats):
+    """CPU ms and peak KiB of allocations per feed for a parse function."""
+    cpu = []
+    for _ in range(repeats):
+        start = time.process_time()
+        for data in feeds:
+            parse(data)
+        cpu.append((time.process_time() - start) / len(feeds))
+
+    peaks = []
+    for data in feeds[:20]:
+        tracemalloc.start()
+        parse(data)
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    return statistics.median(cpu) * 1000, statistics.median(peaks) / 1024
+
+
+@scenario
+def feed_parsing(ctx):
+    """CPU time and memory per feed: feedparser vs the YouTube fast path."""
+    import feedparser
+    import fetcher
+
+    source, feeds = load_corpus()
+    print(f"  corpus: {len(feeds)} {source} feeds", file=sys.stderr)
+    fp_cpu, fp_mem = parse_cost(lambda data: feedparser.parse(data).entries[:fetcher.ENTRIES_PER_CHANNEL], feeds, ctx.repeats)
+    fast_cpu, fast_mem = parse_cost(fetcher.parse_feed, feeds, ctx.repeats)
+    return {
+        f"{source}.feedparser.cpu_ms_per_feed": fp_cpu,
+        f"{source}.feedparser.peak_kib_per_feed": fp_mem,
+        f"{source}.fast_path.cpu_ms_per_feed": fast_cpu,
+        f"{source}.fast_path.peak_kib_per_feed": fast_mem,
+    }
+
+
+def traced_kib(build):
+    """KiB still allocated by whatever build() returns."""
+    tracemalloc.start()
+    kept = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept
+    return size / 1024
+
+
+@scenario
+def video_records(ctx):
+    """
+    Memory per 100k videos: plain dicts + parallel menu dicts vs slotted
+    records + row index. Also a 10k-video menu build on new records vs a
+    redraw over the same ones, which reuses the index and its labels.
+    """
+    from videos import Video, VideoIndex
+
+    # Channel names are built per record, like names parsed back from disk.
+    raw = [
+        (f"Episode {i}: Python & Rust deep dive", f"Bench Channel {i % 500}", "2024-01-01T00:00:00+00:00", f"v{i:010d}")
+        for i in range(100000)
+    ]
+
+    def dict_records():
+        videos = [
+            {"title": t, "link": f"https://www.youtube.com/watch?v={vid}", "channel": c, "published": p, "video_id": vid}
+            for t, c, p, vid in raw
+        ]
+        video_map, video_info, video_choices = {}, {}, []
+        for v in videos:
+            display_text = f"[{v['channel']}] {v['title'][:50]}"
+            video_choices.append(display_text)
+            video_map[display_text] = v["video_id"]
+            video_info[display_text] = v
+        return videos, video_map, video_info, video_choices
+
+    def slotted_records():
+        index = VideoIndex([Video(t, c, p, vid) for t, c, p, vid in raw])
+        return index, index.labels()
+
+    def menu(videos, index=None):
+        if index is None or not index.same_videos(videos):
+            index = VideoIndex(videos)
+        return index, index.labels()
+
+    first, redraw = [], []
+    for _ in range(ctx.repeats):
+        videos = [Video(t, c, p, vid) for t, c, p, vid in raw[:10000]]
+        elapsed, (index, _) = timed(menu, videos)
+        first.append(elapsed)
+        redraw.append(timed(menu, list(videos), index)[0])
+
+    return {
+        "dicts.kib_per_100k": traced_kib(dict_records),
+        "slotted.kib_per_100k": traced_kib(slotted_records),
+        "menu_10k.first_ms": statistics.median(first) * 1000,
+        "menu_10k.redraw_ms": statistics.median(redraw) * 1000,
+    }
+
+
+@scenario
+def config_access(ctx):
+    """Menu-loop config reads and single-channel edits on a large config."""
+    import focus_manager
+
+    focus_manager.save_config({f"category_{c}": make_channels(50, prefix=f"UCc{c:03d}") for c in range(40)})
+    reads = [timed(focus_manager.load_config)[0] for _ in range(ctx.repeats * 20)]
+    edits = [
+        timed(focus_manager.add_channel, "category_0", f"Bench {i}", f"UCedit{i:018d}")[0]
+        for i in range(ctx.repeats)
+    ]
+    os.remove(focus_manager.CONFIG_FILE)
+    return {
+        "load_config.2000ch.p50_ms": statistics.median(reads) * 1000,
+        "add_channel.2000ch.p50_ms": statistics.median(edits) * 1000,
+    }
+
+
+@scenario
+def headless_fetch(ctx):
+    """`gh focus fetch` as cron would run it: a fresh process per call, fetching vs cache-only."""
+    import subprocess
+
+    ctx.settings.latency, ctx.settings.error_rate = 0.05, 0.0
+    with open("config.json", "w") as f:
+        json.dump({"bench": make_channels(50, prefix="UChead")}, f)
+    command = [sys.executable, os.path.join(APP_DIR, "gh-focus.py"), "fetch", "bench"]
+
+    fetched, cached, lines = [], [], 0
+    for _ in range(ctx.repeats):
+        elapsed, result = timed(subprocess.run, command, capture_output=True, text=True, check=True)
+        fetched.append(elapsed)
+        lines = len(result.stdout.splitlines())
+        cached.append(timed(subprocess.run, command + ["--max-age", "3600"], capture_output=True, check=True)[0])
+    ctx.settings.latency = 0.0
+    os.remove("config.json")
+    return {
+        "50ch.fetch_s": statistics.median(fetched),
+        "50ch.cached_s": statistics.median(cached),
+        "50ch.videos": lines,
+    }
+
+
+@scenario
+def digest_diff(ctx):
+    """Diffing a 5000-channel fetch against the previous run's snapshot."""
+    import digest
+    from videos import Video
+
+    chans = make_channels(5000, prefix="UCdig")
+    by_channel = {
+        ch["id"]: [Video(f"Episode {i}", ch["name"], f"2024-01-{1 + i:02d}T00:00:00+00:00", f"{ch['id'][-6:]}{i:05d}") for i in range(15)]
+        for ch in chans
+    }
+    snapshot = digest.load_snapshot()
+    digest.save_snapshot(snapshot, by_channel)
+    # One new upload on every tenth channel.
+    for ch in chans[::10]:
+        by_channel[ch["id"]] = [Video("Brand new", ch["name"], "2024-02-01T00:00:00+00:00", f"{ch['id'][-6:]}new00")] + by_channel[ch["id"]][:14]
+
+    load, diff, save, found = [], [], [], 0
+    for _ in range(ctx.repeats):
+        elapsed, snapshot = timed(digest.load_snapshot)
+        load.append(elapsed)
+        elapsed, fresh = timed(digest.new_videos, by_channel, snapshot)
+        diff.append(elapsed)
+        found = sum(len(v) for v in fresh.values())
+        save.append(timed(digest.save_snapshot, digest.load_snapshot(), {})[0])
+    os.remove(digest.SNAPSHOT_FILE)
+    return {
+        "5000ch.snapshot_load_ms": statistics.median(load) * 1000,
+        "5000ch.diff_ms": statistics.median(diff) * 1000,
+        "5000ch.snapshot_save_ms": statistics.median(save) * 1000,
+        "5000ch.new_found": found,
+    }
+
+
+@scenario
+def feed_cache(ctx):
+    """Opening a 2000-channel feed cache for one category: binary cache vs JSON cache vs re-fetch."""
+    import feed_cache as cache
+    import fetcher
+    from videos import Video
+
+    chans = make_channels(2000, prefix="UCcache")
+    results = {
+        ch["id"]: [
+            Video(f"Episode {i}: cached title for {ch['name']}", ch["name"], f"2024-01-{1 + i:02d}T00:00:00+00:00", f"{ch['id'][-6:]}{i:05d}")
+            for i in range(15)
+        ]
+        for ch in chans
+    }
+    cache.store(results)
+    legacy = {
+        "version": 1,
+        "channels": {
+            channel_id: {"fetched_at": time.time(), "videos": [[v.title, v.channel, v.published, v.video_id] for v in videos]}
+            for channel_id, videos in results.items()
+        },
+    }
+    with open("legacy_feed_cache.json", "w") as f:
+        json.dump(legacy, f)
+    category = chans[::40]
+
+    def json_path():
+        with open("legacy_feed_cache.json") as f:
+            channels = json.load(f)["channels"]
+        return [Video(*row) for ch in category for row in channels[ch["id"]]["videos"]]
+
+    cold, warm, old, refetch, write = [], [], [], [], []
+    for _ in range(ctx.repeats):
+        cache._close()
+        cache._decoded.clear()
+        cold.append(timed(cache.get_cached_videos, category)[0])
+        warm.append(timed(cache.get_cached_videos, category)[0])
+        old.append(timed(json_path)[0])
+        write.append(timed(cache.store, {ch["id"]: results[ch["id"]] for ch in category})[0])
+    ctx.settings.latency = 0.05
+    for _ in range(ctx.repeats):
+        refetch.append(timed(fetcher.get_videos, category)[0])
+    ctx.settings.latency = 0.0
+
+    size = os.path.getsize(cache.FEED_CACHE_FILE)
+    json_size = os.path.getsize("legacy_feed_cache.json")
+    os.remove(cache.FEED_CACHE_FILE)
+    os.remove("legacy_feed_cache.json")
+    cache._close()
+    return {
+        "2000ch.file_kib": size / 1024,
+        "2000ch.json_file_kib": json_size / 1024,
+        "50ch.cold_open_lookup_ms": statistics.median(cold) * 1000,
+        "50ch.warm_lookup_ms": statistics.median(warm) * 1000,
+        "50ch.json_load_lookup_ms": statistics.median(old) * 1000,
+        "50ch.refetch_s": statistics.median(refetch),
+        "50ch.store_ms": statistics.median(write) * 1000,
+    }
+
+
+@scenario
+def offline_mode(ctx):
+    """Opening a 50-channel category with the feed host unreachable: offline mode vs trying anyway."""
+    import socket
+    import feed_cache as cache
+    import fetcher
+    import offline
+
+    chans = make_channels(50, prefix="UCoffline")
+    with contextlib.redirect_stdout(io.StringIO()):
+        fetcher.get_videos(chans)
+    # A port nothing listens on stands in for a dead network (connections refused).
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        dead_port = s.getsockname()[1]
+    feed_url = fetcher.FEED_URL
+    fetcher.FEED_URL = f"http://127.0.0.1:{dead_port}/feeds/videos.xml"
+
+    probe, cached = [], []
+    try:
+        for _ in range(ctx.repeats):
+            offline._state.update(offline=None, checked=0.0)
+            probe.append(timed(offline.is_offline)[0])
+            cached.append(timed(fetcher.get_videos, chans, max_age=1)[0])
+        # Without offline mode every channel retries, then falls back to yt-dlp.
+        os.environ[offline.OFFLINE_ENV] = "0"
+        with contextlib.redirect_stdout(io.StringIO()):
+            trying, _ = timed(fetcher.get_videos, chans)
+    finally:
+        os.environ.pop(offline.OFFLINE_ENV, None)
+        fetcher.FEED_URL = feed_url
+        offline._state.update(offline=None, checked=0.0)
+        os.remove(cache.FEED_CACHE_FILE)
+        cache._close()
+    return {
+        "probe_ms": statistics.median(probe) * 1000,
+        "50ch.cached_open_ms": statistics.median(cached) * 1000,
+        "50ch.without_offline_mode_s": trying,
+    }
+
+
+@scenario
+def watch_history(ctx):
+    """Cost of log_watch and get_watch_stats as history grows."""
+    import focus_manager
+
+    results = {}
+    for size in (100, 1000, 10000):
+        history = [
+            {
+                "title": f"Video {i}",
+                "channel": f"Channel {i % 40}",
+                "video_id": f"vid{i:08d}",
+                "category": ("coding", "business", "science")[i % 3],
+                "timestamp": "2024-01-01T00:00:00",
+            }
+            for i in range(size)
+        ]
+        with open(focus_manager.HISTORY_FILE, "w") as f:
+            json.dump(history, f, indent=4)
+
+        log_samples = [
+            timed(focus_manager.log_watch, "Bench", "Bench Channel", "benchvid", "coding")[0]
+            for _ in range(ctx.repeats)
+        ]
+        stats_samples = [timed(focus_manager.get_watch_stats)[0] for _ in range(ctx.repeats)]
+        results[f"log_watch.{size}.p50_ms"] = statistics.median(log_samples) * 1000
+        results[f"get_watch_stats.{size}.p50_ms"] = statistics.median(stats_samples) * 1000
+    os.remove(focus_manager.HISTORY_FILE)
+    return results
+
+
+@scenario
+def fuzzy_search(ctx):
+    """Picker index build and per-keystroke search over 50k titles."""
+    from fuzzy import FuzzyIndex
+
+    words = "python rust async deep dive tutorial react hooks kubernetes docker system design interview".split()
+    items = [
+        (i, f"[Channel {i % 300}] " + " ".join(words[(i * 7 + k * 3) % len(words)] for k in range(6)) + f" part {i}")
+        for i in range(50000)
+    ]
+    builds = [timed(FuzzyIndex, items)[0] for _ in range(max(1, ctx.repeats // 2))]
+    index = FuzzyIndex(items)
+
+    keystrokes = []
+    for _ in range(ctx.repeats):
+        for query in ("k", "ku", "kub", "kube", "kuber", "kubernetes d", "kubernets", "part 4999"):
+            keystrokes.append(timed(index.search, query, limit=15)[0])
+    return {
+        "build.50k.p50_ms": statistics.median(builds) * 1000,
+        "keystroke.50k.p50_ms": statistics.median(keystrokes) * 1000,
+        "keystroke.50k.p95_ms": percentile(keystrokes, 95) * 1000,
+    }
+
+
+@scenario
+def thumbnails(ctx):
+    """Background thumbnail prefetch (cold and warm) and preview latency."""
+    import thumbnails as thumbs
+
+    ctx.settings.latency = 0.02
+    video_ids = [f"thumb{i:06d}" for i in range(600)]
+    cold = timed(thumbs.fetch_missing, video_ids)
+    warm = timed(thumbs.fetch_missing, video_ids)[0]
+
+    os.environ["GH_FOCUS_IMAGES"] = "iterm"
+    shows = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for video_id in video_ids[:ctx.repeats * 10]:
+            shows.append(timed(thumbs.show, video_id)[0])
+    del os.environ["GH_FOCUS_IMAGES"]
+    ctx.settings.latency = 0.0
+    return {
+        "prefetch.600.cold_s": cold[0],
+        "prefetch.600.fetched": cold[1],
+        "prefetch.600.warm_ms": warm * 1000,
+        "show.p50_ms": statistics.median(shows) * 1000,
+    }
+
+
+def gh_transferred(ctx):
+    """Bytes the fake gh has sent and received so far."""
+    path = os.path.join(ctx.gh_dir, ".transferred")
+    if not os.path.exists(path):
+        return 0
+    with open(path) as f:
+        return int(f.read() or 0)
+
+
+@scenario
+def learning_log_sync(ctx):
+    """Round-trip of save_to_learning_log and reopening the log against the fake gh."""
+    import focus_manager
+    import learning_log
+
+    app = load_app()
+    results = {}
+    for lines in (10, 1000, 5000):
+        gist_id = f"bench{lines}"
+        gist_path = os.path.join(ctx.gh_dir, gist_id)
+        os.makedirs(gist_path, exist_ok=True)
+        with open(os.path.join(gist_path, "focus_learning_log.md"), "w", encoding="utf-8") as f:
+            f.write("# My Intentional Learning Log 🧠\n\n")
+            for i in range(lines):
+                f.write(f"- [ ] **Seed video {i}** - [Watch](https://www.youtube.com/watch?v=seed{i:07d})\n")
+        focus_manager.save_gist_id(gist_id)
+
+        samples, transferred = [], []
+        with contextlib.redirect_stdout(io.StringIO()):
+            for i in range(ctx.repeats):
+                before = gh_transferred(ctx)
+                # New video IDs per gist, so the local copy never reports them as already saved.
+                samples.append(timed(app.save_to_learning_log, f"Bench {i}", f"https://www.youtube.com/watch?v=b{lines}x{i}")[0])
+                transferred.append(gh_transferred(ctx) - before)
+        results[f"save.{lines}_lines.p50_ms"] = statistics.median(samples) * 1000
+        results[f"save.{lines}_lines.p95_ms"] = percentile(samples, 95) * 1000
+        results[f"save.{lines}_lines.kib_transferred"] = statistics.median(transferred) / 1024
+
+        # Opening the log again with every shard already cached locally.
+        loads = [timed(learning_log.load_log, gist_id)[0] for _ in range(ctx.repeats)]
+        results[f"load.{lines}_lines.warm_p50_ms"] = statistics.median(loads) * 1000
+    return results
+
+
+@scenario
+def ranking(ctx):
+    """Ranking a large category: cold model build, fresh scores and warm cache."""
+    import focus_manager
+    import ranking as ranking_module
+    from videos import Video
+
+    history = [
+        {
+            "title": f"Video {i}",
+            "channel": f"Channel {i % 40}",
+            "video_id": f"vid{i:08d}",
+            "category": ("coding", "business", "science")[i % 3],
+            "timestamp": "2024-01-01T00:00:00",
+        }
+        for i in range(5000)
+    ]
+    with open(focus_manager.HISTORY_FILE, "w") as f:
+        json.dump(history, f)
+    videos = [
+        Video(f"Video {i}", f"Channel {i % 80}", f"2024-01-{1 + i % 28:02d}T00:00:00+00:00", f"rank{i:07d}")
+        for i in range(10000)
+    ]
+
+    cold, fresh, warm = [], [], []
+    for _ in range(ctx.repeats):
+        ranking_module._model["key"] = None
+        ranking_module._scores["key"] = None
+        cold.append(timed(ranking_module.rank_videos, videos, "coding")[0])
+        ranking_module._scores["key"] = None
+        fresh.append(timed(ranking_module.rank_videos, videos, "coding")[0])
+        warm.append(timed(ranking_module.rank_videos, videos, "coding")[0])
+    os.remove(focus_manager.HISTORY_FILE)
+    return {
+        "rank.10k.cold_p50_ms": statistics.median(cold) * 1000,
+        "rank.10k.scores_p50_ms": statistics.median(fresh) * 1000,
+        "rank.10k.cached_p50_ms": statistics.median(warm) * 1000,
+    }
+
+
+@scenario
+def analytics(ctx):
+    """Stats over five years of history: full build, one-video incremental update and range queries."""
+    import focus_manager
+    import analytics as analytics_module
+    from datetime import date, datetime, timedelta
+
+    start = datetime(2020, 1, 1)
+    history = [
+        {
+            "title": f"Video {i}",
+            "channel": f"Channel {i % 300}",
+            "video_id": f"vid{i:08d}",
+            "category": ("coding", "business", "science", "design")[i % 4],
+            "timestamp": (start + timedelta(minutes=97 * i)).isoformat(),
+        }
+        for i in range(27000)
+    ]
+    last = datetime.fromisoformat(history[-1]["timestamp"]).date()
+
+    def write(entries):
+        with open(focus_manager.HISTORY_FILE, "w") as f:
+            json.dump(entries, f)
+
+    def reset():
+        analytics_module._cache.update(stamp=None, data=None)
+
+    build, update, queries = [], [], []
+    for _ in range(ctx.repeats):
+        write(history[:-1])
+        if os.path.exists(analytics_module.ANALYTICS_FILE):
+            os.remove(analytics_module.ANALYTICS_FILE)
+        reset()
+        build.append(timed(analytics_module.load)[0])
+        write(history)
+        reset()
+        update.append(timed(analytics_module.load)[0])
+        data = analytics_module.load()
+        for by in ("category", "channel", "hour"):
+            queries.append(timed(analytics_module.breakdown, by, since=last - timedelta(days=29), until=last, data=data)[0])
+            queries.append(timed(analytics_module.breakdown, by, since=date(2020, 1, 1), until=last, data=data)[0])
+    os.remove(focus_manager.HISTORY_FILE)
+    os.remove(analytics_module.ANALYTICS_FILE)
+    return {
+        "stats.27k.build_p50_ms": statistics.median(build) * 1000,
+        "stats.27k.incremental_p50_ms": statistics.median(update) * 1000,
+        "stats.range_query_p50_ms": statistics.median(queries) * 1000,
+        "stats.range_query_max_ms": max(queries) * 1000,
+    }
+
+
+def reset_app_state():
+    """Drop module-level caches so a scenario can't see the previous one's files or results."""
+    import analytics
+    import catalog
+    import feed_cache
+    import focus_manager
+    import net
+    import offline
+    import ranking
+    import thumbnails
+    import unread
+
+    feed_cache._close()
+    feed_cache._decoded.clear()
+    analytics._cache.update(stamp=None, data=None)
+    catalog._merged_memo.clear()
+    focus_manager._config_cache.update(stamp=None, data=None, text=None)
+    net._buckets.clear()
+    offline._state.update(offline=None, checked=0.0)
+    ranking._model.update(key=None, affinity={}, completion={}, category={})
+    ranking._scores.update(key=None, values={})
+    thumbnails._index["data"] = None
+    unread._state.update(stamp=None, data=None)
+
+
+class Context:
+    """State handed to a scenario; each one gets its own working directory."""
+
+    def __init__(self, settings, workdir, repeats):
+        self.settings = settings
+        self.workdir = workdir
+        self.gh_dir = os.path.join(workdir, ".fake_gh")
+        self.repeats = repeats
+
+
+def run(names, repeats):
+    settings = StubSettings()
+    server, feed_url = start_server(settings)
+    original_cwd = os.getcwd()
+    results = {}
+
+    with tempfile.TemporaryDirectory(prefix="gh-focus-bench-") as workdir:
+        os.environ["GH_FOCUS_FEED_URL"] = feed_url
+        os.environ["GH_FOCUS_THUMBNAIL_URL"] = feed_url.replace("/feeds/videos.xml", "/vi/{video_id}/mqdefault.jpg")
+        os.environ["PATH"] = FAKES_DIR + os.pathsep + os.environ.get("PATH", "")
+        try:
+            import fetcher
+
+            fetcher.FEED_URL = feed_url
+            fetcher.get_console().quiet = True
+            for name in names:
+                print(f"▶ {name}...", file=sys.stderr)
+                # Fresh directory, stub knobs and caches: no scenario inherits another's feed cache or archive.
+                scenario_dir = os.path.join(workdir, name)
+                os.makedirs(scenario_dir)
+                os.chdir(scenario_dir)
+                os.environ["FAKE_GH_DIR"] = os.path.join(scenario_dir, ".fake_gh")
+                settings.__init__()
+                reset_app_state()
+                ctx = Context(settings, scenario_dir, repeats)
+                for metric, value in SCENARIOS[name](ctx).items():
+                    results[f"{name}.{metric}"] = round(value, 4)
+        finally:
+            os.chdir(original_cwd)
+            reset_app_state()
+            server.shutdown()
+    return results
+
+
+def compare(results, baseline):
+    """Print each metric next to its baseline value and relative change."""
+    width = max(len(k) for k in results)
+    print(f"{'metric'.ljust(width)}  {'baseline':>10}  {'current':>10}  {'delta':>8}")
+    for key, value in results.items():
+        base = baseline.get(key)
+        if base is None:
+            print(f"{key.ljust(width)}  {'-':>10}  {value:>10.4f}  {'new':>8}")
+            continue
+        delta = ((value - base) / base * 100) if base else 0.0
+        print(f"{key.ljust(width)}  {base:>10.4f}  {value:>10.4f}  {delta:>+7.1f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run gh-focus benchmarks.")
+    parser.add_argument("--only", action="append", choices=sorted(SCENARIOS), help="Run only this scenario (repeatable)")
+    parser.add_argument("--repeats", type=int, default=5, help="Samples per measurement")
+    parser.add_argument("--save-baseline", action="store_true", help="Write results to baseline.json")
+    args = parser.parse_args()
+
+    names = args.only or list(SCENARIOS)
+    results = run(names, args.repeats)
+
+    os.makedirs(os.path.dirname(RESULTS_FILE), exist_ok=True)
+    with open(RESULTS_FILE, "w") as f:
+        json.dump(results, f, indent=4, sort_keys=True)
+
+    baseline = {}
+    if os.path.exists(BASELINE_FILE):
+        with open(BASELINE_FILE) as f:
+            baseline = json.load(f).get("results", {})
+
+    compare(results, baseline)
+
+    if args.save_baseline:
+        baseline.update(results)
+        with open(BASELINE_FILE, "w") as f:
+            json.dump({
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "results": dict(sorted(baseline.items())),
+            }, f, indent=4)
+        print(f"\nBaseline saved to {BASELINE_FILE}")
+
+
+if __name__ == "__main__":
+    main()
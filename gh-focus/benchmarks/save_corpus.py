@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Save real YouTube RSS feeds into benchmarks/corpus/ for the feed_parsing
+benchmark. Reads channel IDs from config.json (or config.json.sample).
+
+Usage:
+    python benchmarks/save_corpus.py [--limit 100]
+"""
+
+import argparse
+import json
+import os
+import sys
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+APP_DIR = os.path.dirname(BENCH_DIR)
+CORPUS_DIR = os.path.join(BENCH_DIR, "corpus")
+
+sys.path.insert(0, APP_DIR)
+
+from fetcher import FEED_URL, download_feed  # noqa: E402
+
+
+def channel_ids():
+    """Unique channel IDs from the local config, falling back to the sample."""
+    for name in ("config.json", "config.json.sample"):
+        path = os.path.join(APP_DIR, name)
+        if os.path.exists(path):
+            with open(path) as f:
+                config = json.load(f)
+            ids = []
+            for value in config.values():
+                if isinstance(value, list):
+                    ids.extend(ch["id"] for ch in value if ch["id"] not in ids)
+            return ids
+    return []
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Download real feeds for the parsing benchmark.")
+    parser.add_argument("--limit", type=int, default=100)
+    args = parser.parse_args()
+
+    os.makedirs(CORPUS_DIR, exist_ok=True)
+    saved = 0
+    for channel_id in channel_ids()[:args.limit]:
+        try:
+            data = download_feed(f"{FEED_URL}?channel_id={channel_id}")
+        except Exception as e:
+            print(f"skip {channel_id}: {e}")
+            continue
+        with open(os.path.join(CORPUS_DIR, f"{channel_id}.xml"), "wb") as f:
+            f.write(data)
+        saved += 1
+    print(f"Saved {saved} feeds to {CORPUS_DIR}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+"""
+Local stand-in for YouTube's RSS endpoint.
+
+Serves synthetic `feeds/videos.xml` Atom feeds with configurable latency,
+error rate and feed size so fetch benchmarks are reproducible offline.
+Optionally rate limits feed requests like YouTube does, answering 429 with
+a Retry-After header once the limit is exceeded.
+"""
+
+import random
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+from xml.sax.saxutils import escape
+
+FEED_HEADER = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<feed xmlns:yt="http://www.youtube.com/xml/schemas/2015" '
+    'xmlns:media="http://search.yahoo.com/mrss/" '
+    'xmlns="http://www.w3.org/2005/Atom">\n'
+)
+
+
+def make_feed(channel_id, entries=15, seed=None):
+    """Build a YouTube-shaped Atom feed for one channel."""
+    rng = random.Random(seed if seed is not None else channel_id)
+    name = f"Channel {channel_id[-6:]}"
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    parts = [
+        FEED_HEADER,
+        f' <link rel="self" href="http://www.youtube.com/feeds/videos.xml?channel_id={channel_id}"/>\n',
+        f" <id>yt:channel:{channel_id[2:]}</id>\n",
+        f" <yt:channelId>{channel_id[2:]}</yt:channelId>\n",
+        f" <title>{escape(name)}</title>\n",
+        f" <author>\n  <name>{escape(name)}</name>\n"
+        f"  <uri>https://www.youtube.com/channel/{channel_id}</uri>\n </author>\n",
+        f" <published>{start.isoformat()}</published>\n",
+    ]
+    for i in range(entries):
+        video_id = f"{channel_id[-5:]}{i:06d}"
+        published = (start - timedelta(hours=i * 7 + rng.randint(0, 6))).isoformat()
+        title = f"Episode {i}: {rng.choice(['Docker', 'Rust', 'Python', 'Go', 'SQL'])} & {rng.choice(['basics', 'in 100 seconds', 'deep dive', '#shorts'])}"
+        parts.append(
+            " <entry>\n"
+            f"  <id>yt:video:{video_id}</id>\n"
+            f"  <yt:videoId>{video_id}</yt:videoId>\n"
+            f"  <yt:channelId>{channel_id[2:]}</yt:channelId>\n"
+            f"  <title>{escape(title)}</title>\n"
+            f'  <link rel="alternate" href="https://www.youtube.com/watch?v={video_id}"/>\n'
+            f"  <author>\n   <name>{escape(name)}</name>\n"
+            f"   <uri>https://www.youtube.com/channel/{channel_id}</uri>\n  </author>\n"
+            f"  <published>{published}</published>\n"
+            f"  <updated>{published}</updated>\n"
+            "  <media:group>\n"
+            f"   <media:title>{escape(title)}</media:title>\n"
+            f'   <media:content url="https://www.youtube.com/v/{video_id}?version=3" type="application/x-shockwave-flash" width="640" height="390"/>\n'
+            f'   <media:thumbnail url="https://i1.ytimg.com/vi/{video_id}/hqdefault.jpg" width="480" height="360"/>\n'
+            f"   <media:description>{escape(title)} - synthetic description. " + "Lorem ipsum dolor sit amet. " * 8 + "</media:description>\n"
+            "   <media:community>\n"
+            f'    <media:starRating count="{rng.randint(10, 9000)}" average="5.00" min="1" max="5"/>\n'
+            f'    <media:statistics views="{rng.randint(1000, 900000)}"/>\n'
+            "   </media:community>\n"
+            "  </media:group>\n"
+            " </entry>\n"
+        )
+    parts.append("</feed>\n")
+    return "".join(parts)
+
+
+def make_thumbnail(video_id, size=12000):
+    """Stand-in for a ~12 KB mqdefault.jpg (JPEG markers around seeded bytes)."""
+    rng = random.Random(video_id)
+    return b"\xff\xd8\xff\xe0" + bytes(rng.getrandbits(8) for _ in range(size)) + b"\xff\xd9"
+
+
+class StubSettings:
+    """Mutable knobs shared by every request handler."""
+
+    def __init__(self, latency=0.0, jitter=0.0, error_rate=0.0, entries=15, error_status=500,
+                 rate_limit=None, burst=10, retry_after=1):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.entries = entries
+        self.error_status = error_status
+        # Feed requests/second allowed before answering 429 (None = unlimited).
+        self.rate_limit = rate_limit
+        self.burst = burst
+        self.retry_after = retry_after
+        self.requests = 0
+        self.throttled = 0
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def admit(self):
+        """Take a token from the server-side bucket; False means answer 429."""
+        if not self.rate_limit:
+            return True
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate_limit)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            self.throttled += 1
+            return False
+
+
+def make_handler(settings):
+    """Create a request handler class bound to `settings`."""
+
+    class FeedHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            with settings.lock:
+                settings.requests += 1
+            parsed = urlparse(self.path)
+            query = parse_qs(parsed.query)
+
+            delay = settings.latency
+            if settings.jitter:
+                delay += random.uniform(0, settings.jitter)
+            if delay:
+                time.sleep(delay)
+
+            if parsed.path.startswith("/vi/"):
+                body = make_thumbnail(parsed.path.split("/")[2])
+                self.send_response(200)
+                self.send_header("Content-Type", "image/jpeg")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                return
+            if parsed.path != "/feeds/videos.xml" or "channel_id" not in query:
+                self.send_error(404)
+                return
+            if not settings.admit():
+                self.send_response(429)
+                self.send_header("Retry-After", str(settings.retry_after))
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            if settings.error_rate and random.random() < settings.error_rate:
+                self.send_error(settings.error_status)
+                return
+
+            entries = int(query.get("entries", [settings.entries])[0])
+            body = make_feed(query["channel_id"][0], entries).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/xml; charset=UTF-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return FeedHandler
+
+
+def start_server(settings=None, port=0):
+    """Start the stub server on a background thread. Returns (server, base_url)."""
+    settings = settings or StubSettings()
+    server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(settings))
+    server.daemon_threads = True
+    server.settings = settings
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    host, port = server.server_address
+    return server, f"http://{host}:{port}/feeds/videos.xml"
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Serve synthetic YouTube RSS feeds.")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.05, help="Base latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Extra random latency in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests that fail")
+    parser.add_argument("--entries", type=int, default=15, help="Entries per feed")
+    parser.add_argument("--rate-limit", type=float, help="Feed requests/second before answering 429")
+    parser.add_argument("--retry-after", type=int, default=1, help="Retry-After seconds sent with 429")
+    args = parser.parse_args()
+
+    settings = StubSettings(args.latency, args.jitter, args.error_rate, args.entries,
+                            rate_limit=args.rate_limit, retry_after=args.retry_after)
+    srv, url = start_server(settings, args.port)
+    print(f"Serving synthetic feeds at {url}?channel_id=UC...")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        srv.shutdown()
@@ -0,0 +1,258 @@
+import copy
+import hashlib
+import json
+import os
+import subprocess
+from focus_manager import load_config, update_config, write_json_atomic
+
+# Local state for the subscribed team catalog (applied version + merged view).
+CATALOG_CACHE_FILE = "catalog_cache.json"
+
+# File name of a catalog inside a git repo or gist.
+CATALOG_FILENAME = "focus_catalog.json"
+
+class CatalogError(Exception):
+    """Raised when a catalog can't be read or its deltas don't verify."""
+
+def categories_hash(categories, keep_empty=False):
+    """
+    Content hash of a category → channels mapping, independent of ordering.
+    Empty categories don't count: deltas can't tell an empty category from a
+    missing one, so subscribers drop them. keep_empty reproduces the hash
+    older catalogs stored for their base snapshot.
+    """
+    canonical = {
+        cat: sorted((ch["id"], ch["name"]) for ch in channels)
+        for cat, channels in categories.items()
+        if channels or keep_empty
+    }
+    payload = json.dumps(canonical, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def make_delta(old, new, version):
+    """Describe the change from `old` to `new` categories as a delta."""
+    added, removed = {}, {}
+    for cat in set(old) | set(new):
+        old_ids = {ch["id"] for ch in old.get(cat, [])}
+        new_ids = {ch["id"] for ch in new.get(cat, [])}
+        new_channels = [ch for ch in new.get(cat, []) if ch["id"] not in old_ids]
+        gone = sorted(old_ids - new_ids)
+        if new_channels:
+            added[cat] = new_channels
+        if gone:
+            removed[cat] = gone
+    return {"version": version, "added": added, "removed": removed, "hash": categories_hash(new)}
+
+def apply_delta(categories, delta):
+    """Apply one delta in place and verify the resulting content hash."""
+    for cat, ids in delta.get("removed", {}).items():
+        gone = set(ids)
+        categories[cat] = [ch for ch in categories.get(cat, []) if ch["id"] not in gone]
+        if not categories[cat]:
+            del categories[cat]
+    for cat, channels in delta.get("added", {}).items():
+        existing = {ch["id"] for ch in categories.setdefault(cat, [])}
+        categories[cat].extend(ch for ch in channels if ch["id"] not in existing)
+    if categories_hash(categories) != delta["hash"]:
+        raise CatalogError(f"Catalog delta {delta['version']} does not match its content hash")
+    return categories
+
+def read_catalog(source):
+    """
+    Read a catalog document from a local file, a git checkout or a gist.
+    Sources: path/to/focus_catalog.json, path/to/repo, or gist:<id>.
+    """
+    try:
+        if source.startswith("gist:"):
+            res = subprocess.run(
+                ["gh", "gist", "view", source[5:], "--filename", CATALOG_FILENAME],
+                capture_output=True,
+                text=True,
+                check=True
+            )
+            return json.loads(res.stdout)
+
+        path = source
+        if os.path.isdir(source):
+            if os.path.isdir(os.path.join(source, ".git")):
+                subprocess.run(
+                    ["git", "-C", source, "pull", "--ff-only", "--quiet"],
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL
+                )
+            path = os.path.join(source, CATALOG_FILENAME)
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, subprocess.CalledProcessError, json.JSONDecodeError) as e:
+        raise CatalogError(f"Can't read catalog from {source}: {e}")
+
+def load_catalog_state():
+    """Local subscription state, or None if not subscribed."""
+    if not os.path.exists(CATALOG_CACHE_FILE):
+        return None
+    with open(CATALOG_CACHE_FILE, "r", encoding="utf-8") as f:
+        try:
+            return json.load(f)
+        except json.JSONDecodeError:
+            return None
+
+def _cache_stamp():
+    try:
+        st = os.stat(CATALOG_CACHE_FILE)
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+def save_catalog_state(state):
+    # Atomic, so a crash mid-write can't leave a file that reads as "unsubscribed".
+    write_json_atomic(CATALOG_CACHE_FILE, state)
+
+def subscribe(source):
+    """Subscribe to a team catalog and pull it for the first time."""
+    def mutate(data):
+        data["catalog"] = {"source": source}
+    update_config(mutate)
+    save_catalog_state({"source": source, "version": 0, "hash": categories_hash({}), "categories": {}})
+    return sync()
+
+def sync():
+    """
+    Bring the local catalog up to date.
+    Only deltas newer than the applied version are replayed; the base
+    snapshot is used only when the local copy is older than it.
+    Returns (old_version, new_version).
+    """
+    source = load_config().get("catalog", {}).get("source")
+    if not source:
+        raise CatalogError("Not subscribed to a catalog. Run: gh focus catalog subscribe <source>")
+
+    state = load_catalog_state()
+    if not state or state.get("source") != source:
+        state = {"source": source, "version": 0, "hash": categories_hash({}), "categories": {}}
+
+    doc = read_catalog(source)
+    old_version = state["version"]
+    categories = state["categories"]
+
+    base = doc.get("base")
+    if base and base["version"] > state["version"]:
+        categories = copy.deepcopy(base["categories"])
+        if base["hash"] not in (categories_hash(categories), categories_hash(categories, keep_empty=True)):
+            raise CatalogError("Catalog base snapshot does not match its content hash")
+        state["version"] = base["version"]
+
+    for delta in sorted(doc.get("deltas", []), key=lambda d: d["version"]):
+        if delta["version"] > state["version"]:
+            apply_delta(categories, delta)
+            state["version"] = delta["version"]
+
+    state["categories"] = categories
+    state["hash"] = categories_hash(categories)
+    state.pop("merged", None)
+    save_catalog_state(state)
+    _merged_memo.clear()
+    return old_version, state["version"]
+
+def publish(path, categories):
+    """
+    Append a delta to a catalog file so subscribers pick up only the change.
+    Creates the catalog (with a base snapshot) if it doesn't exist yet.
+    """
+    if not os.path.exists(path):
+        doc = {
+            "version": 1,
+            "base": {"version": 1, "categories": categories, "hash": categories_hash(categories)},
+            "deltas": []
+        }
+    else:
+        with open(path, "r", encoding="utf-8") as f:
+            doc = json.load(f)
+        current = copy.deepcopy(doc.get("base", {}).get("categories", {}))
+        for delta in sorted(doc.get("deltas", []), key=lambda d: d["version"]):
+            apply_delta(current, delta)
+        delta = make_delta(current, categories, doc["version"] + 1)
+        if not delta["added"] and not delta["removed"]:
+            return doc["version"]
+        doc["deltas"].append(delta)
+        doc["version"] = delta["version"]
+
+    # Atomic, so subscribers never read a half-written catalog.
+    write_json_atomic(path, doc, indent=4)
+    return doc["version"]
+
+# Merged view memo for this process: (cache key, merged config).
+_merged_memo = {}
+
+def merge(catalog_categories, config):
+    """Layer local config on top of catalog categories."""
+    merged = {key: value for key, value in config.items() if not isinstance(value, list)}
+    hidden = config.get("catalog_hidden", {})
+    for cat, channels in catalog_categories.items():
+        skip = set(hidden.get(cat, []))
+        visible = [ch for ch in channels if ch["id"] not in skip]
+        # A catalog category whose channels are all hidden was removed locally.
+        if visible or not skip:
+            merged[cat] = visible
+    for cat, channels in config.items():
+        if not isinstance(channels, list):
+            continue
+        seen = {ch["id"] for ch in merged.get(cat, [])}
+        merged[cat] = merged.get(cat, []) + [ch for ch in channels if ch["id"] not in seen]
+    return merged
+
+def load_merged_config():
+    """
+    Config as the menus see it: team catalog plus local overrides.
+    The merged view is cached on disk and reused until either side changes.
+    """
+    config = load_config()
+    if not config.get("catalog"):
+        return config
+
+    # load_config() hands back the same object until config.json changes.
+    if _merged_memo.get("config") is config and _merged_memo.get("stamp") == _cache_stamp():
+        return _merged_memo["merged"]
+
+    state = load_catalog_state()
+    if not state:
+        return config
+
+    # Channel order matters to the menus, so the local part of the key keeps it.
+    local = json.dumps({k: v for k, v in config.items() if isinstance(v, list)}, separators=(",", ":"))
+    key = f"{state['hash']}:{hashlib.sha256(local.encode('utf-8')).hexdigest()}:{json.dumps(config.get('catalog_hidden', {}), sort_keys=True)}"
+    cached = state.get("merged")
+    if cached and cached.get("key") == key:
+        merged = cached["config"]
+        merged.update({k: v for k, v in config.items() if not isinstance(v, list)})
+    else:
+        merged = merge(state["categories"], config)
+        state["merged"] = {"key": key, "config": merged}
+        save_catalog_state(state)
+
+    _merged_memo.update(config=config, stamp=_cache_stamp(), merged=merged)
+    return merged
+
+def hide_catalog_category(category):
+    """Hide every catalog channel in `category` locally. False if the catalog has none there."""
+    state = load_catalog_state()
+    ids = [ch["id"] for ch in (state or {}).get("categories", {}).get(category, [])]
+    if not ids:
+        return False
+    def mutate(data):
+        hidden = data.setdefault("catalog_hidden", {}).setdefault(category, [])
+        hidden.extend(channel_id for channel_id in ids if channel_id not in hidden)
+    update_config(mutate)
+    return True
+
+def hide_catalog_channel(category, channel_id):
+    """Hide a catalog channel locally (the catalog itself is untouched)."""
+    state = load_catalog_state()
+    if not state or not any(ch["id"] == channel_id for ch in state["categories"].get(category, [])):
+        return False
+    def mutate(data):
+        hidden = data.setdefault("catalog_hidden", {}).setdefault(category, [])
+        if channel_id in hidden:
+            return False
+        hidden.append(channel_id)
+    update_config(mutate)
+    return True
@@ -0,0 +1,242 @@
+import csv
+import io
+import re
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, urlparse
+from xml.sax.saxutils import quoteattr
+from focus_manager import update_config
+
+# Parallel yt-dlp lookups when importing handles and URLs.
+RESOLVE_WORKERS = 8
+
+# Category for imported channels when neither the file nor --category names one.
+DEFAULT_IMPORT_CATEGORY = "imported"
+
+FORMATS = ("opml", "csv", "list")
+
+CHANNEL_ID_PATTERN = re.compile(r"^UC[0-9A-Za-z_-]{20,}$")
+
+def normalize_category_name(raw_name):
+    """Normalize a user-provided category into a safe key."""
+    if not raw_name:
+        return None
+    cleaned = raw_name.strip().lower()
+    cleaned = re.sub(r"\s+", "_", cleaned)
+    cleaned = re.sub(r"[^a-z0-9_]", "", cleaned)
+    cleaned = cleaned.strip("_")
+    return cleaned or None
+
+def is_valid_channel_id(raw_id):
+    """Basic validation for YouTube channel IDs (UC...)."""
+    if not raw_id:
+        return False
+    return CHANNEL_ID_PATTERN.match(raw_id.strip()) is not None
+
+def is_valid_handle_or_url(user_input):
+    """Accept a handle (@...), URL, or UC... ID."""
+    if not user_input:
+        return False
+    trimmed = user_input.strip()
+    return trimmed.startswith("@") or trimmed.startswith("http") or trimmed.startswith("UC")
+
+def channel_id_from_ref(ref):
+    """Channel ID contained in a UC... ID, /channel/ URL or feed URL, else None."""
+    ref = ref.strip()
+    if is_valid_channel_id(ref):
+        return ref
+    if ref.startswith("http"):
+        parsed = urlparse(ref)
+        feed_id = parse_qs(parsed.query).get("channel_id", [None])[0]
+        if is_valid_channel_id(feed_id):
+            return feed_id
+        parts = parsed.path.strip("/").split("/")
+        if len(parts) >= 2 and parts[0] == "channel" and is_valid_channel_id(parts[1]):
+            return parts[1]
+    return None
+
+def detect_format(path, text):
+    if path.lower().endswith((".opml", ".xml")) or text.lstrip().startswith("<"):
+        return "opml"
+    if path.lower().endswith(".csv"):
+        return "csv"
+    return "list"
+
+def parse_opml(text):
+    """
+    Entries from an OPML file; nested outlines become categories. A single
+    top-level folder around everything (YouTube's export wraps all feeds in
+    "YouTube Subscriptions") is a container, not a category.
+    """
+    root = ET.fromstring(text)
+    body = root.find("body")
+    node = body if body is not None else root
+    entries = []
+
+    def walk(node, category):
+        for outline in node.findall("outline"):
+            label = outline.get("title") or outline.get("text")
+            url = outline.get("xmlUrl") or outline.get("htmlUrl")
+            if url:
+                entries.append({"ref": url, "name": label, "category": category})
+            else:
+                walk(outline, label or category)
+
+    top = node.findall("outline")
+    if len(top) == 1 and not (top[0].get("xmlUrl") or top[0].get("htmlUrl")):
+        node = top[0]
+    walk(node, None)
+    return entries
+
+def parse_csv(text):
+    """
+    Entries from a CSV with a header row. Understands YouTube's Takeout
+    subscriptions.csv (Channel Id, Channel Url, Channel Title) as well as
+    id/url/handle, name/title and category columns.
+    """
+    reader = csv.DictReader(io.StringIO(text))
+    entries = []
+    for row in reader:
+        row = {(k or "").strip().lower(): (v or "").strip() for k, v in row.items()}
+        ref = (
+            row.get("channel id") or row.get("id") or row.get("channel url")
+            or row.get("url") or row.get("handle") or row.get("channel")
+        )
+        if ref:
+            entries.append({
+                "ref": ref,
+                "name": row.get("channel title") or row.get("name") or row.get("title") or None,
+                "category": row.get("category") or None
+            })
+    return entries
+
+def parse_list(text):
+    """One handle, URL or UC... ID per line; '# name' lines start a category."""
+    entries, category = [], None
+    for line in text.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        if line.startswith("#"):
+            category = line.lstrip("#").strip() or None
+        else:
+            entries.append({"ref": line, "name": None, "category": category})
+    return entries
+
+def read_channel_file(path, fmt=None):
+    """Parse an OPML, CSV or plain-list file into import entries."""
+    with open(path, "r", encoding="utf-8-sig") as f:
+        text = f.read()
+    fmt = fmt or detect_format(path, text)
+    parser = {"opml": parse_opml, "csv": parse_csv, "list": parse_list}[fmt]
+    return parser(text)
+
+def resolve_entries(entries, workers=RESOLVE_WORKERS):
+    """
+    Turn entries into channels. IDs and /channel/ URLs are read directly;
+    handles and other URLs are resolved through yt-dlp in parallel.
+    Returns (resolved, failed): resolved entries gain "id" and a "name".
+    """
+    from fetcher import resolve_channel
+
+    resolved, failed, pending = [], [], []
+    for entry in entries:
+        channel_id = channel_id_from_ref(entry["ref"])
+        if channel_id:
+            resolved.append(dict(entry, id=channel_id))
+        elif entry["ref"].startswith("UC"):
+            # Looks like an ID but isn't one; yt-dlp can't help.
+            failed.append(entry)
+        else:
+            pending.append(entry)
+
+    # The same handle often appears in several categories; look it up once.
+    refs = list(dict.fromkeys(e["ref"] for e in pending))
+    if refs:
+        with ThreadPoolExecutor(max_workers=min(workers, len(refs))) as pool:
+            lookups = dict(zip(refs, pool.map(lambda ref: resolve_channel(ref, quiet=True), refs)))
+        for entry in pending:
+            found = lookups[entry["ref"]]
+            if found:
+                resolved.append(dict(entry, id=found["id"], name=entry["name"] or found["name"]))
+            else:
+                failed.append(entry)
+
+    for entry in resolved:
+        if not entry.get("name"):
+            entry["name"] = entry["ref"].lstrip("@") if not entry["ref"].startswith(("http", "UC")) else entry["id"]
+    return resolved, failed
+
+def import_channels(resolved, default_category=DEFAULT_IMPORT_CATEGORY, category=None):
+    """
+    Add resolved channels in a single config write. A channel already in
+    any category (or listed twice in the import) is skipped.
+    category puts every channel there, whatever the file says; otherwise
+    default_category is used for channels the file doesn't categorise.
+    Returns (added, skipped) lists of (category, channel) pairs.
+    """
+    override = category
+    outcome = {"added": [], "skipped": []}
+
+    def mutate(data):
+        outcome["added"].clear()
+        outcome["skipped"].clear()
+        known = {
+            ch["id"] for channels in data.values() if isinstance(channels, list) for ch in channels
+        }
+        for entry in resolved:
+            category = override or normalize_category_name(entry.get("category")) or default_category
+            channel = {"name": entry["name"], "id": entry["id"]}
+            if entry["id"] in known:
+                outcome["skipped"].append((category, channel))
+                continue
+            known.add(entry["id"])
+            data.setdefault(category, []).append(channel)
+            outcome["added"].append((category, channel))
+        if not outcome["added"]:
+            return False
+
+    update_config(mutate)
+    return outcome["added"], outcome["skipped"]
+
+def export_channels(config, fmt, categories=None):
+    """Render channel categories as OPML, CSV or a plain list."""
+    selected = [
+        (cat, channels) for cat, channels in config.items()
+        if isinstance(channels, list) and (not categories or cat in categories)
+    ]
+
+    if fmt == "csv":
+        out = io.StringIO()
+        writer = csv.writer(out, lineterminator="\n")
+        writer.writerow(["category", "name", "id", "url"])
+        for cat, channels in selected:
+            for ch in channels:
+                writer.writerow([cat, ch["name"], ch["id"], f"https://www.youtube.com/channel/{ch['id']}"])
+        return out.getvalue()
+
+    if fmt == "opml":
+        lines = [
+            '<?xml version="1.0" encoding="UTF-8"?>',
+            '<opml version="1.1">',
+            "  <head><title>gh-focus channels</title></head>",
+            "  <body>"
+        ]
+        for cat, channels in selected:
+            lines.append(f"    <outline text={quoteattr(cat)} title={quoteattr(cat)}>")
+            for ch in channels:
+                feed = f"https://www.youtube.com/feeds/videos.xml?channel_id={ch['id']}"
+                lines.append(
+                    f'      <outline type="rss" text={quoteattr(ch["name"])} '
+                    f'title={quoteattr(ch["name"])} xmlUrl={quoteattr(feed)}/>'
+                )
+            lines.append("    </outline>")
+        lines += ["  </body>", "</opml>", ""]
+        return "\n".join(lines)
+
+    lines = []
+    for cat, channels in selected:
+        lines.append(f"# {cat}")
+        lines.extend(ch["id"] for ch in channels)
+        lines.append("")
+    return "\n".join(lines)
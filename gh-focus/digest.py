@@ -0,0 +1,142 @@
+"""
+New-video digests, diffed against the previous run.
+
+The snapshot keeps every channel's video IDs from its last successful fetch
+as a sorted list, so finding what's new is a linear merge of two sorted
+lists per channel. Channels that fail to fetch keep their old IDs; channels
+seen for the first time only contribute videos published since the last
+digest (or the last FIRST_RUN_DAYS days on the very first run).
+"""
+
+import html
+import json
+import os
+import time
+from datetime import datetime
+from archive import parse_published
+from focus_manager import write_json_atomic
+from learning_log import patch_gist
+
+SNAPSHOT_FILE = "digest_snapshot.json"
+SNAPSHOT_VERSION = 1
+
+# With no snapshot yet, the first digest covers this many days.
+FIRST_RUN_DAYS = 7
+
+# Gist file name for a published digest (to the minute, so runs don't overwrite each other).
+DIGEST_FILENAME = "focus_digest_{stamp}.md"
+
+def load_snapshot():
+    """{'taken_at': epoch or None, 'channels': {channel_id: sorted [video_id]}}"""
+    if os.path.exists(SNAPSHOT_FILE):
+        with open(SNAPSHOT_FILE, "r", encoding="utf-8") as f:
+            try:
+                data = json.load(f)
+            except json.JSONDecodeError:
+                data = {}
+        if data.get("version") == SNAPSHOT_VERSION:
+            return data
+    return {"version": SNAPSHOT_VERSION, "taken_at": None, "channels": {}}
+
+def save_snapshot(snapshot, by_channel, taken_at=None):
+    """Replace the fetched channels' ID lists and stamp the snapshot."""
+    for channel_id, videos in by_channel.items():
+        snapshot["channels"][channel_id] = sorted({v.video_id for v in videos})
+    snapshot["taken_at"] = taken_at or time.time()
+    write_json_atomic(SNAPSHOT_FILE, snapshot)
+
+def sorted_difference(current, previous):
+    """Items of sorted list `current` missing from sorted list `previous`, by merging."""
+    missing = []
+    j = 0
+    for item in current:
+        while j < len(previous) and previous[j] < item:
+            j += 1
+        if j == len(previous) or previous[j] != item:
+            missing.append(item)
+    return missing
+
+def new_videos(by_channel, snapshot, since=None):
+    """
+    {channel_id: [Video]} of videos not in the snapshot.
+    since (epoch) switches to a plain published-date cut-off instead.
+    """
+    cutoff = since
+    if cutoff is None:
+        cutoff = snapshot["taken_at"] or time.time() - FIRST_RUN_DAYS * 86400
+    result = {}
+    for channel_id, videos in by_channel.items():
+        previous = snapshot["channels"].get(channel_id)
+        if since is None and previous is not None:
+            by_id = {v.video_id: v for v in videos}
+            fresh = [by_id[vid] for vid in sorted_difference(sorted(by_id), previous)]
+        else:
+            fresh = [v for v in videos if (parse_published(v.published) or 0) >= cutoff]
+        if fresh:
+            result[channel_id] = sorted(fresh, key=lambda v: v.published or "", reverse=True)
+    return result
+
+def group_by_category(fresh, config):
+    """[(category, [Video])] in config order; a channel in two categories shows up in both."""
+    groups = []
+    for category, channels in config.items():
+        if not isinstance(channels, list):
+            continue
+        videos = [v for ch in channels for v in fresh.get(ch['id'], [])]
+        if videos:
+            groups.append((category, sorted(videos, key=lambda v: v.published or "", reverse=True)))
+    return groups
+
+def _date(published):
+    return (published or "")[:10]
+
+def _heading(groups, since_label):
+    count = len({v.video_id for _, videos in groups for v in videos})
+    return f"{count} new video{'s' if count != 1 else ''} {since_label}"
+
+def render_markdown(groups, since_label, generated=None):
+    generated = generated or datetime.now()
+    lines = [f"# 🎯 gh focus digest — {generated:%Y-%m-%d}", "", f"_{_heading(groups, since_label)}_", ""]
+    for category, videos in groups:
+        lines.append(f"## {category} ({len(videos)})")
+        lines.append("")
+        for v in videos:
+            title = v.title.replace("[", "\\[").replace("]", "\\]")
+            lines.append(f"- [{title}]({v.link}) — {v.channel} · {_date(v.published)}")
+        lines.append("")
+    if not groups:
+        lines.append("Nothing new. Stay focused! 🎯")
+    return "\n".join(lines).rstrip() + "\n"
+
+def render_html(groups, since_label, generated=None):
+    generated = generated or datetime.now()
+    parts = [
+        "<!DOCTYPE html><html><head><meta charset=\"utf-8\">",
+        f"<title>gh focus digest {generated:%Y-%m-%d}</title></head><body>",
+        f"<h1>🎯 gh focus digest — {generated:%Y-%m-%d}</h1>",
+        f"<p><em>{html.escape(_heading(groups, since_label))}</em></p>"
+    ]
+    for category, videos in groups:
+        parts.append(f"<h2>{html.escape(category)} ({len(videos)})</h2><ul>")
+        for v in videos:
+            parts.append(
+                f'<li><a href="{html.escape(v.link)}">{html.escape(v.title)}</a> — '
+                f"{html.escape(v.channel)} · {_date(v.published)}</li>"
+            )
+        parts.append("</ul>")
+    if not groups:
+        parts.append("<p>Nothing new. Stay focused! 🎯</p>")
+    parts.append("</body></html>")
+    return "\n".join(parts) + "\n"
+
+def since_label(snapshot, since=None):
+    stamp = since if since is not None else snapshot["taken_at"]
+    if stamp is None:
+        return f"in the last {FIRST_RUN_DAYS} days"
+    return f"since {datetime.fromtimestamp(stamp):%Y-%m-%d %H:%M}"
+
+def publish(gist_id, markdown, generated=None):
+    """Add the digest to the Learning Log gist in one update. Returns the file name."""
+    name = DIGEST_FILENAME.format(stamp=f"{generated or datetime.now():%Y_%m_%d_%H%M}")
+    patch_gist(gist_id, {name: {"content": markdown}})
+    return name
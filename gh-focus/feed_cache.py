@@ -0,0 +1,229 @@
+"""
+Latest fetched videos per channel, shared by the menu and `gh focus serve`.
+
+Stored as one binary file:
+
+    header  | magic, version, channel count, index offset
+    blocks  | one zlib-compressed JSON array of rows per channel
+    index   | fixed-size records sorted by channel ID: id, fetched_at, offset, length
+
+Readers mmap the file and binary-search the index, so opening it costs the
+same for ten channels or ten thousand, and only the blocks asked for are
+ever decompressed. Writers copy untouched blocks across as raw bytes.
+"""
+
+import json
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import time
+import zlib
+from videos import Video
+
+FEED_CACHE_FILE = "feed_cache.bin"
+FEED_CACHE_VERSION = 2
+
+# The JSON cache used before version 2; imported once if found.
+LEGACY_CACHE_FILE = "feed_cache.json"
+
+MAGIC = b"GHFC"
+HEADER = struct.Struct("<4sHHIQ")
+# Channel IDs are 24 characters; the spare bytes leave room for odd ones.
+KEY_SIZE = 32
+RECORD = struct.Struct(f"<{KEY_SIZE}sdQI")
+
+# zlib level for channel blocks (its default speed/size balance).
+COMPRESSION_LEVEL = 6
+
+# Process-level mapping of the file plus the file stamp it was opened at.
+# The lock keeps `serve`'s refresh threads from unmapping it mid-read.
+_cache = {"stamp": None, "file": None, "map": None, "count": 0, "index": 0}
+_lock = threading.RLock()
+
+# Records handed out per channel, keyed by their fetch time: reopening a
+# category reuses the same Video objects (and the menu built on them)
+# instead of decoding the block again.
+_decoded = {}
+
+def _stamp():
+    try:
+        st = os.stat(FEED_CACHE_FILE)
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+def _close():
+    if _cache["map"] is not None:
+        _cache["map"].close()
+        _cache["file"].close()
+    _cache.update(stamp=None, file=None, map=None, count=0, index=0)
+
+def _open():
+    """Map the cache file (re-mapped only when it changed). Returns the mmap or None."""
+    stamp = _stamp()
+    if stamp is None and os.path.exists(LEGACY_CACHE_FILE):
+        _import_legacy()
+        stamp = _stamp()
+    if stamp == _cache["stamp"]:
+        return _cache["map"]
+
+    _close()
+    if stamp is None or stamp[1] < HEADER.size:
+        _cache["stamp"] = stamp
+        return None
+    f = open(FEED_CACHE_FILE, "rb")
+    mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    magic, version, _, count, index = HEADER.unpack_from(mapped, 0)
+    if magic != MAGIC or version != FEED_CACHE_VERSION or index + count * RECORD.size > len(mapped):
+        mapped.close()
+        f.close()
+        _cache["stamp"] = stamp
+        return None
+    _cache.update(stamp=stamp, file=f, map=mapped, count=count, index=index)
+    return mapped
+
+def _key(channel_id):
+    return channel_id.encode("utf-8").ljust(KEY_SIZE, b"\0")
+
+def _record(mapped, position):
+    return RECORD.unpack_from(mapped, _cache["index"] + position * RECORD.size)
+
+def _find(channel_id):
+    """(fetched_at, offset, length) for a channel, or None. Binary search over the mapped index."""
+    mapped = _open()
+    if mapped is None or len(channel_id.encode("utf-8")) > KEY_SIZE:
+        return None
+    key = _key(channel_id)
+    low, high = 0, _cache["count"]
+    while low < high:
+        middle = (low + high) // 2
+        record = _record(mapped, middle)
+        if record[0] < key:
+            low = middle + 1
+        elif record[0] > key:
+            high = middle
+        else:
+            return record[1:]
+    return None
+
+def _decode(block):
+    return [Video(*row) for row in json.loads(zlib.decompress(block))]
+
+def _encode(videos):
+    rows = [[v.title, v.channel, v.published, v.video_id] for v in videos]
+    return zlib.compress(json.dumps(rows, separators=(",", ":")).encode("utf-8"), COMPRESSION_LEVEL)
+
+def _write(entries):
+    """
+    Write the whole cache atomically.
+    entries: {channel_id: (fetched_at, compressed_block)}
+    """
+    keys = sorted(entries, key=_key)
+    directory = os.path.dirname(os.path.abspath(FEED_CACHE_FILE))
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=f".{FEED_CACHE_FILE}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(b"\0" * HEADER.size)
+            records = []
+            offset = HEADER.size
+            for channel_id in keys:
+                fetched_at, block = entries[channel_id]
+                f.write(block)
+                records.append(RECORD.pack(_key(channel_id), fetched_at, offset, len(block)))
+                offset += len(block)
+            f.write(b"".join(records))
+            f.seek(0)
+            f.write(HEADER.pack(MAGIC, FEED_CACHE_VERSION, 0, len(records), offset))
+        # Windows can't replace a file that is still mapped.
+        _close()
+        os.replace(temp_path, FEED_CACHE_FILE)
+    except Exception:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+def _entries():
+    """Every stored channel as {channel_id: (fetched_at, compressed_block)}, blocks left compressed."""
+    mapped = _open()
+    entries = {}
+    for position in range(_cache["count"] if mapped is not None else 0):
+        key, fetched_at, offset, length = _record(mapped, position)
+        entries[key.rstrip(b"\0").decode("utf-8")] = (fetched_at, mapped[offset:offset + length])
+    return entries
+
+def _import_legacy():
+    """Carry a version 1 feed_cache.json over to the binary format."""
+    with open(LEGACY_CACHE_FILE, "r", encoding="utf-8") as f:
+        try:
+            data = json.load(f)
+        except json.JSONDecodeError:
+            return
+    if data.get("version") != 1:
+        return
+    entries = {}
+    for channel_id, entry in data.get("channels", {}).items():
+        if len(channel_id.encode("utf-8")) <= KEY_SIZE:
+            block = zlib.compress(json.dumps(entry["videos"], separators=(",", ":")).encode("utf-8"), COMPRESSION_LEVEL)
+            entries[channel_id] = (entry["fetched_at"], block)
+    _write(entries)
+    os.remove(LEGACY_CACHE_FILE)
+
+def store(results):
+    """
+    Save fresh results for several channels in one write.
+    results: {channel_id: [Video, ...]}
+    """
+    if not results:
+        return
+    now = time.time()
+    blocks = {
+        channel_id: (now, _encode(videos))
+        for channel_id, videos in results.items()
+        if len(channel_id.encode("utf-8")) <= KEY_SIZE
+    }
+    with _lock:
+        entries = _entries()
+        entries.update(blocks)
+        _write(entries)
+        for channel_id in blocks:
+            _decoded[channel_id] = (now, list(results[channel_id]))
+
+def lookup(channel_id):
+    """(fetched_at, [Video, ...]) for one channel, or None if it isn't cached."""
+    with _lock:
+        found = _find(channel_id)
+        if found is None:
+            return None
+        fetched_at, offset, length = found
+        decoded = _decoded.get(channel_id)
+        if decoded is None or decoded[0] != fetched_at:
+            decoded = _decoded[channel_id] = (fetched_at, _decode(_cache["map"][offset:offset + length]))
+    return fetched_at, list(decoded[1])
+
+def get_cached_videos(channel_list, max_age=None):
+    """
+    Cached videos for the given channels (no network).
+    With max_age (seconds), channels fetched longer ago than that are left out.
+    """
+    videos = []
+    now = time.time()
+    for ch in channel_list:
+        entry = lookup(ch["id"])
+        if entry and (max_age is None or now - entry[0] <= max_age):
+            videos.extend(entry[1])
+    return videos
+
+def fresh_channels(channel_list, max_age):
+    """IDs of the given channels fetched within the last max_age seconds."""
+    now = time.time()
+    with _lock:
+        found = {ch["id"]: _find(ch["id"]) for ch in channel_list}
+    return {channel_id for channel_id, entry in found.items() if entry and now - entry[0] <= max_age}
+
+def last_fetched(channel_list):
+    """Most recent fetch time across the given channels, or None."""
+    with _lock:
+        times = [found[0] for found in map(_find, (ch["id"] for ch in channel_list)) if found]
+    return max(times) if times else None
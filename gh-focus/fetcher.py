@@ -1,16 +1,71 @@
-import feedparser
 import concurrent.futures
+import contextlib
+import io
 import json
+import os
+import re
 import subprocess
-from rich.console import Console
+import sys
+import urllib.error
+import xml.etree.ElementTree as ET
+from videos import Video, is_short
+import archive
+import feed_cache
+import net
+import offline
+import thumbnails
+import unread
 
-console = Console()
+# rich Console, created on first use so headless commands never import rich.
+console = None
 
-def resolve_channel_id(user_input):
+class PlainConsole:
+    """Console stand-in for headless runs: no spinner, markup stripped, messages on stderr."""
+    quiet = False
+
+    def print(self, message):
+        if not self.quiet:
+            sys.stderr.write(re.sub(r"\[/?[a-z ]+\]", "", str(message)) + "\n")
+
+    def status(self, message):
+        return contextlib.nullcontext()
+
+def get_console():
+    global console
+    if console is None:
+        from rich.console import Console
+        console = Console()
+    return console
+
+# RSS endpoint; overridable so benchmarks can point at a local stand-in.
+FEED_URL = os.environ.get("GH_FOCUS_FEED_URL", "https://www.youtube.com/feeds/videos.xml")
+
+# How many entries per channel make it into the menu.
+ENTRIES_PER_CHANNEL = 3
+
+# Entries parsed per feed; all of them go to the archive (YouTube serves ~15).
+FEED_ENTRIES = 15
+
+# Concurrent feed downloads per process.
+THREADS_PER_WORKER = 10
+
+# Channel count at which get_videos spreads parsing across processes.
+PROCESS_POOL_THRESHOLD = 300
+
+# Namespaces used by YouTube's Atom feeds.
+ATOM_NS = "{http://www.w3.org/2005/Atom}"
+YT_NS = "{http://www.youtube.com/xml/schemas/2015}"
+
+def resolve_channel(user_input, quiet=False):
     """
-    Resolve a YouTube handle or URL to a channel ID using yt-dlp.
+    Resolve a YouTube handle or URL to {"id", "name"} using yt-dlp.
+    quiet=True suppresses progress and error output (bulk imports).
     """
-    print(f"[cyan]🔍 Resolving ID for '{user_input}'...[/cyan]")
+    def say(message):
+        if not quiet:
+            get_console().print(message)
+
+    say(f"[cyan]🔍 Resolving ID for '{user_input}'...[/cyan]")
 
     if not user_input.startswith("http"):
         if not user_input.startswith("@"):
@@ -30,25 +85,35 @@ def resolve_channel_id(user_input):
     try:
         result = subprocess.run(cmd, capture_output=True, text=True, timeout=15)
         if result.returncode != 0:
-            console.print(f"[yellow]⚠️  Resolution failed (maybe private channel?)[/yellow]")
+            say(f"[yellow]⚠️  Resolution failed (maybe private channel?)[/yellow]")
             return None
 
         for line in result.stdout.splitlines():
             try:
                 data = json.loads(line)
                 if "channel_id" in data:
-                    return data["channel_id"]
+                    return {
+                        "id": data["channel_id"],
+                        "name": data.get("channel") or data.get("uploader") or data.get("playlist_uploader")
+                    }
             except json.JSONDecodeError:
                 continue
     except subprocess.TimeoutExpired:
-        console.print(f"[red]❌ Timeout: couldn't reach YouTube[/red]")
+        say(f"[red]❌ Timeout: couldn't reach YouTube[/red]")
         return None
     except Exception as e:
-        console.print(f"[red]Error resolving ID: {e}[/red]")
+        say(f"[red]Error resolving ID: {e}[/red]")
         return None
 
     return None
 
+def resolve_channel_id(user_input):
+    """
+    Resolve a YouTube handle or URL to a channel ID using yt-dlp.
+    """
+    resolved = resolve_channel(user_input)
+    return resolved["id"] if resolved else None
+
 def fetch_videos_yt_dlp(channel):
     """Fallback: Fetch videos using yt-dlp when RSS is disabled."""
     results = []
@@ -74,67 +139,221 @@ def fetch_videos_yt_dlp(channel):
                 try:
                     data = json.loads(line)
                     if data.get("id"):
-                        results.append({
-                            "title": data.get("title", "Unknown"),
-                            "link": f"https://www.youtube.com/watch?v={data['id']}",
-                            "channel": channel['name'],
-                            "published": data.get("upload_date", "N/A"),
-                            "video_id": data['id']
-                        })
+                        results.append(Video(
+                            data.get("title", "Unknown"),
+                            channel['name'],
+                            data.get("upload_date", "N/A"),
+                            data['id']
+                        ))
                         line_count += 1
                 except json.JSONDecodeError:
                     continue
             
             if line_count > 0:
-                console.print(f"[green]✓ Fetched {line_count} videos from {channel['name']} (yt-dlp)[/green]")
+                get_console().print(f"[green]✓ Fetched {line_count} videos from {channel['name']} (yt-dlp)[/green]")
                 return results
         
         if result.stderr:
-            console.print(f"[yellow]⚠️  {channel['name']}: {result.stderr[:100]}[/yellow]")
+            get_console().print(f"[yellow]⚠️  {channel['name']}: {result.stderr[:100]}[/yellow]")
     except subprocess.TimeoutExpired:
-        console.print(f"[yellow]⏱️  Timeout fetching {channel['name']}[/yellow]")
+        get_console().print(f"[yellow]⏱️  Timeout fetching {channel['name']}[/yellow]")
     except Exception as e:
-        console.print(f"[yellow]❌ yt-dlp error for {channel['name']}: {str(e)[:80]}[/yellow]")
+        get_console().print(f"[yellow]❌ yt-dlp error for {channel['name']}: {str(e)[:80]}[/yellow]")
     
     return results
 
 
-def fetch_single_channel(channel):
-    """Fetch videos for a single channel."""
-    rss_url = f"https://www.youtube.com/feeds/videos.xml?channel_id={channel['id']}"
-    results = []
+def download_feed(url, timeout=10):
+    """Download a raw feed document (paced and retried by net.get)."""
+    return net.get(url, timeout=timeout)
+
+def parse_youtube_feed(data, limit=ENTRIES_PER_CHANNEL):
+    """
+    Fast path for YouTube's fixed Atom schema.
+    Streams the document and stops after `limit` entries.
+    Raises ValueError if the feed doesn't look like a YouTube feed.
+    """
+    entries = []
+    for _, elem in ET.iterparse(io.BytesIO(data), events=("end",)):
+        if elem.tag != f"{ATOM_NS}entry":
+            continue
+        link = elem.find(f"{ATOM_NS}link")
+        entry = {
+            "title": elem.findtext(f"{ATOM_NS}title"),
+            "link": link.get("href") if link is not None else None,
+            "published": elem.findtext(f"{ATOM_NS}published"),
+            "video_id": elem.findtext(f"{YT_NS}videoId"),
+        }
+        if not all(entry.values()):
+            raise ValueError("Unexpected entry layout")
+        entries.append(entry)
+        elem.clear()
+        if limit and len(entries) >= limit:
+            break
+    if not entries:
+        raise ValueError("No Atom entries found")
+    return entries
+
+def parse_feed(data, limit=ENTRIES_PER_CHANNEL):
+    """Parse feed bytes, falling back to feedparser when the fast path can't."""
     try:
-        feed = feedparser.parse(rss_url)
-        if not feed.entries:
-            console.print(f"[cyan]ℹ️  {channel['name']}: Trying alternate fetch method...[/cyan]")
-            return fetch_videos_yt_dlp(channel)
-        for entry in feed.entries[:3]:
-            results.append({
+        return parse_youtube_feed(data, limit)
+    except (ET.ParseError, ValueError):
+        import feedparser
+        feed = feedparser.parse(data)
+        return [
+            {
                 "title": entry.title,
                 "link": entry.link,
-                "channel": channel['name'],
                 "published": entry.published,
                 "video_id": entry.yt_videoid
-            })
+            }
+            for entry in feed.entries[:limit]
+        ]
+
+def fetch_single_channel(channel):
+    """Fetch videos for a single channel."""
+    rss_url = f"{FEED_URL}?channel_id={channel['id']}"
+    results = []
+    try:
+        entries = parse_feed(download_feed(rss_url), FEED_ENTRIES)
+        if not entries:
+            get_console().print(f"[cyan]ℹ️  {channel['name']}: Trying alternate fetch method...[/cyan]")
+            return fetch_videos_yt_dlp(channel)
+        for entry in entries:
+            results.append(Video(
+                entry["title"],
+                channel['name'],
+                entry["published"],
+                entry["video_id"]
+            ))
+    except urllib.error.HTTPError as e:
+        if e.code == 429:
+            # Still throttled after backing off; yt-dlp would only add to the load.
+            get_console().print(f"[yellow]⚠️  {channel['name']}: YouTube is rate limiting, try again shortly[/yellow]")
+            return []
+        get_console().print(f"[cyan]ℹ️  {channel['name']}: Trying alternate fetch method...[/cyan]")
+        return fetch_videos_yt_dlp(channel)
     except Exception as e:
-        console.print(f"[cyan]ℹ️  {channel['name']}: Trying alternate fetch method...[/cyan]")
+        get_console().print(f"[cyan]ℹ️  {channel['name']}: Trying alternate fetch method...[/cyan]")
         return fetch_videos_yt_dlp(channel)
     return results
 
-def get_videos(channel_list):
+def fetch_channels_threaded(channel_list):
+    """Fetch a set of channels concurrently on a thread pool, yielding (channel, videos) as they arrive."""
+    with concurrent.futures.ThreadPoolExecutor(max_workers=THREADS_PER_WORKER) as executor:
+        futures = {executor.submit(fetch_single_channel, ch): ch for ch in channel_list}
+        for future in concurrent.futures.as_completed(futures):
+            yield futures[future], future.result()
+
+def fetch_channel_batch(channel_list):
+    """
+    Process-pool worker: fetch a slice of channels and return it as columns.
+    Columnar lists pickle compactly (repeated channel names are sent once).
+    """
+    channel_ids, titles, channels, published, video_ids = [], [], [], [], []
+    for channel, results in fetch_channels_threaded(channel_list):
+        for v in results:
+            channel_ids.append(channel['id'])
+            titles.append(v.title)
+            channels.append(v.channel)
+            published.append(v.published)
+            video_ids.append(v.video_id)
+    return channel_ids, titles, channels, published, video_ids
+
+def record_results(by_channel):
+    """
+    Everything parsed goes to the archive; only the newest few reach the menu,
+    the feed cache and the unread counts. Returns {channel_id: latest videos}.
+    """
+    archive.record(by_channel)
+    latest = {channel_id: results[:ENTRIES_PER_CHANNEL] for channel_id, results in by_channel.items()}
+    feed_cache.store(latest)
+    unread.record_fetch(latest)
+    return latest
+
+def stream_videos(channel_list, max_age=None):
+    """
+    Yield (channel, videos) as each feed arrives, for callers that want
+    results before the whole refresh is done. Channels cached within max_age
+    seconds come first, without a fetch. Fetched results are recorded like
+    get_videos does once the last channel is in. Offline, the rest come
+    from the cache too.
+    """
+    if max_age:
+        fresh = feed_cache.fresh_channels(channel_list, max_age)
+        for ch in channel_list:
+            if ch['id'] in fresh:
+                yield ch, feed_cache.get_cached_videos([ch])
+        channel_list = [ch for ch in channel_list if ch['id'] not in fresh]
+
+    if channel_list and offline.is_offline():
+        # Whatever was cached last, however old.
+        get_console().print("[yellow]Offline: serving cached feeds.[/yellow]")
+        for ch in channel_list:
+            videos = feed_cache.get_cached_videos([ch])
+            if videos:
+                yield ch, videos
+        return
+
+    by_channel = {}
+    for channel, results in fetch_channels_threaded(channel_list):
+        if results:
+            by_channel[channel['id']] = results
+            yield channel, results[:ENTRIES_PER_CHANNEL]
+    record_results(by_channel)
+
+def get_videos(channel_list, processes=None, max_age=None):
     """
     Fetch latest videos from YouTube channels using RSS feeds.
-    No API key required!
+    No API key required! Fresh results are also written to the feed cache
+    and the archive.
+
+    processes: None picks automatically (a process pool only for very large
+    channel sets), 0 or 1 forces a single process, N uses N worker processes.
+    max_age: reuse cached feeds fetched within this many seconds instead of
+    fetching those channels again.
+    Offline, every channel is served from the feed cache regardless of age.
     """
-    videos = []
+    cached = []
+    if max_age:
+        fresh = feed_cache.fresh_channels(channel_list, max_age)
+        cached = feed_cache.get_cached_videos([ch for ch in channel_list if ch['id'] in fresh])
+        channel_list = [ch for ch in channel_list if ch['id'] not in fresh]
+        if not channel_list:
+            return cached
+
+    if offline.is_offline():
+        # Stale videos beat "No recent videos found".
+        return cached + feed_cache.get_cached_videos(channel_list)
+
+    by_channel = {}
+    if processes is None:
+        processes = (os.cpu_count() or 1) if len(channel_list) >= PROCESS_POOL_THRESHOLD else 1
+
+    if processes <= 1:
+        with get_console().status("[bold green]Fetching content (Parallel Mode)...[/bold green]"):
+            for channel, results in fetch_channels_threaded(channel_list):
+                if results:
+                    by_channel[channel['id']] = results
+    else:
+        # Interleave channels into a few batches per worker to balance slow feeds.
+        batch_count = min(len(channel_list), processes * 4)
+        batches = [channel_list[i::batch_count] for i in range(batch_count)]
 
-    with console.status("[bold green]Fetching content (Parallel Mode)...[/bold green]"):
-        with concurrent.futures.ThreadPoolExecutor(max_workers=10) as executor:
-            futures = [executor.submit(fetch_single_channel, ch) for ch in channel_list]
-            for future in concurrent.futures.as_completed(futures):
-                videos.extend(future.result())
+        with get_console().status(f"[bold green]Fetching content ({processes} processes)...[/bold green]"):
+            # Workers split the per-host rate so the pool as a whole stays within it.
+            with concurrent.futures.ProcessPoolExecutor(max_workers=processes, initializer=net.set_rate_share, initargs=(processes,)) as executor:
+                futures = [executor.submit(fetch_channel_batch, batch) for batch in batches]
+                for future in concurrent.futures.as_completed(futures):
+                    channel_ids, *columns = future.result()
+                    for channel_id, row in zip(channel_ids, zip(*columns)):
+                        by_channel.setdefault(channel_id, []).append(Video(*row))
 
-    return videos
+    latest = record_results(by_channel)
+    videos = [v for results in latest.values() for v in results]
+    thumbnails.prefetch([v for v in videos if not is_short(v)])
+    return cached + videos
 
 def extract_channel_id(channel_url):
     """Back-compat wrapper for old code paths."""
@@ -1,13 +1,27 @@
 import json
 import os
 import shutil
+import sys
+import tempfile
+from contextlib import contextmanager
 from datetime import datetime
 
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
 # Where we store data
 CONFIG_FILE = "config.json"
 CONFIG_SAMPLE = "config.json.sample"
+CONFIG_LOCK = "config.json.lock"
 HISTORY_FILE = "watch_history.json"
 
+# Category that older Play Queue sessions logged Learning Log videos under.
+# It isn't a real category, so analytics and ranking leave those entries out.
+LEARNING_LOG_PLACEHOLDER = "learning_log"
+
 # Default structure
 DEFAULT_CONFIG = {
     "coding": [],
@@ -15,25 +29,131 @@ DEFAULT_CONFIG = {
     "entertainment": []
 }
 
+# Process-level config: parsed data plus the file stamp and text it came from.
+_config_cache = {"stamp": None, "data": None, "text": None}
+
+@contextmanager
+def config_lock():
+    """Advisory lock shared by every gh focus session writing config.json."""
+    with open(CONFIG_LOCK, "a+") as f:
+        if fcntl:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(f, fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+def _config_stamp():
+    """mtime + size of config.json, or None if it doesn't exist."""
+    try:
+        st = os.stat(CONFIG_FILE)
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+def write_json_atomic(path, data, **dump_options):
+    """Write JSON to a temp file next to `path`, then rename it into place."""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(path)}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, **dump_options)
+        os.replace(temp_path, path)
+    except Exception:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+def _write_config_file(data):
+    """Write config.json atomically and refresh the cache."""
+    write_json_atomic(CONFIG_FILE, data, indent=4)
+    with open(CONFIG_FILE, "r") as f:
+        text = f.read()
+    _config_cache.update(stamp=_config_stamp(), data=json.loads(text), text=text)
+
+def _merge_configs(base, ours, theirs):
+    """
+    Three-way merge for when config.json changed on disk after we loaded it.
+    Channel lists merge by ID; other keys take our value only if we changed it.
+    """
+    merged = dict(theirs)
+    for key in set(base) | set(ours):
+        if key not in ours:
+            if key in merged and merged[key] == base.get(key):
+                del merged[key]
+            continue
+        mine = ours[key]
+        if isinstance(mine, list) and isinstance(theirs.get(key), list):
+            base_ids = {ch["id"] for ch in base.get(key, [])}
+            my_ids = {ch["id"] for ch in mine}
+            dropped = base_ids - my_ids
+            channels = [ch for ch in theirs[key] if ch["id"] not in dropped]
+            known = {ch["id"] for ch in channels}
+            channels.extend(ch for ch in mine if ch["id"] not in base_ids and ch["id"] not in known)
+            merged[key] = channels
+        elif mine != base.get(key):
+            merged[key] = mine
+    return merged
+
 def load_config():
-    """Load configuration from JSON file, create if doesn't exist."""
+    """
+    Load configuration, create it if it doesn't exist.
+    Parsed once per process and reused until config.json changes on disk.
+    Treat the result as read-only; change it through update_config().
+    """
     if not os.path.exists(CONFIG_FILE):
         # Check if sample config exists and copy it
         if os.path.exists(CONFIG_SAMPLE):
             shutil.copy(CONFIG_SAMPLE, CONFIG_FILE)
-            print("[green]✓ Initialized with sample channels. Customize as needed![/green]")
+            # stderr, so first-run output never mixes into `fetch`/`export` data.
+            print("✓ Initialized with sample channels. Customize as needed!", file=sys.stderr)
         else:
             # Create minimal config if no sample available
-            with open(CONFIG_FILE, "w") as f:
-                json.dump(DEFAULT_CONFIG, f, indent=4)
-        
-    with open(CONFIG_FILE, "r") as f:
-        return json.load(f)
+            with config_lock():
+                _write_config_file(DEFAULT_CONFIG)
+
+    stamp = _config_stamp()
+    if stamp != _config_cache["stamp"]:
+        with open(CONFIG_FILE, "r") as f:
+            text = f.read()
+        _config_cache.update(stamp=stamp, data=json.loads(text), text=text)
+    return _config_cache["data"]
+
+def update_config(mutate):
+    """
+    Apply mutate(data) to the latest config under the lock and write it atomically.
+    Re-reading under the lock means concurrent sessions' edits are kept.
+    If mutate returns False nothing is written. Returns mutate's result.
+    """
+    load_config()
+    with config_lock():
+        load_config()
+        data = json.loads(_config_cache["text"])
+        result = mutate(data)
+        if result is not False:
+            _write_config_file(data)
+    return result
 
 def save_config(data):
-    """Save configuration to JSON file."""
-    with open(CONFIG_FILE, "w") as f:
-        json.dump(data, f, indent=4)
+    """
+    Save a full configuration.
+    If another session changed config.json since we loaded it, both sets
+    of changes are merged instead of overwriting theirs.
+    """
+    base_text = _config_cache["text"]
+    with config_lock():
+        if base_text is not None and _config_stamp() != _config_cache["stamp"]:
+            with open(CONFIG_FILE, "r") as f:
+                theirs = json.load(f)
+            data = _merge_configs(json.loads(base_text), data, theirs)
+        _write_config_file(data)
 
 def get_gist_id():
     """Return the stored gist id, if any."""
@@ -42,43 +162,43 @@ def get_gist_id():
 
 def save_gist_id(gist_id):
     """Persist the gist id into config.json."""
-    data = load_config()
-    data["gist_id"] = gist_id
-    save_config(data)
+    def mutate(data):
+        data["gist_id"] = gist_id
+    update_config(mutate)
 
 def add_channel(category, name, channel_id):
     """Add a channel to a specific category."""
-    data = load_config()
-    if category not in data:
-        data[category] = []
-    
-    # Avoid duplicates
-    for ch in data[category]:
-        if ch['id'] == channel_id:
-            return False
-            
-    data[category].append({"name": name, "id": channel_id})
-    save_config(data)
-    return True
+    def mutate(data):
+        if category not in data:
+            data[category] = []
+
+        # Avoid duplicates
+        for ch in data[category]:
+            if ch['id'] == channel_id:
+                return False
+
+        data[category].append({"name": name, "id": channel_id})
+        return True
+    return update_config(mutate)
 
 def remove_channel(category, channel_id):
     """Remove a channel from a specific category."""
-    data = load_config()
-    if category not in data:
-        return False
-    
-    data[category] = [ch for ch in data[category] if ch['id'] != channel_id]
-    save_config(data)
-    return True
+    def mutate(data):
+        if category not in data:
+            return False
+
+        data[category] = [ch for ch in data[category] if ch['id'] != channel_id]
+        return True
+    return update_config(mutate)
 
 def remove_category(category):
     """Remove an entire category."""
-    data = load_config()
-    if category in data:
-        del data[category]
-        save_config(data)
-        return True
-    return False
+    def mutate(data):
+        if category in data:
+            del data[category]
+            return True
+        return False
+    return update_config(mutate)
 
 def get_channels(category):
     """Get all channels in a specific category."""
@@ -89,6 +209,7 @@ def list_all_channels():
     """List all channels across all categories."""
     data = load_config()
     return data
+
 def log_watch(video_title, channel_name, video_id, category):
     """Log a watched video to history."""
     history = []
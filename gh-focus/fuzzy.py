@@ -0,0 +1,105 @@
+import re
+from array import array
+from collections import Counter, defaultdict
+from itertools import chain
+
+# Word prefixes this long are indexed for one- and two-letter queries.
+PREFIX_LENGTH = 2
+
+# Above this many matches, ranking falls back to "starts with the query" first.
+RANK_LIMIT = 2000
+
+# Share of a query's trigrams an entry needs to count as a typo-tolerant match.
+FUZZY_THRESHOLD = 0.6
+
+WORD_PATTERN = re.compile(r"\w+")
+
+def trigrams(text):
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+class FuzzyIndex:
+    """
+    Type-to-filter search over (key, text) pairs.
+    Built once: a trigram index and a word-prefix index map to entry
+    positions, so a query touches only the posting lists it needs. Results
+    are the entries' keys, never their display text.
+    """
+
+    def __init__(self, items):
+        self.keys = []
+        self.texts = []
+        grams = defaultdict(list)
+        prefixes = defaultdict(list)
+        for position, (key, text) in enumerate(items):
+            text = text.lower()
+            self.keys.append(key)
+            self.texts.append(text)
+            for gram in trigrams(text):
+                grams[gram].append(position)
+            words = WORD_PATTERN.findall(text)
+            for prefix in {word[:size] for word in words for size in range(1, PREFIX_LENGTH + 1)}:
+                prefixes[prefix].append(position)
+        # Compact int arrays once built; lists are only faster to append to.
+        self.grams = {gram: array("i", positions) for gram, positions in grams.items()}
+        self.prefixes = {prefix: array("i", positions) for prefix, positions in prefixes.items()}
+        # Last query and its matching positions, to narrow as the user types.
+        self._last = (None, None)
+
+    def __len__(self):
+        return len(self.keys)
+
+    def _score(self, position, query):
+        text = self.texts[position]
+        found = text.find(query)
+        if found < 0:
+            return None
+        word_start = found == 0 or not text[found - 1].isalnum()
+        return (0 if found == 0 else 1 if word_start else 2, found)
+
+    def _exact(self, query, pool):
+        """Positions whose text contains `query` (or a word starting with it, for short queries)."""
+        texts = self.texts
+        if len(query) < 3:
+            # Prefix postings already hold exactly the word-start matches.
+            return self.prefixes.get(query, ())
+        if pool is None:
+            # Check candidates from the rarest trigram; substring tests are cheap.
+            pool = min((self.grams.get(query[i:i + 3], ()) for i in range(len(query) - 2)), key=len)
+        return [p for p in pool if query in texts[p]]
+
+    def _fuzzy(self, query, exclude):
+        grams = trigrams(query)
+        needed = max(2, int(len(grams) * FUZZY_THRESHOLD + 0.5))
+        counts = Counter(chain.from_iterable(self.grams.get(gram, ()) for gram in grams))
+        return sorted(
+            (p for p, hits in counts.items() if hits >= needed and p not in exclude),
+            key=lambda p: (-counts[p], p)
+        )
+
+    def search(self, query, limit=None):
+        """Keys of entries matching `query`, best first."""
+        query = " ".join(query.lower().split())
+        if not query:
+            keys = self.keys if limit is None else self.keys[:limit]
+            return list(keys)
+
+        # Typing one more character can only narrow a substring match set.
+        last_query, last_matches = self._last
+        narrows = last_query and len(last_query) >= 3 and query.startswith(last_query)
+        matches = self._exact(query, last_matches if narrows else None)
+        self._last = (query, matches)
+
+        if limit is not None and len(matches) > RANK_LIMIT:
+            # Too many to score one by one: entries starting with the query first.
+            texts = self.texts
+            ranked = [p for p in matches if texts[p].startswith(query)]
+            if len(ranked) < limit:
+                ranked += [p for p in matches if not texts[p].startswith(query)][:limit - len(ranked)]
+        else:
+            ranked = sorted(matches, key=lambda p: (self._score(p, query), p))
+        if len(query) >= 3 and (limit is None or len(ranked) < limit):
+            ranked.extend(self._fuzzy(query, set(matches)))
+        if limit is not None:
+            ranked = ranked[:limit]
+        return [self.keys[p] for p in ranked]
@@ -5,22 +5,51 @@ GitHub CLI Extension for the 2026 Challenge
 """
 
 import sys
+
+# Commands for scripts and cron: dispatch them before rich and questionary load.
+if __name__ == "__main__" and sys.argv[1:2] in (["fetch"], ["digest"]):
+    from headless import COMMANDS
+    sys.exit(COMMANDS[sys.argv[1]](sys.argv[2:]))
+
 import webbrowser
 import subprocess
 import shutil
 import os
-import re
+import time
 import questionary
 from rich import print
 from rich.panel import Panel
 from rich.columns import Columns
 from rich.table import Table
-from focus_manager import load_config, add_channel, log_watch, get_watch_stats, get_gist_id, save_gist_id, remove_channel, remove_category
+from focus_manager import load_config, add_channel, log_watch, get_watch_stats, get_watch_history, get_gist_id, save_gist_id, remove_channel, remove_category
 from fetcher import get_videos, resolve_channel_id
+from channel_io import normalize_category_name, is_valid_channel_id, is_valid_handle_or_url
+from videos import VideoIndex
+from picker import pick
+from player import find_player, play_queue
+from thumbnails import show as show_thumbnail
+from unread import unread_counts, mark_seen, mark_watched
+from ranking import rank_videos
+import analytics
+import offline
+from feed_cache import last_fetched
+from learning_log import load_log, append_entry, push_shards, create_log_files, cache_log_content, cached_log
+from learning_log import set_completed as set_log_completed, video_id_from_url
+from catalog import CatalogError, load_merged_config, hide_catalog_channel, hide_catalog_category
+from catalog import subscribe as subscribe_catalog, sync as sync_catalog, publish as publish_catalog
 
 # Tracks whether GitHub CLI is available for Gist sync features.
 GH_INSTALLED = False
 
+# Learning Log entries listed at once; use the filter to reach the rest.
+LOG_MENU_LIMIT = 200
+
+# Reopening a category within this many seconds reuses the feed cache.
+FEED_MAX_AGE = 10 * 60
+
+# Most bars in a stats sparkline; longer ranges use multi-day buckets.
+SPARKLINE_WIDTH = 24
+
 def check_dependencies():
     """Ensure yt-dlp is installed for ID resolution."""
     import importlib.util
@@ -28,6 +57,10 @@ def check_dependencies():
     
     # Check if yt_dlp library is importable in Python
     if importlib.util.find_spec("yt_dlp") is None:
+        if offline.is_offline():
+            # pip would only sit on its network timeouts; try again next time.
+            print("[dim]yt-dlp isn't installed yet; it will be installed once you're online.[/dim]")
+            return
         print(Panel("[yellow]⚙️  First Run Setup: Installing dependencies...[/yellow]", border_style="yellow"))
         try:
             subprocess.check_call([sys.executable, "-m", "pip", "install", "yt-dlp"])
@@ -39,6 +72,10 @@ def check_dependencies():
 def check_gh_auth():
     """Checks if gh CLI is available (non-blocking)."""
     global GH_INSTALLED
+    if offline.is_offline():
+        # Offline, gh is only needed later to replay queued writes; don't run it now.
+        GH_INSTALLED = shutil.which("gh") is not None
+        return GH_INSTALLED
     try:
         subprocess.run(
             ["gh", "--version"],
@@ -53,29 +90,35 @@ def check_gh_auth():
         return False
 
 def save_to_learning_log(video_title, video_url):
-    """Append the video to a shared learning log Gist."""
+    """Append the video to a shared learning log Gist. Returns True once it's in the gist."""
     if not check_gh_auth():
-        return
+        return False
+
+    # The local copy is enough to catch a repeat save, online or not.
+    log = cached_log()
+    video_id = video_id_from_url(video_url)
+    if log is not None and video_id and log.find(video_id) is not None:
+        print(f"[dim]'{video_title}' is already in your Learning Log.[/dim]")
+        return True
+
+    if offline.is_offline():
+        offline.queue_write("log", {"title": video_title, "url": video_url})
+        print(f"[yellow]📴 Offline: '{video_title}' is queued and will be added to your Learning Log when you're back online.[/yellow]")
+        return False
 
     print("[bold yellow]🐱 Syncing with GitHub...[/bold yellow]")
 
     gist_id = get_gist_id()
-    filename = "focus_learning_log.md"
-    new_entry = f"- [ ] **{video_title}** - [Watch]({video_url})\n"
-
     script_dir = os.path.dirname(os.path.abspath(__file__))
-    temp_path = os.path.join(script_dir, filename)
 
     if not gist_id:
         print("[cyan]Creating new Learning Log Gist...[/cyan]")
         description = "My Developer Learning Path (Created by gh-focus)"
-
-        with open(temp_path, "w", encoding="utf-8") as f:
-            f.write(f"# My Intentional Learning Log 🧠\n\n{new_entry}")
+        paths = create_log_files(script_dir, video_title, video_url)
 
         try:
             subprocess.run(
-                ["gh", "gist", "create", temp_path, "--desc", description, "--public"],
+                ["gh", "gist", "create", *paths, "--desc", description, "--public"],
                 check=True
             )
 
@@ -88,37 +131,47 @@ def save_to_learning_log(video_title, video_url):
             new_id = res.stdout.split()[0]
             save_gist_id(new_id)
             print(f"[bold green]✅ Created & Saved to Gist ID: {new_id}[/bold green]")
+            return True
         except subprocess.CalledProcessError as exc:
             print("[bold red]❌ Failed to create the Learning Log Gist.[/bold red]")
             if exc.stderr:
                 print(exc.stderr)
+            return False
         finally:
-            if os.path.exists(temp_path):
-                os.remove(temp_path)
+            for path in paths:
+                if os.path.exists(path):
+                    os.remove(path)
     else:
         print(f"[cyan]Updating Gist {gist_id}...[/cyan]")
         try:
-            res = subprocess.run(
-                ["gh", "gist", "view", gist_id, "--filename", filename],
-                capture_output=True,
-                text=True,
-                check=True
-            )
-            current_content = res.stdout
-            updated_content = current_content + new_entry
-
-            with open(temp_path, "w", encoding="utf-8") as f:
-                f.write(updated_content)
-
-            subprocess.run(["gh", "gist", "edit", gist_id, temp_path], check=True)
+            # Only this month's shard and the manifest are transferred
+            append_entry(gist_id, video_title, video_url)
             print(f"[bold green]✅ Added '{video_title}' to your Learning Log![/bold green]")
+            return True
         except subprocess.CalledProcessError as exc:
             print("[bold red]❌ Failed to update the Learning Log Gist.[/bold red]")
             if exc.stderr:
                 print(exc.stderr)
-        finally:
-            if os.path.exists(temp_path):
-                os.remove(temp_path)
+            return False
+
+def sync_pending_writes():
+    """Replay Learning Log changes queued while offline."""
+    queued = len(offline.pending())
+    if not queued or offline.is_offline() or not check_gh_auth():
+        return
+
+    def complete(payload):
+        set_log_completed(get_gist_id(), payload["url"], payload["completed"])
+        return True
+
+    print(f"[cyan]🔄 Syncing {queued} Learning Log change{'s' if queued != 1 else ''} made offline...[/cyan]")
+    offline.flush({
+        "log": lambda payload: save_to_learning_log(payload["title"], payload["url"]),
+        "complete": complete
+    })
+    left = len(offline.pending())
+    if left:
+        print(f"[yellow]⚠️  {left} change{'s' if left != 1 else ''} still queued; will retry next time.[/yellow]")
 
 def open_safe_mode(video_id):
     """
@@ -179,6 +232,53 @@ def open_safe_mode(video_id):
     print("[cyan]Opening in browser (with ads)...[/cyan]")
     webbrowser.open(url)
 
+def learning_log_queue(log):
+    """
+    Unfinished Learning Log videos as a play queue. Channel and category come
+    from the archive and your config; when the archive doesn't know a video,
+    they are None and the watch isn't logged (a guess would skew stats).
+    """
+    from archive import channels_for
+
+    entries = [e for e in log.entries if not e['completed'] and e['video_id']]
+    channel_of = channels_for(e['video_id'] for e in entries)
+    category_of = {}
+    for cat, channels in load_merged_config().items():
+        if isinstance(channels, list):
+            for ch in channels:
+                category_of.setdefault(ch['name'], cat)
+    queue = []
+    for e in entries:
+        channel = channel_of.get(e['video_id'])
+        category = category_of.get(channel) if channel else None
+        queue.append({"video_id": e['video_id'], "title": e['title'], "channel": channel, "category": category})
+    return queue
+
+def play_playlist(queue):
+    """Play a queue in one player session, logging each video as it starts."""
+    def on_start(item):
+        if item['channel'] is not None:
+            log_watch(item['title'], item['channel'], item['video_id'], item['category'] or "Unknown")
+        mark_watched(item['video_id'])
+        print(f"[green]▶ {item['title'][:60]}[/green]")
+
+    if not queue:
+        print("[yellow]Nothing left to play here.[/yellow]")
+        return
+    if find_player() is None:
+        print(Panel("[yellow]⚠️  Playlist mode needs MPV or VLC. Install one and try again.[/yellow]", border_style="yellow"))
+        return
+
+    print(f"[bold green]🎞️  Playing {len(queue)} videos in one session...[/bold green]")
+    started = play_queue(queue, on_start)
+    if started is None:
+        # VLC can't tell us which videos actually played
+        if questionary.confirm(f"Log all {len(queue)} videos as watched?").ask():
+            for item in queue:
+                on_start(item)
+    else:
+        print(f"[green]✓ {started} videos watched this session[/green]")
+
 def show_banner():
     """Display welcome banner."""
     banner = Panel.fit(
@@ -188,32 +288,9 @@ def show_banner():
     )
     print(banner)
 
-def normalize_category_name(raw_name):
-    """Normalize a user-provided category into a safe key."""
-    if not raw_name:
-        return None
-    cleaned = raw_name.strip().lower()
-    cleaned = re.sub(r"\s+", "_", cleaned)
-    cleaned = re.sub(r"[^a-z0-9_]", "", cleaned)
-    cleaned = cleaned.strip("_")
-    return cleaned or None
-
-def is_valid_channel_id(raw_id):
-    """Basic validation for YouTube channel IDs (UC...)."""
-    if not raw_id:
-        return False
-    return re.match(r"^UC[0-9A-Za-z_-]{20,}$", raw_id.strip()) is not None
-
-def is_valid_handle_or_url(user_input):
-    """Accept a handle (@...), URL, or UC... ID."""
-    if not user_input:
-        return False
-    trimmed = user_input.strip()
-    return trimmed.startswith("@") or trimmed.startswith("http") or trimmed.startswith("UC")
-
 def view_channels():
     """Display all configured channels by category with rich tables."""
-    config = load_config()
+    config = load_merged_config()
     categories = [key for key, value in config.items() if isinstance(value, list)]
     
     if not categories:
@@ -237,90 +314,58 @@ def view_channels():
             print(f"[dim]{cat.upper()} (empty)[/dim]")
     print()
 
+def channel_items(config):
+    """Picker entries for every channel: key (category, id), label with both."""
+    return [
+        ((cat, ch['id']), f"{ch['name']} → {ch['id']}  [{cat}]")
+        for cat, channels in config.items() if isinstance(channels, list)
+        for ch in channels
+    ]
+
 def open_channel_from_list():
     """Prompt user to pick a channel and open it in the browser."""
-    config = load_config()
-    categories = [key for key, value in config.items() if isinstance(value, list)]
+    items = channel_items(load_merged_config())
 
-    if not categories:
-        print("[yellow]No categories found.[/yellow]")
+    if not items:
+        print("[yellow]No channels found.[/yellow]")
         return
 
-    category_choices = categories + ["Back"]
-    selected_category = questionary.select(
-        "Choose a category:",
-        choices=category_choices
-    ).ask()
-
-    if selected_category == "Back":
+    selected = pick("Open which channel?", items)
+    if selected is None:
         return
 
-    channels = config.get(selected_category, [])
-    if not channels:
-        print("[yellow]No channels in this category yet.[/yellow]")
-        return
-
-    channel_choices = [f"{ch['name']} → {ch['id']}" for ch in channels]
-    channel_choices.append("Back")
-    selected_channel = questionary.select(
-        "Open which channel?",
-        choices=channel_choices
-    ).ask()
-
-    if selected_channel == "Back":
-        return
-
-    channel_id = selected_channel.split("→")[-1].strip()
+    _, channel_id = selected
     webbrowser.open(f"https://www.youtube.com/channel/{channel_id}")
 
 def remove_channel_menu():
     """Remove a channel from a category."""
-    config = load_config()
-    categories = [key for key, value in config.items() if isinstance(value, list)]
+    config = load_merged_config()
+    items = channel_items(config)
 
-    if not categories:
-        print("[yellow]No categories found.[/yellow]")
-        return
-
-    category_choices = categories + ["Back"]
-    selected_category = questionary.select(
-        "Choose category to remove from:",
-        choices=category_choices
-    ).ask()
-
-    if selected_category == "Back":
+    if not items:
+        print("[yellow]No channels found.[/yellow]")
         return
 
-    channels = config.get(selected_category, [])
-    if not channels:
-        print("[yellow]No channels in this category.[/yellow]")
+    selected = pick("Remove which channel?", items)
+    if selected is None:
         return
 
-    channel_choices = [ch['name'] for ch in channels]
-    channel_choices.append("Back")
-    selected_channel = questionary.select(
-        "Remove which channel?",
-        choices=channel_choices
-    ).ask()
+    # The picker returns (category, id), so channels sharing a name can't be confused
+    category, channel_id = selected
+    name = next(ch['name'] for ch in config[category] if ch['id'] == channel_id)
 
-    if selected_channel == "Back":
-        return
+    # Team catalog channels are hidden locally; local ones are removed.
+    hidden = hide_catalog_channel(category, channel_id)
+    removed = remove_channel(category, channel_id) or hidden
 
-    # Find the channel ID
-    channel_id = None
-    for ch in channels:
-        if ch['name'] == selected_channel:
-            channel_id = ch['id']
-            break
-
-    if channel_id and remove_channel(selected_category, channel_id):
-        print(f"[green]✓ Removed {selected_channel} from {selected_category}[/green]")
+    if removed:
+        print(f"[green]✓ Removed {name} from {category}[/green]")
     else:
         print(f"[red]Failed to remove channel[/red]")
 
 def remove_category_menu():
-    """Remove an entire category."""
-    config = load_config()
+    """Remove an entire category (team catalog categories are hidden locally)."""
+    config = load_merged_config()
     categories = [key for key, value in config.items() if isinstance(value, list)]
 
     if not categories:
@@ -340,9 +385,12 @@ def remove_category_menu():
         f"Are you sure you want to remove '{selected_category}' and all its channels?"
     ).ask()
 
-    if confirm and remove_category(selected_category):
+    if not confirm:
+        return
+    hidden = hide_catalog_category(selected_category)
+    if remove_category(selected_category) or hidden:
         print(f"[green]✓ Removed category '{selected_category}'[/green]")
-    elif confirm:
+    else:
         print(f"[red]Failed to remove category[/red]")
 
 def show_dashboard():
@@ -370,6 +418,10 @@ def show_dashboard():
         top_cat = max(stats['categories'], key=stats['categories'].get)
         top_count = stats['categories'][top_cat]
         stats_table.add_row("🔥 Top Focus", f"[cyan]{top_cat}[/cyan] ({top_count})")
+
+    month = analytics.overview(since=analytics.parse_since("30d"))
+    stats_table.add_row("📅 Streak", f"{month['current_streak']} days (best {month['longest_streak']})")
+    stats_table.add_row("📈 Last 30 Days", f"[green]{analytics.sparkline(month['daily'])}[/green] {month['videos']}")
     
     # Category breakdown
     cat_table = Table(title="[bold cyan]Category Breakdown[/bold cyan]", show_header=True, header_style="bold magenta")
@@ -419,6 +471,79 @@ def show_stats():
             date = video.get('timestamp', '').split('T')[0]
             print(f"  ✓ {video['title'][:50]}... ({date})")
 
+def format_minutes(minutes):
+    return f"{minutes // 60}h {minutes % 60}m"
+
+def format_age(seconds):
+    """Rough age like '5m', '3h' or '2d'."""
+    minutes = int(seconds // 60)
+    if minutes < 60:
+        return f"{minutes}m"
+    return f"{minutes // 60}h" if minutes < 24 * 60 else f"{minutes // (24 * 60)}d"
+
+def stats_command(args):
+    """Handle `gh focus stats`: watch time by category, channel or hour over a date range."""
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="gh focus stats", description="Watch-time breakdown from your history (no network).")
+    parser.add_argument("--since", default="30d", help="30d, 12w, 6m, 1y, YYYY-MM-DD or 'all' (default: 30d)")
+    parser.add_argument("--by", choices=("category", "channel", "hour"), default="category")
+    parser.add_argument("--limit", type=int, default=20, help="Rows to show")
+    options = parser.parse_args(args)
+
+    try:
+        since = None if options.since == "all" else analytics.parse_since(options.since)
+    except ValueError:
+        parser.error(f"can't read --since {options.since!r}")
+
+    data = analytics.load()
+    summary = analytics.overview(since=since, data=data)
+    if not summary['videos']:
+        print("[yellow]No videos watched in that range.[/yellow]")
+        return
+
+    # Long ranges are summed into fewer, wider buckets to fit the terminal.
+    days_per_bar, _ = analytics.resample(summary['daily'], SPARKLINE_WIDTH)
+    def bars(daily):
+        return analytics.sparkline(analytics.resample(daily, SPARKLINE_WIDTH)[1])
+
+    print(Panel(
+        f"[green]Videos Watched:[/green] {summary['videos']}\n"
+        f"[green]Focus Time (est):[/green] {format_minutes(summary['minutes'])}\n"
+        f"[green]Active Days:[/green] {summary['active_days']}\n"
+        f"[green]Streak:[/green] {summary['current_streak']} days (best {summary['longest_streak']})\n"
+        f"[green]{'Daily' if days_per_bar == 1 else f'Per {days_per_bar} days'}:[/green] {bars(summary['daily'])}",
+        title=f"[bold cyan]📊 Since {since or 'the beginning'}[/bold cyan]",
+        border_style="cyan"
+    ))
+
+    rows = analytics.breakdown(options.by, since=since, data=data)
+    table = Table(title=f"[bold cyan]By {options.by.title()}[/bold cyan]", show_header=True, header_style="bold magenta")
+    table.add_column(options.by.title(), style="cyan")
+    table.add_column("Videos", justify="right", style="yellow")
+    table.add_column("Time", justify="right")
+    table.add_column("Share", justify="right", style="dim")
+    if options.by != "hour":
+        table.add_column("Activity", style="green")
+        table.add_column("Trend", justify="right")
+    else:
+        rows.sort(key=lambda row: row['name'])
+        options.limit = len(rows)
+    total = sum(row['videos'] for row in rows)
+    for row in rows[:options.limit]:
+        cells = [row['name'][:40], str(row['videos']), format_minutes(row['minutes']), f"{row['videos'] * 100 // total}%"]
+        if options.by != "hour":
+            trend = row['trend']
+            if trend is None:
+                cells += [bars(row['daily']), "[dim]—[/dim]"]
+            else:
+                color = "green" if trend >= 0 else "red"
+                cells += [bars(row['daily']), f"[{color}]{trend:+.0%}[/{color}]"]
+        table.add_row(*cells)
+    print(table)
+    if len(rows) > options.limit:
+        print(f"[dim]…and {len(rows) - options.limit} more (--limit)[/dim]")
+
 def view_learning_log():
     """Fetch and display the Learning Log from Gist with interactive playback."""
     if not GH_INSTALLED:
@@ -439,34 +564,27 @@ def view_learning_log():
         ))
         return
     
-    # Fetch gist content
-    filename = "focus_learning_log.md"
+    # Offline, the last downloaded copy is shown and changes are queued
+    working_offline = offline.is_offline()
     try:
-        result = subprocess.run(
-            ["gh", "gist", "view", gist_id, "--filename", filename],
-            capture_output=True,
-            text=True,
-            check=True
-        )
-        content = result.stdout
-        
-        # Parse learning log entries
-        import re
-        entries = []
-        for line in content.split('\n'):
-            # Match: - [ ] or - [x] **Title** - [Watch](URL)
-            match = re.match(r'^- \[([ x])\] \*\*(.+?)\*\* - \[Watch\]\((.+?)\)$', line)
-            if match:
-                checked, title, url = match.groups()
-                video_id = url.split('v=')[-1] if 'v=' in url else None
-                entries.append({
-                    'title': title,
-                    'url': url,
-                    'video_id': video_id,
-                    'completed': checked == 'x'
-                })
+        if working_offline:
+            log = cached_log()
+            if log is None:
+                print(Panel(
+                    "[yellow]📴 Offline, and there's no local copy of your Learning Log yet.[/yellow]",
+                    border_style="yellow"
+                ))
+                return
+            print("[yellow]📴 Offline: showing your last synced Learning Log.[/yellow]")
+        else:
+            sync_pending_writes()
+            log = load_log(gist_id)
+
+        queued = offline.pending_payloads("log")
+        if queued:
+            print(f"[dim]⏳ {len(queued)} video{'s' if len(queued) != 1 else ''} saved offline, added once you're back online.[/dim]")
         
-        if not entries:
+        if not log.entries:
             print(Panel(
                 "[yellow]Your Learning Log is empty.[/yellow]",
                 border_style="yellow"
@@ -475,25 +593,33 @@ def view_learning_log():
         
         # Interactive menu loop
         while True:
-            # Create choices with status icons
+            # Choices carry the entry index, so duplicate titles stay distinct
             choices = []
-            for i, entry in enumerate(entries):
+            for index in range(min(len(log), LOG_MENU_LIMIT)):
+                entry = log[index]
                 status = "✓" if entry['completed'] else "○"
-                display = f"{status} {entry['title'][:60]}"
-                choices.append(display)
+                choices.append(questionary.Choice(f"{status} {entry['title'][:60]}", value=index))
+            if len(log) > LOG_MENU_LIMIT:
+                choices.append(questionary.Separator(f"… {len(log) - LOG_MENU_LIMIT} more, use Search to find them"))
             
-            choices.extend(["", "🌐 Open Full List in Browser", "🔙 Go Back"])
+            choices.extend([
+                questionary.Separator(),
+                "🔍 Search",
+                "🎞️  Play Queue",
+                "🌐 Open Full List in Browser",
+                "🔙 Go Back"
+            ])
             
             # Show stats
-            completed = sum(1 for e in entries if e['completed'])
-            total = len(entries)
+            completed = log.completed_count()
+            total = len(log)
             
             selected = questionary.select(
                 f"📚 Your Learning Queue ({completed}/{total} completed):",
                 choices=choices
             ).ask()
             
-            if not selected or selected == "🔙 Go Back":
+            if selected is None or selected == "🔙 Go Back":
                 break
                 
             if selected == "🌐 Open Full List in Browser":
@@ -503,15 +629,22 @@ def view_learning_log():
                 input("Press Enter to continue...")
                 continue
             
-            if selected == "":
+            if selected == "🎞️  Play Queue":
+                play_playlist(learning_log_queue(log))
+                input("Press Enter to continue...")
                 continue
             
-            # Find which entry was selected
-            selected_index = choices.index(selected)
-            if selected_index >= len(entries):
-                continue
-                
-            entry = entries[selected_index]
+            if selected == "🔍 Search":
+                items = [
+                    (i, f"{'✓' if e['completed'] else '○'} {e['title'][:70]}")
+                    for i, e in enumerate(log.entries)
+                ]
+                selected = pick("🔍 Search your Learning Log:", items, index=log.search_index())
+                if selected is None:
+                    continue
+            
+            index = selected
+            entry = log[index]
             
             # Action menu for selected video
             action = questionary.select(
@@ -529,33 +662,22 @@ def view_learning_log():
                     webbrowser.open(entry['url'])
                     input("Press Enter when done...")
                     
-            elif "Mark as" in action:
-                # Toggle completion status
-                new_status = "x" if not entry['completed'] else " "
+            elif action and "Mark as" in action:
+                # Toggle completion status; only the entry's shard is uploaded
+                log.toggle(index)
+                if working_offline:
+                    offline.queue_write("complete", {"url": entry['url'], "completed": entry['completed']})
+                    cache_log_content(log.text())
+                    print("[yellow]📴 Updated locally; it will sync when you're back online.[/yellow]")
+                    input("Press Enter to continue...")
+                    continue
                 try:
-                    # Read current content
-                    new_content = content.replace(
-                        f"- [{'x' if entry['completed'] else ' '}] **{entry['title']}**",
-                        f"- [{new_status}] **{entry['title']}**"
-                    )
-                    
-                    # Update gist
-                    script_dir = os.path.dirname(os.path.abspath(__file__))
-                    temp_path = os.path.join(script_dir, filename)
-                    with open(temp_path, "w", encoding="utf-8") as f:
-                        f.write(new_content)
-                    
-                    subprocess.run(["gh", "gist", "edit", gist_id, temp_path], check=True)
+                    push_shards(gist_id, log, [entry['shard']], log.manifest)
+                    cache_log_content(log.text())
                     print("[green]✓ Updated![/green]")
-                    
-                    # Update local cache
-                    entry['completed'] = not entry['completed']
-                    content = new_content
-                    
-                    if os.path.exists(temp_path):
-                        os.remove(temp_path)
-                        
                 except Exception as e:
+                    # Keep the local model in step with the gist
+                    log.toggle(index)
                     print(f"[red]❌ Failed to update: {e}[/red]")
                 
                 input("Press Enter to continue...")
@@ -565,7 +687,162 @@ def view_learning_log():
     except Exception as e:
         print(f"[red]Error: {e}[/red]")
 
+def catalog_command(args):
+    """Handle `gh focus catalog subscribe|sync|publish`."""
+    action = args[0] if args else ""
+    try:
+        if action == "subscribe" and len(args) > 1:
+            _, version = subscribe_catalog(args[1])
+            print(f"[green]✓ Subscribed to {args[1]} (version {version})[/green]")
+        elif action == "sync":
+            old, new = sync_catalog()
+            if old == new:
+                print(f"[green]✓ Catalog is up to date (version {new})[/green]")
+            else:
+                print(f"[green]✓ Catalog updated: version {old} → {new}[/green]")
+        elif action == "publish" and len(args) > 1:
+            config = load_config()
+            categories = {k: v for k, v in config.items() if isinstance(v, list)}
+            version = publish_catalog(args[1], categories)
+            print(f"[green]✓ Published your categories to {args[1]} (version {version})[/green]")
+        else:
+            print("[cyan]Usage:[/cyan]")
+            print("  gh focus catalog subscribe <file|repo dir|gist:ID>")
+            print("  gh focus catalog sync")
+            print("  gh focus catalog publish <path/to/focus_catalog.json>")
+    except CatalogError as e:
+        print(f"[red]❌ {e}[/red]")
+
+def archive_command(args):
+    """Handle `gh focus archive`: time-window queries over every video seen so far."""
+    import argparse
+    from datetime import datetime
+    import archive
+
+    parser = argparse.ArgumentParser(prog="gh focus archive", description="Query the local video archive (no network).")
+    parser.add_argument("--channel", action="append", help="Channel name (repeatable)")
+    parser.add_argument("--category", help="Only channels in this category")
+    window = parser.add_mutually_exclusive_group()
+    window.add_argument("--days", type=int, help="Published in the last N days")
+    window.add_argument("--this-month", action="store_true", help="Published since the 1st of this month")
+    parser.add_argument("--unwatched", action="store_true", help="Hide videos in your watch history")
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--backfill", action="store_true", help="One-time import of older uploads via yt-dlp for the selected channels")
+    options = parser.parse_args(args)
+
+    config = load_merged_config()
+    channels = []
+    for cat, chans in config.items():
+        if not isinstance(chans, list) or (options.category and cat != options.category):
+            continue
+        for ch in chans:
+            if options.channel and ch['name'].lower() not in [c.lower() for c in options.channel]:
+                continue
+            if ch['id'] not in [c['id'] for c in channels]:
+                channels.append(ch)
+
+    if (options.category or options.channel) and not channels:
+        print("[yellow]No matching channels in your config.[/yellow]")
+        return
+
+    if options.backfill:
+        for ch in channels:
+            print(f"[cyan]📼 Backfilling {ch['name']}...[/cyan]")
+            try:
+                added = archive.backfill(ch)
+            except Exception as e:
+                print(f"[yellow]⚠️  {ch['name']}: {str(e)[:80]}[/yellow]")
+                continue
+            if added is None:
+                print(f"[dim]{ch['name']} was already backfilled[/dim]")
+            else:
+                print(f"[green]✓ {added} older videos archived[/green]")
+
+    since = None
+    if options.days:
+        since = time.time() - options.days * 86400
+    elif options.this_month:
+        since = datetime.now().replace(day=1, hour=0, minute=0, second=0, microsecond=0).timestamp()
+
+    watched = {v.get('video_id') for v in get_watch_history()} if options.unwatched else None
+    channel_ids = [ch['id'] for ch in channels] if (options.category or options.channel) else None
+    results = archive.query(channel_ids, since=since, exclude_ids=watched, limit=options.limit)
+
+    if not results:
+        print("[yellow]No archived videos match.[/yellow]")
+        return
+
+    table = Table(title="[bold cyan]📼 Video Archive[/bold cyan]", show_header=True, header_style="bold magenta")
+    table.add_column("Published", style="dim", no_wrap=True)
+    table.add_column("Channel", style="cyan")
+    table.add_column("Title", style="white")
+    table.add_column("Video ID", style="dim", no_wrap=True)
+    for v in results:
+        table.add_row((v['published'] or "?")[:10], v['channel'], v['title'][:60], v['video_id'])
+    print(table)
+
+def import_command(args):
+    """Handle `gh focus import FILE`: bulk-add channels from OPML, CSV or a plain list."""
+    import argparse
+    from channel_io import FORMATS, RESOLVE_WORKERS, DEFAULT_IMPORT_CATEGORY, read_channel_file, resolve_entries, import_channels
+
+    parser = argparse.ArgumentParser(prog="gh focus import", description="Import channels from OPML, CSV or a list of handles/URLs/IDs.")
+    parser.add_argument("file")
+    parser.add_argument("--format", choices=FORMATS, help="Input format (detected from the file by default)")
+    parser.add_argument("--category", help=f"Put every channel in this category, whatever the file says (default: the file's categories, else {DEFAULT_IMPORT_CATEGORY})")
+    parser.add_argument("--workers", type=int, default=RESOLVE_WORKERS, help="Parallel handle lookups")
+    options = parser.parse_args(args)
+
+    try:
+        entries = read_channel_file(options.file, options.format)
+    except (OSError, ValueError) as e:
+        print(f"[red]❌ Can't read {options.file}: {e}[/red]")
+        return
+    if not entries:
+        print("[yellow]No channels found in that file.[/yellow]")
+        return
+
+    started = time.perf_counter()
+    print(f"[cyan]🔍 Resolving {len(entries)} channels...[/cyan]")
+    resolved, failed = resolve_entries(entries, workers=max(1, options.workers))
+    added, skipped = import_channels(resolved, category=normalize_category_name(options.category))
+
+    per_category = {}
+    for cat, _ in added:
+        per_category[cat] = per_category.get(cat, 0) + 1
+    for cat, count in sorted(per_category.items()):
+        print(f"[green]✓ {count} channels added to {cat}[/green]")
+    if skipped:
+        print(f"[dim]{len(skipped)} already in your config (skipped)[/dim]")
+    for entry in failed:
+        print(f"[yellow]⚠️  Couldn't resolve {entry['ref']}[/yellow]")
+    print(f"[dim]Done in {time.perf_counter() - started:.1f}s[/dim]")
+
+def export_command(args):
+    """Handle `gh focus export`: write your channels as OPML, CSV or a plain list."""
+    import argparse
+    from channel_io import FORMATS, export_channels
+
+    parser = argparse.ArgumentParser(prog="gh focus export", description="Export channels as OPML, CSV or a plain list.")
+    parser.add_argument("--format", choices=FORMATS, default="opml")
+    parser.add_argument("--category", action="append", help="Only this category (repeatable)")
+    parser.add_argument("-o", "--output", help="Write to a file instead of stdout")
+    options = parser.parse_args(args)
+
+    text = export_channels(load_merged_config(), options.format, options.category)
+    if options.output:
+        with open(options.output, "w", encoding="utf-8") as f:
+            f.write(text)
+        print(f"[green]✓ Exported to {options.output}[/green]")
+    else:
+        sys.stdout.write(text)
+
 def main():
+    if sys.argv[1:2] == ["export"]:
+        # Writes to stdout, so nothing else may print first (setup messages included).
+        export_command(sys.argv[2:])
+        return
+    offline.start_probe()  # Runs while the banner and dashboard draw
     check_dependencies()  # Auto-install yt-dlp on first run
     
     # Handle command-line arguments
@@ -574,16 +851,48 @@ def main():
             show_banner()
             show_dashboard()
             return
+        elif sys.argv[1] == "stats":
+            stats_command(sys.argv[2:])
+            return
+        elif sys.argv[1] == "catalog":
+            catalog_command(sys.argv[2:])
+            return
+        elif sys.argv[1] == "archive":
+            archive_command(sys.argv[2:])
+            return
+        elif sys.argv[1] == "import":
+            import_command(sys.argv[2:])
+            return
+        elif sys.argv[1] == "serve":
+            from server import serve
+            serve(sys.argv[2:])
+            return
         elif sys.argv[1] == "--help":
             print("[cyan]Usage:[/cyan]")
             print("  python gh-focus          Start interactive mode")
             print("  python gh-focus --stats  Show dashboard & statistics")
+            print("  python gh-focus stats    Watch time by category/channel/hour (--since 30d, --by channel)")
+            print("  python gh-focus fetch    Print a category's videos as JSON for scripts (--format json|ndjson)")
+            print("  python gh-focus digest   New videos since the last run as Markdown/HTML (--publish to gist)")
+            print("  python gh-focus catalog  Subscribe to / sync / publish a team channel catalog")
+            print("  python gh-focus serve    Local web dashboard with live refresh (--port, --interval)")
+            print("  python gh-focus archive  Query every video seen so far (--channel, --category, --days, --unwatched)")
+            print("  python gh-focus import   Bulk-add channels from OPML, CSV or a list of handles/URLs/IDs")
+            print("  python gh-focus export   Export channels (--format opml|csv|list, --category, -o FILE)")
             print("  python gh-focus --help   Show this help message")
             return
     
     show_banner()
     show_dashboard()
 
+    if offline.is_offline():
+        print(Panel(
+            "[yellow]📴 Offline mode: categories show cached feeds, and Learning Log changes are queued until you're back online.[/yellow]",
+            border_style="yellow"
+        ))
+    else:
+        sync_pending_writes()
+
     if not check_gh_auth():
         print(Panel(
             "[yellow]⚠️  GitHub CLI not found. 'Save to Gist' is disabled.[/yellow]",
@@ -610,7 +919,7 @@ def main():
     
     # MAIN LOOP: Keeps the app running
     while True:
-        config = load_config()
+        config = load_merged_config()
         
         categories = [key for key, value in config.items() if isinstance(value, list)]
         
@@ -623,7 +932,10 @@ def main():
         # Build categories menu with separator
         categories_menu = []
         if categories:
-            categories_menu = categories.copy()
+            new_counts = unread_counts()
+            for cat in categories:
+                label = f"{cat} ({new_counts[cat]} new)" if new_counts.get(cat) else cat
+                categories_menu.append(questionary.Choice(label, value=cat))
             categories_menu.append(questionary.Separator())
         
         # Tools menu
@@ -731,8 +1043,8 @@ def main():
                 else:
                     print(f"[yellow]Channel already exists in {cat}[/yellow]")
             else:
-                # Try to resolve handle or URL
-                c_id = resolve_channel_id(user_input)
+                # Try to resolve handle or URL (needs yt-dlp and the network)
+                c_id = None if offline.is_offline() else resolve_channel_id(user_input)
                 if c_id:
                     name = questionary.text(f"[bold cyan]✓ Found ID {c_id}\n\nEnter display name:[/bold cyan]").ask()
                     if not name or not name.strip():
@@ -787,65 +1099,83 @@ def main():
             continue
 
         # INNER LOOP: Stay in this category until user goes back
+        index = None
         while True:
-            videos = get_videos(channels)
+            videos = rank_videos(get_videos(channels, max_age=FEED_MAX_AGE), choice)
+
+            if offline.is_offline():
+                fetched_at = last_fetched(channels)
+                if not videos:
+                    print(Panel("[yellow]📴 Offline, and nothing cached for this category yet.[/yellow]", border_style="yellow"))
+                    break
+                print(f"[dim]📴 Offline · feeds cached {format_age(time.time() - fetched_at)} ago[/dim]")
 
             if not videos:
                 print(Panel("[yellow]⚠️  No recent videos found.[/yellow]", border_style="yellow"))
                 break
 
-            # 3. Create the Selection List
-            video_choices = []
-            video_map = {}
-            video_info = {}
-            
-            for v in videos:
-                # 🚫 BLOCK SHORTS: Skip short-form content
-                if "#shorts" in v['title'].lower() or "short" in v['title'].lower():
-                    continue
-                
-                # Clean up title for display
-                display_text = f"[{v['channel']}] {v['title'][:50]}"
-                video_choices.append(display_text)
-                video_map[display_text] = v['video_id']
-                video_info[display_text] = v
+            # 3. Create the Selection List (rows point at record offsets).
+            # Cached feeds hand back the same records, so the last index and its labels are reused.
+            if index is None or not index.same_videos(videos):
+                index = VideoIndex(videos)
             
-            if not video_choices:
+            if not index:
                 print(Panel("[yellow]⚠️  No full-length videos found (only Shorts).[/yellow]", border_style="yellow"))
                 break
             
+            labels = index.labels()
+            video_choices = [questionary.Choice(label, value=offset) for offset, label in labels]
+            mark_seen(choice, [index[offset].video_id for offset in index.rows])
+            
             # Add Navigation with separators
             video_choices.append(questionary.Separator("━" * 50))
+            video_choices.append("🔍 Search")
+            video_choices.append("🎞️  Play All Unwatched")
             video_choices.append("🔙 Go Back")
             video_choices.append("❌ Exit App")
             
-            selected_text = questionary.select(
+            selected = questionary.select(
                 f"[bold cyan]📺 {choice.upper()}[/bold cyan]\n[dim]Select a video to watch:[/dim]",
                 choices=video_choices,
                 style=questionary.Style([('answer', 'fg:cyan bold')])
             ).ask()
             
             # Navigation Logic
-            if selected_text == "❌ Exit App":
+            if selected == "❌ Exit App":
                 print("[bold red]Stay focused! Goodbye. 👋[/bold red]")
                 sys.exit()
                 
-            if selected_text == "🔙 Go Back":
+            if selected is None or selected == "🔙 Go Back":
                 break  # Breaks inner loop, goes back to Main Menu
+            
+            if selected == "🎞️  Play All Unwatched":
+                watched = {v.get('video_id') for v in get_watch_history()}
+                play_playlist([
+                    {**index[offset].to_dict(), "category": choice}
+                    for offset in index.rows if index[offset].video_id not in watched
+                ])
+                input("Press Enter to continue...")
+                continue
+            
+            if selected == "🔍 Search":
+                selected = pick(f"🔍 Search {choice}:", labels, index=index.search_index())
+                if selected is None:
+                    continue
                 
             # Choose action for the selected video
-            video_id = video_map[selected_text]
-            video_data = video_info[selected_text]
+            video_data = index[selected]
+            video_id = video_data.video_id
             
             # Display selected video info
             print()
             info_table = Table(show_header=False, box=None, padding=(0, 1))
             info_table.add_column("", style="dim", width=12)
             info_table.add_column("", style="white")
-            info_table.add_row("📺 Channel:", video_data['channel'])
-            info_table.add_row("🎯 Title:", video_data['title'][:60])
-            info_table.add_row("📅 Published:", video_data['published'][:10] if len(video_data['published']) > 10 else video_data['published'])
+            info_table.add_row("📺 Channel:", video_data.channel)
+            info_table.add_row("🎯 Title:", video_data.title[:60])
+            info_table.add_row("📅 Published:", video_data.published[:10])
             print(Panel(info_table, title="[bold cyan]Video Details[/bold cyan]", border_style="green", padding=(1, 2)))
+            show_thumbnail(video_id)
             print()
             
             # ACTION LOOP: Allow user to watch AND save without reselecting video
@@ -869,7 +1199,7 @@ def main():
                     
                 elif action == "📺 Stream (Watch Now)":
                     info_msg = Panel(
-                        f"[bold cyan]{selected_text}[/bold cyan]\n\n[dim]YouTube will open. Close when done.[/dim]",
+                        f"[bold cyan][{video_data.channel}] {video_data.title[:50]}[/bold cyan]\n\n[dim]YouTube will open. Close when done.[/dim]",
                         title="[bold cyan]🚀 Launching Video[/bold cyan]",
                         border_style="green",
                         padding=(1, 2)
@@ -877,11 +1207,12 @@ def main():
                     print(info_msg)
 
                     log_watch(
-                        video_data['title'],
-                        video_data['channel'],
+                        video_data.title,
+                        video_data.channel,
                         video_id,
                         choice
                     )
+                    mark_watched(video_id)
 
                     open_safe_mode(video_id)
                     
@@ -898,9 +1229,7 @@ def main():
                     # Loop continues - user can now save it too
                     
                 elif action == "💾 Save to Learning Log":
-                    clean_title = selected_text.split("] ")[-1]
-                    full_url = f"https://www.youtube.com/watch?v={video_id}"
-                    save_to_learning_log(clean_title, full_url)
+                    save_to_learning_log(video_data.title, video_data.link)
                     print()
                     questionary.confirm("Press Enter to continue...").ask()
                     # Loop continues - user can watch it too
@@ -0,0 +1,155 @@
+"""
+Commands for scripts and cron, without the interactive UI:
+`gh focus fetch` prints a category's videos as JSON, `gh focus digest`
+writes a Markdown/HTML digest of what's new since the last run.
+
+Dispatched before gh-focus.py imports rich or questionary, and nothing here
+imports them either; progress and warnings go to stderr as plain text so
+stdout stays machine-readable.
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import time
+from catalog import load_merged_config
+from focus_manager import get_gist_id, get_watch_history
+from videos import is_short
+import digest
+import fetcher
+import offline
+
+FORMATS = ("ndjson", "json")
+
+def video_record(video, channel, category):
+    return {**video.to_dict(), "channel_id": channel['id'], "category": category}
+
+def select_categories(config, names):
+    """The requested category names (all of them if `names` is empty), or None after reporting an unknown one."""
+    categories = [cat for cat, chans in config.items() if isinstance(chans, list)]
+    for name in names:
+        if name not in categories:
+            sys.stderr.write(f"Unknown category '{name}'. Available: {', '.join(categories) or 'none'}\n")
+            return None
+    return names or categories
+
+def unique_channels(config, categories):
+    """One entry per channel even if it sits in several categories; the first one names it."""
+    channels, category_of = [], {}
+    for cat in categories:
+        for ch in config[cat]:
+            if ch['id'] not in category_of:
+                category_of[ch['id']] = cat
+                channels.append(ch)
+    return channels, category_of
+
+def fetch_command(args):
+    """Handle `gh focus fetch`. Returns the process exit code."""
+    parser = argparse.ArgumentParser(prog="gh focus fetch", description="Fetch a category and print its videos as JSON.")
+    parser.add_argument("category", help="Category name, or 'all'")
+    parser.add_argument("--format", choices=FORMATS, default="ndjson",
+                        help="ndjson streams one video per line as feeds arrive; json prints one array at the end")
+    parser.add_argument("--max-age", type=int, default=0, help="Reuse feeds cached within this many seconds")
+    parser.add_argument("--include-shorts", action="store_true")
+    parser.add_argument("--unwatched", action="store_true", help="Leave out videos in your watch history")
+    options = parser.parse_args(args)
+
+    config = load_merged_config()
+    selected = select_categories(config, [] if options.category == "all" else [options.category])
+    if selected is None:
+        return 2
+    channels, category_of = unique_channels(config, selected)
+
+    fetcher.console = fetcher.PlainConsole()
+    watched = {v.get('video_id') for v in get_watch_history()} if options.unwatched else set()
+    records = []
+    for channel, videos in fetcher.stream_videos(channels, max_age=options.max_age):
+        for video in videos:
+            if video.video_id in watched or (is_short(video) and not options.include_shorts):
+                continue
+            record = video_record(video, channel, category_of[channel['id']])
+            if options.format == "ndjson":
+                sys.stdout.write(json.dumps(record, ensure_ascii=False) + "\n")
+            else:
+                records.append(record)
+        sys.stdout.flush()
+
+    if options.format == "json":
+        records.sort(key=lambda r: r['published'] or "", reverse=True)
+        json.dump(records, sys.stdout, ensure_ascii=False, indent=2)
+        sys.stdout.write("\n")
+    return 0
+
+def digest_command(args):
+    """Handle `gh focus digest`. Returns the process exit code."""
+    from analytics import parse_since
+
+    parser = argparse.ArgumentParser(prog="gh focus digest", description="Digest of new videos since the last run.")
+    parser.add_argument("--since", default="last", help="'last' (diff against the previous run), 7d, 2w, or YYYY-MM-DD")
+    parser.add_argument("--format", choices=("markdown", "html"), default="markdown")
+    parser.add_argument("--category", action="append", help="Only this category (repeatable)")
+    parser.add_argument("-o", "--output", help="Write to a file instead of stdout")
+    parser.add_argument("--publish", action="store_true", help="Also add the Markdown digest to your Learning Log gist")
+    parser.add_argument("--include-shorts", action="store_true")
+    options = parser.parse_args(args)
+
+    since = None
+    if options.since != "last":
+        try:
+            since = time.mktime(parse_since(options.since).timetuple())
+        except ValueError:
+            parser.error(f"can't read --since {options.since!r}")
+    gist_id = get_gist_id() if options.publish else None
+    if options.publish and not gist_id:
+        sys.stderr.write("No Learning Log gist yet; save a video to your log first.\n")
+        return 1
+
+    config = load_merged_config()
+    selected = select_categories(config, options.category or [])
+    if selected is None:
+        return 2
+    channels, _ = unique_channels(config, selected)
+    if offline.is_offline():
+        # A digest from cached feeds would move the snapshot past videos never fetched.
+        sys.stderr.write("Offline: can't fetch feeds, so no digest this time.\n")
+        return 1
+
+    fetcher.console = fetcher.PlainConsole()
+    by_channel = {}
+    for channel, results in fetcher.fetch_channels_threaded(channels):
+        if results:
+            by_channel[channel['id']] = results
+    fetcher.record_results(by_channel)
+
+    snapshot = digest.load_snapshot()
+    fresh = digest.new_videos(by_channel, snapshot, since)
+    if not options.include_shorts:
+        fresh = {cid: [v for v in videos if not is_short(v)] for cid, videos in fresh.items()}
+    groups = digest.group_by_category(fresh, {cat: config[cat] for cat in selected})
+    label = digest.since_label(snapshot, since)
+    markdown = digest.render_markdown(groups, label)
+    text = markdown if options.format == "markdown" else digest.render_html(groups, label)
+
+    if options.output:
+        with open(options.output, "w", encoding="utf-8") as f:
+            f.write(text)
+        sys.stderr.write(f"Digest written to {options.output}\n")
+    else:
+        sys.stdout.write(text)
+
+    if options.publish and not groups:
+        sys.stderr.write("Nothing new, so nothing published.\n")
+    elif options.publish:
+        try:
+            name = digest.publish(gist_id, markdown)
+        except (OSError, subprocess.CalledProcessError) as e:
+            sys.stderr.write(f"Couldn't publish the digest: {getattr(e, 'stderr', None) or e}\n")
+            return 1
+        sys.stderr.write(f"Published {name} to gist {gist_id}\n")
+
+    # Only move the snapshot on once the digest is out.
+    digest.save_snapshot(snapshot, by_channel)
+    return 0
+
+COMMANDS = {"fetch": fetch_command, "digest": digest_command}
@@ -0,0 +1,353 @@
+import hashlib
+import json
+import os
+import re
+import subprocess
+from datetime import datetime
+from fuzzy import FuzzyIndex
+
+# File name of the Learning Log inside the gist. Logs created before
+# sharding keep their entries here; it is read like any other shard.
+LOG_FILENAME = "focus_learning_log.md"
+
+# New entries go to one shard per month, e.g. focus_learning_log_2026_10.md.
+SHARD_PREFIX = "focus_learning_log_"
+
+# Small file in the gist listing every shard with its content hash.
+MANIFEST_FILENAME = "focus_learning_log_index.json"
+MANIFEST_VERSION = 1
+
+LOG_HEADER = "# My Intentional Learning Log 🧠\n\n"
+
+# Last assembled copy, for features that must not wait on the network.
+LOG_CACHE_FILE = "learning_log_cache.md"
+
+# Local copies of individual shards, reused while their hash is unchanged.
+SHARD_CACHE_DIR = "learning_log_shards"
+
+# Matches: - [ ] or - [x] **Title** - [Watch](URL)
+ENTRY_PATTERN = re.compile(r'^- \[([ x])\] \*\*(.+)\*\* - \[Watch\]\((.+?)\)$')
+
+def shard_name(when=None):
+    """Gist file holding entries saved in the month of `when` (default: now)."""
+    return f"{SHARD_PREFIX}{(when or datetime.now()).strftime('%Y_%m')}.md"
+
+def content_hash(content):
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+def video_id_from_url(url):
+    return url.split('v=')[-1] if 'v=' in url else None
+
+def format_entry(title, url):
+    return f"- [ ] **{title}** - [Watch]({url})\n"
+
+def _view_file(gist_id, filename):
+    result = subprocess.run(
+        ["gh", "gist", "view", gist_id, "--raw", "--filename", filename],
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    return result.stdout
+
+def _cached_shard(name, expected_hash=None):
+    """Local copy of a shard, or None if missing or not matching `expected_hash`."""
+    path = os.path.join(SHARD_CACHE_DIR, name)
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        content = f.read()
+    if expected_hash is not None and content_hash(content) != expected_hash:
+        return None
+    return content
+
+def _cache_shard(name, content):
+    os.makedirs(SHARD_CACHE_DIR, exist_ok=True)
+    with open(os.path.join(SHARD_CACHE_DIR, name), "w", encoding="utf-8", newline="") as f:
+        f.write(content)
+
+def _gist_files(gist_id):
+    result = subprocess.run(
+        ["gh", "gist", "view", gist_id, "--files"],
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    return result.stdout.split()
+
+def fetch_manifest(gist_id):
+    """
+    The gist's shard manifest, or None for a log that predates sharding.
+    Any other failure is raised: treating it as "no manifest" would make
+    the next push list only the shard being written.
+    """
+    try:
+        text = _view_file(gist_id, MANIFEST_FILENAME)
+    except subprocess.CalledProcessError:
+        if MANIFEST_FILENAME in _gist_files(gist_id):
+            raise
+        return None
+    try:
+        manifest = json.loads(text)
+    except json.JSONDecodeError:
+        return None
+    return manifest if manifest.get("version") == MANIFEST_VERSION else None
+
+def _load_shards(gist_id, manifest, names=None):
+    """
+    {shard name: content} for the shards in `manifest` (all, or just `names`).
+    Only shards whose hash differs from the local copy are downloaded.
+    """
+    if manifest is None:
+        # Pre-sharding log: one file, no hashes to compare against.
+        content = _view_file(gist_id, LOG_FILENAME)
+        _cache_shard(LOG_FILENAME, content)
+        return {LOG_FILENAME: content}
+
+    shards = {}
+    for name, info in manifest["shards"].items():
+        if names is not None and name not in names:
+            continue
+        content = _cached_shard(name, info["hash"])
+        if content is None:
+            content = _view_file(gist_id, name)
+            _cache_shard(name, content)
+        shards[name] = content
+    return shards
+
+def load_log(gist_id):
+    """
+    Assemble the whole Learning Log from its shards and refresh the local copy.
+    The manifest it was built from stays on log.manifest for push_shards.
+    """
+    manifest = fetch_manifest(gist_id)
+    log = LearningLog.from_shards(_load_shards(gist_id, manifest))
+    log.manifest = manifest or {"version": MANIFEST_VERSION, "shards": {}}
+    cache_log_content(log.text())
+    return log
+
+def fetch_log_content(gist_id):
+    """Download the Learning Log markdown (all shards, merged) from the gist."""
+    return load_log(gist_id).text()
+
+def patch_gist(gist_id, files):
+    """Create or replace several gist files in one API call. files: {name: {"content": text}}"""
+    subprocess.run(
+        ["gh", "api", "--method", "PATCH", f"gists/{gist_id}", "--input", "-"],
+        input=json.dumps({"files": files}),
+        capture_output=True,
+        text=True,
+        check=True
+    )
+
+def push_shards(gist_id, log, names, manifest=None):
+    """
+    Upload the given shards plus an updated manifest in one API call.
+    `manifest` is the gist's current one (the log's own, else fetched),
+    and is kept on log.manifest for the next push.
+    """
+    if manifest is None:
+        manifest = log.manifest
+    if manifest is None:
+        manifest = fetch_manifest(gist_id) or {"version": MANIFEST_VERSION, "shards": {}}
+    if not manifest["shards"] and LOG_FILENAME not in names:
+        # First sharded write to an old log: list the original file too.
+        legacy = _cached_shard(LOG_FILENAME)
+        if legacy is not None:
+            manifest["shards"][LOG_FILENAME] = {"hash": content_hash(legacy), "entries": len(LearningLog(legacy))}
+
+    files = {}
+    for name in names:
+        content = log.shard_text(name)
+        files[name] = {"content": content}
+        manifest["shards"][name] = {"hash": content_hash(content), "entries": log.shard_entries(name)}
+    manifest["shards"] = dict(sorted(manifest["shards"].items(), key=lambda item: _shard_order(item[0])))
+    files[MANIFEST_FILENAME] = {"content": json.dumps(manifest, indent=2)}
+
+    patch_gist(gist_id, files)
+    for name in names:
+        _cache_shard(name, files[name]["content"])
+    log.manifest = manifest
+    return manifest
+
+def _shard_order(name):
+    # The pre-sharding file holds the oldest entries.
+    return "" if name == LOG_FILENAME else name
+
+def append_entry(gist_id, title, url):
+    """Add an entry to this month's shard; older shards aren't transferred."""
+    manifest = fetch_manifest(gist_id)
+    name = shard_name()
+    log = LearningLog.from_shards({})
+    if manifest is not None and name in manifest["shards"]:
+        log = LearningLog.from_shards(_load_shards(gist_id, manifest, names={name}))
+    elif manifest is None:
+        # Hash the original file once so later loads can reuse it.
+        _cache_shard(LOG_FILENAME, _view_file(gist_id, LOG_FILENAME))
+    if name not in log.shards:
+        log.add_shard(name, f"# Learning Log · {datetime.now():%B %Y}\n\n")
+    log.append(name, title, url)
+    push_shards(gist_id, log, [name], manifest or {"version": MANIFEST_VERSION, "shards": {}})
+    _append_to_cache(format_entry(title, url))
+
+def create_log_files(directory, title, url):
+    """Write the first shard and manifest for a new gist; returns their paths."""
+    name = shard_name()
+    content = f"{LOG_HEADER}{format_entry(title, url)}"
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "shards": {name: {"hash": content_hash(content), "entries": 1}}
+    }
+    paths = []
+    for filename, data in ((name, content), (MANIFEST_FILENAME, json.dumps(manifest, indent=2))):
+        path = os.path.join(directory, filename)
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            f.write(data)
+        paths.append(path)
+    _cache_shard(name, content)
+    cache_log_content(content)
+    return paths
+
+def cache_log_content(content):
+    """Remember the latest Learning Log text locally."""
+    with open(LOG_CACHE_FILE, "w", encoding="utf-8") as f:
+        f.write(content)
+
+def _append_to_cache(line):
+    if os.path.exists(LOG_CACHE_FILE):
+        with open(LOG_CACHE_FILE, "a", encoding="utf-8") as f:
+            f.write(line)
+
+def cached_log():
+    """LearningLog built from the local copy (no network), or None if there isn't one."""
+    if not os.path.exists(LOG_CACHE_FILE):
+        return None
+    with open(LOG_CACHE_FILE, "r", encoding="utf-8") as f:
+        return LearningLog(f.read())
+
+def set_completed(gist_id, url, completed):
+    """
+    Check or uncheck the entry for `url` in the gist (used to replay offline
+    toggles). Does nothing if the entry is gone or already in that state.
+    """
+    log = load_log(gist_id)
+    video_id = video_id_from_url(url)
+    index = log.find(video_id) if video_id else next(
+        (i for i, e in enumerate(log.entries) if e['url'] == url), None
+    )
+    if index is None or log[index]['completed'] == completed:
+        return
+    log.set_completed(index, completed)
+    push_shards(gist_id, log, [log[index]['shard']], log.manifest)
+    cache_log_content(log.text())
+
+def cached_entries():
+    """Entries from the local copy of the Learning Log (no network)."""
+    if not os.path.exists(LOG_CACHE_FILE):
+        return []
+    with open(LOG_CACHE_FILE, "r", encoding="utf-8") as f:
+        return parse_entries(f.read())
+
+def parse_entries(content):
+    """Parse Learning Log markdown into entry dicts."""
+    return LearningLog(content).entries
+
+class LearningLog:
+    """
+    The Learning Log markdown, split into shards, with an index of entries.
+    Each entry remembers its shard and line, so toggling one rewrites that
+    line only; every other line (and duplicate titles) is untouched.
+    """
+
+    def __init__(self, content, name=LOG_FILENAME):
+        self.shards = {}
+        self.entries = []
+        self.by_video_id = {}
+        self.manifest = None
+        self._search_index = None
+        self.add_shard(name, content)
+
+    @classmethod
+    def from_shards(cls, shards):
+        """Build from {shard name: content}, oldest shard first."""
+        log = cls.__new__(cls)
+        log.shards, log.entries, log.by_video_id = {}, [], {}
+        log.manifest = None
+        log._search_index = None
+        for name in sorted(shards, key=_shard_order):
+            log.add_shard(name, shards[name])
+        return log
+
+    def add_shard(self, name, content):
+        lines = content.split('\n')
+        self.shards[name] = lines
+        for line_no, line in enumerate(lines):
+            self._index_line(name, line_no, line)
+
+    def _index_line(self, shard, line_no, line):
+        match = ENTRY_PATTERN.match(line)
+        if match:
+            checked, title, url = match.groups()
+            video_id = video_id_from_url(url)
+            entry = {
+                'title': title,
+                'url': url,
+                'video_id': video_id,
+                'completed': checked == 'x',
+                'shard': shard,
+                'line': line_no
+            }
+            if video_id:
+                self.by_video_id.setdefault(video_id, len(self.entries))
+            self.entries.append(entry)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __getitem__(self, index):
+        return self.entries[index]
+
+    def completed_count(self):
+        return sum(1 for e in self.entries if e['completed'])
+
+    def find(self, video_id):
+        """Entry index for a video ID, or None."""
+        return self.by_video_id.get(video_id)
+
+    def append(self, shard, title, url):
+        """Add an unchecked entry at the end of `shard`."""
+        lines = self.shards[shard]
+        # Keep the file's trailing newline after the new entry.
+        line_no = len(lines) - 1 if lines and lines[-1] == "" else len(lines)
+        lines.insert(line_no, format_entry(title, url).rstrip('\n'))
+        self._index_line(shard, line_no, lines[line_no])
+
+    def set_completed(self, index, completed):
+        """Check or uncheck one entry in place."""
+        entry = self.entries[index]
+        lines = self.shards[entry['shard']]
+        line = lines[entry['line']]
+        lines[entry['line']] = f"{line[:3]}{'x' if completed else ' '}{line[4:]}"
+        entry['completed'] = completed
+
+    def toggle(self, index):
+        self.set_completed(index, not self.entries[index]['completed'])
+
+    def shard_text(self, name):
+        return '\n'.join(self.shards[name])
+
+    def shard_entries(self, name):
+        return sum(1 for e in self.entries if e['shard'] == name)
+
+    def text(self):
+        """All shards merged, oldest first."""
+        return ''.join(
+            text if text.endswith('\n') else text + '\n'
+            for text in (self.shard_text(name) for name in self.shards)
+        )
+
+    def search_index(self):
+        """Fuzzy index over entry titles, keyed by entry index (built on first use)."""
+        if self._search_index is None or len(self._search_index) != len(self.entries):
+            self._search_index = FuzzyIndex((i, e['title']) for i, e in enumerate(self.entries))
+        return self._search_index
@@ -0,0 +1,153 @@
+"""
+HTTP GETs for feed fetching: per-host token-bucket pacing, bounded retries
+with jittered exponential backoff, and Retry-After handling.
+
+Each host gets one bucket shared by every fetch thread in the process. A 429
+pauses the whole host (not just the thread that saw it) and halves its rate;
+successful responses win the rate back gradually.
+"""
+
+import random
+import threading
+import time
+import urllib.error
+import urllib.request
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+# Starting requests/second per host and how many may go out back to back.
+HOST_RATE = 200.0
+HOST_BURST = 50
+
+# Floor for the rate after repeated 429s.
+MIN_HOST_RATE = 2.0
+
+# Requests/second regained per successful response.
+RATE_RECOVERY = 0.1
+
+# Attempts per request (first try included) and backoff bounds in seconds.
+MAX_ATTEMPTS = 4
+BACKOFF_BASE = 0.25
+BACKOFF_CAP = 8.0
+
+# Never wait longer than this for a server-supplied Retry-After.
+RETRY_AFTER_CAP = 30.0
+
+# Statuses worth retrying; anything else (404, 403, ...) fails immediately.
+RETRY_STATUSES = {408, 425, 429, 500, 502, 503, 504}
+
+class TokenBucket:
+    """Thread-safe token bucket with an adjustable rate and a shared pause."""
+
+    def __init__(self, rate, burst):
+        self.max_rate = rate
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a request may be sent."""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + max(0.0, now - self.updated) * self.rate)
+                self.updated = max(now, self.updated)
+                wait = self.paused_until - now
+                if wait <= 0:
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        return
+                    wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+    def throttled(self, delay):
+        """Server said slow down: pause every caller for `delay` and halve the rate."""
+        with self.lock:
+            now = time.monotonic()
+            # Requests already in flight get their 429s too; count that as one signal.
+            if now >= self.paused_until:
+                self.rate = max(MIN_HOST_RATE, self.rate / 2)
+            self.paused_until = max(self.paused_until, now + delay)
+            # Start refilling only once the pause is over, so it doesn't end in a burst.
+            self.tokens = 0.0
+            self.updated = self.paused_until
+
+    def succeeded(self):
+        with self.lock:
+            self.rate = min(self.max_rate, self.rate + RATE_RECOVERY)
+
+# One bucket per host for this process.
+_buckets = {}
+_buckets_lock = threading.Lock()
+
+# Per-process counters, read by the benchmarks.
+stats = {"requests": 0, "retries": 0, "throttled": 0}
+
+def set_rate_share(share):
+    """Divide HOST_RATE/HOST_BURST between `share` processes (process-pool initializer)."""
+    global HOST_RATE, HOST_BURST
+    HOST_RATE = HOST_RATE / share
+    HOST_BURST = max(1, HOST_BURST // share)
+    with _buckets_lock:
+        _buckets.clear()
+
+def bucket_for(url):
+    host = urlparse(url).netloc
+    with _buckets_lock:
+        if host not in _buckets:
+            _buckets[host] = TokenBucket(HOST_RATE, HOST_BURST)
+        return _buckets[host]
+
+def backoff(attempt):
+    """Full-jitter delay before retry number `attempt` (1-based)."""
+    return random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt))
+
+def retry_after(error):
+    """Seconds from a Retry-After header (delta or HTTP date), or None."""
+    value = error.headers.get("Retry-After") if error.headers else None
+    if not value:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            seconds = parsedate_to_datetime(value).timestamp() - time.time()
+        except (TypeError, ValueError):
+            return None
+    return min(RETRY_AFTER_CAP, max(0.0, seconds))
+
+def get(url, timeout=10, attempts=None):
+    """
+    GET `url` and return the body. Transient failures (timeouts, connection
+    errors, RETRY_STATUSES) are retried; the last error is raised once
+    attempts run out. Other HTTP errors are raised straight away.
+    """
+    bucket = bucket_for(url)
+    attempts = attempts or MAX_ATTEMPTS
+    request = urllib.request.Request(url, headers={"User-Agent": "gh-focus"})
+    for attempt in range(1, attempts + 1):
+        bucket.acquire()
+        stats["requests"] += 1
+        try:
+            with urllib.request.urlopen(request, timeout=timeout) as response:
+                body = response.read()
+            bucket.succeeded()
+            return body
+        except urllib.error.HTTPError as e:
+            if e.code not in RETRY_STATUSES or attempt == attempts:
+                raise
+            delay = retry_after(e)
+            if e.code == 429:
+                stats["throttled"] += 1
+                bucket.throttled(delay if delay is not None else backoff(attempt))
+            if delay is None:
+                delay = backoff(attempt)
+        except (urllib.error.URLError, TimeoutError, ConnectionError):
+            if attempt == attempts:
+                raise
+            delay = backoff(attempt)
+        stats["retries"] += 1
+        time.sleep(delay)
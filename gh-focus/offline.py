@@ -0,0 +1,144 @@
+"""
+Offline mode: one cheap connectivity probe, and a queue for writes that
+need the network (Learning Log saves and completion toggles).
+
+The probe opens a TCP connection to the feed host on a background thread,
+so startup can draw the banner while it runs. Once the answer is known it
+is reused; after PROBE_INTERVAL it is refreshed in the background, so
+menus never wait on it again. Queued writes are replayed in order by
+`flush` the next time the app starts online.
+"""
+
+import json
+import os
+import socket
+import sys
+import threading
+import time
+from urllib.parse import urlparse
+from focus_manager import config_lock, write_json_atomic
+
+# Set to 1 to force offline mode (no probe), 0 to skip the probe and assume online.
+OFFLINE_ENV = "GH_FOCUS_OFFLINE"
+
+# Seconds to wait for the probe (connect, and DNS via the thread join).
+PROBE_TIMEOUT = 1.5
+
+# Re-check connectivity in the background after this many seconds.
+PROBE_INTERVAL = 60
+
+# Writes made while offline, replayed in order once back online.
+PENDING_FILE = "pending_writes.json"
+
+# Last probe result (None until one finished or timed out) and when it was taken.
+_state = {"offline": None, "checked": 0.0, "thread": None}
+_lock = threading.Lock()
+
+def probe_address():
+    """(host, port) of the feed endpoint, so the probe checks what fetching needs."""
+    import fetcher
+
+    url = urlparse(fetcher.FEED_URL)
+    return url.hostname, url.port or (443 if url.scheme == "https" else 80)
+
+def reachable(address, timeout=PROBE_TIMEOUT):
+    try:
+        with socket.create_connection(address, timeout=timeout):
+            return True
+    except OSError:
+        return False
+
+def _run_probe():
+    offline = not reachable(probe_address())
+    with _lock:
+        _state.update(offline=offline, checked=time.monotonic(), thread=None)
+
+def start_probe():
+    """Check connectivity in the background (no-op if a check is already running)."""
+    with _lock:
+        if _state["thread"] is not None:
+            return _state["thread"]
+        thread = _state["thread"] = threading.Thread(target=_run_probe, daemon=True)
+    thread.start()
+    return thread
+
+def is_offline():
+    """True when the feed host can't be reached. Blocks at most PROBE_TIMEOUT, and only the first time."""
+    forced = os.environ.get(OFFLINE_ENV)
+    if forced in ("0", "1"):
+        return forced == "1"
+    if _state["offline"] is None:
+        start_probe().join(PROBE_TIMEOUT)
+        with _lock:
+            if _state["offline"] is None:
+                # No answer in time (e.g. DNS hanging) is as good as offline.
+                _state.update(offline=True, checked=time.monotonic())
+    elif time.monotonic() - _state["checked"] > PROBE_INTERVAL:
+        start_probe()
+    return _state["offline"]
+
+def pending():
+    """Queued writes, oldest first: [{'kind': ..., 'payload': {...}, 'queued_at': epoch}]"""
+    if not os.path.exists(PENDING_FILE):
+        return []
+    with open(PENDING_FILE, "r", encoding="utf-8") as f:
+        try:
+            return json.load(f)
+        except json.JSONDecodeError:
+            return []
+
+def pending_payloads(kind):
+    return [item["payload"] for item in pending() if item["kind"] == kind]
+
+def _write_pending(items):
+    if items:
+        write_json_atomic(PENDING_FILE, items, indent=2)
+    elif os.path.exists(PENDING_FILE):
+        os.remove(PENDING_FILE)
+
+# The queue is shared by every session, so it only changes under the config lock.
+def queue_write(kind, payload):
+    with config_lock():
+        _write_pending(pending() + [{"kind": kind, "payload": payload, "queued_at": time.time()}])
+
+def _take():
+    """Remove and return the oldest queued write, or None."""
+    with config_lock():
+        items = pending()
+        if not items:
+            return None
+        _write_pending(items[1:])
+        return items[0]
+
+def _put_back(item):
+    with config_lock():
+        _write_pending([item] + pending())
+
+def flush(handlers):
+    """
+    Replay queued writes. handlers: {kind: callable(payload) -> bool}.
+    Each write leaves the queue before it is replayed, so two sessions
+    coming back online together never replay the same one. The lock isn't
+    held during the replay itself (handlers may write config.json).
+    Stops at the first failure, which goes back to the front of the queue.
+    A write of a kind with no handler (e.g. queued by a newer version) can
+    never succeed, so it is dropped with a warning instead.
+    Returns how many were replayed.
+    """
+    done = 0
+    while True:
+        item = _take()
+        if item is None:
+            return done
+        handler = handlers.get(item.get("kind"))
+        if handler is None:
+            sys.stderr.write(f"Dropped a queued offline write of unknown kind {item.get('kind')!r}.\n")
+            continue
+        try:
+            ok = handler(item["payload"])
+        except Exception:
+            ok = False
+        if not ok:
+            _put_back(item)
+            return done
+        done += 1
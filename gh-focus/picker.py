@@ -0,0 +1,70 @@
+from prompt_toolkit.application import Application
+from prompt_toolkit.buffer import Buffer
+from prompt_toolkit.key_binding import KeyBindings
+from prompt_toolkit.layout import HSplit, Layout, Window
+from prompt_toolkit.layout.controls import BufferControl, FormattedTextControl
+from prompt_toolkit.layout.processors import BeforeInput
+from prompt_toolkit.styles import Style
+from fuzzy import FuzzyIndex
+
+# Matches shown under the search box.
+PICKER_ROWS = 15
+
+PICKER_STYLE = Style.from_dict({
+    "prompt": "fg:ansicyan bold",
+    "selected": "fg:ansicyan bold",
+    "dim": "fg:ansibrightblack"
+})
+
+def pick(message, items, index=None, rows=PICKER_ROWS):
+    """
+    Type-to-filter picker. items: [(key, label), ...]; pass a prebuilt
+    FuzzyIndex over the same items to reuse it. Returns the chosen key,
+    or None if cancelled.
+    """
+    labels = dict(items)
+    index = index or FuzzyIndex(items)
+    state = {"results": index.search("", limit=rows), "cursor": 0}
+
+    def on_change(buffer):
+        state["results"] = index.search(buffer.text, limit=rows)
+        state["cursor"] = 0
+
+    def render():
+        fragments = []
+        for position, key in enumerate(state["results"]):
+            if position == state["cursor"]:
+                fragments.append(("class:selected", f"❯ {labels[key]}\n"))
+            else:
+                fragments.append(("", f"  {labels[key]}\n"))
+        if not state["results"]:
+            fragments.append(("class:dim", "  No matches\n"))
+        fragments.append(("class:dim", f"  {len(index)} entries · type to filter · ↑/↓ move · Enter select · Esc cancel"))
+        return fragments
+
+    bindings = KeyBindings()
+
+    @bindings.add("up")
+    def _(event):
+        state["cursor"] = max(0, state["cursor"] - 1)
+
+    @bindings.add("down")
+    def _(event):
+        state["cursor"] = min(len(state["results"]) - 1, state["cursor"] + 1)
+
+    @bindings.add("enter")
+    def _(event):
+        results = state["results"]
+        event.app.exit(result=results[state["cursor"]] if results else None)
+
+    @bindings.add("escape", eager=True)
+    @bindings.add("c-c")
+    def _(event):
+        event.app.exit(result=None)
+
+    search = Buffer(multiline=False, on_text_changed=on_change)
+    layout = Layout(HSplit([
+        Window(BufferControl(search, input_processors=[BeforeInput(f"{message} ", style="class:prompt")]), height=1),
+        Window(FormattedTextControl(render), height=rows + 1)
+    ]))
+    return Application(layout=layout, key_bindings=bindings, style=PICKER_STYLE).run()
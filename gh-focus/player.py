@@ -0,0 +1,121 @@
+"""
+Playlist mode: one player process for a whole queue of videos.
+
+mpv gets the queue as an m3u playlist, preloads the next entry while the
+current one plays (--prefetch-playlist) and reports each new entry over its
+JSON IPC socket, so videos are logged as they start. VLC plays the same
+playlist but can't report progress.
+"""
+
+import json
+import os
+import shutil
+import socket
+import subprocess
+import tempfile
+import time
+from videos import WATCH_URL
+
+# How long to wait for mpv to open its IPC socket.
+IPC_CONNECT_TIMEOUT = 10
+
+VLC_WINDOWS_PATHS = [
+    r"C:\Program Files\VideoLAN\VLC\vlc.exe",
+    r"C:\Program Files (x86)\VideoLAN\VLC\vlc.exe"
+]
+
+def find_player():
+    """('mpv', path), ('vlc', path) or None. A portable mpv.exe next to the script wins."""
+    local_mpv = os.path.join(os.path.dirname(os.path.abspath(__file__)), "mpv.exe")
+    if os.path.exists(local_mpv):
+        return "mpv", local_mpv
+    if shutil.which("mpv"):
+        return "mpv", shutil.which("mpv")
+    vlc_path = shutil.which("vlc") or next((p for p in VLC_WINDOWS_PATHS if os.path.exists(p)), None)
+    if vlc_path:
+        return "vlc", vlc_path
+    return None
+
+def write_playlist(queue, directory):
+    """Write the queue as an extended m3u file and return its path."""
+    path = os.path.join(directory, "gh-focus-queue.m3u")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("#EXTM3U\n")
+        for item in queue:
+            f.write(f"#EXTINF:-1,{item['title']}\n{WATCH_URL}{item['video_id']}\n")
+    return path
+
+def _ipc_address():
+    name = f"gh-focus-mpv-{os.getpid()}"
+    if os.name == "nt":
+        return rf"\\.\pipe\{name}"
+    return os.path.join(tempfile.gettempdir(), f"{name}.sock")
+
+def _connect(address, process):
+    """Line reader over mpv's IPC socket (Unix socket or Windows named pipe), or None."""
+    deadline = time.time() + IPC_CONNECT_TIMEOUT
+    while time.time() < deadline and process.poll() is None:
+        try:
+            if os.name == "nt":
+                pipe = open(address, "r+b", buffering=0)
+                return pipe, pipe.write
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.connect(address)
+            return sock.makefile("rb"), sock.sendall
+        except OSError:
+            time.sleep(0.1)
+    return None
+
+def _play_mpv(path, queue, on_start):
+    address = _ipc_address()
+    with tempfile.TemporaryDirectory() as directory:
+        playlist = write_playlist(queue, directory)
+        process = subprocess.Popen([
+            path,
+            f"--playlist={playlist}",
+            f"--input-ipc-server={address}",
+            "--prefetch-playlist=yes",
+            "--force-window=immediate"
+        ])
+        connection = _connect(address, process)
+        started = set()
+        if connection:
+            reader, send = connection
+            send(b'{"command": ["observe_property", 1, "playlist-pos"]}\n')
+            for line in reader:
+                try:
+                    message = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if message.get("event") == "shutdown":
+                    break
+                position = message.get("data")
+                if message.get("name") == "playlist-pos" and isinstance(position, int):
+                    if 0 <= position < len(queue) and position not in started:
+                        started.add(position)
+                        on_start(queue[position])
+            reader.close()
+        process.wait()
+    if os.name != "nt" and os.path.exists(address):
+        os.remove(address)
+    return len(started)
+
+def _play_vlc(path, queue):
+    with tempfile.TemporaryDirectory() as directory:
+        playlist = write_playlist(queue, directory)
+        subprocess.run([path, playlist, "--play-and-exit"])
+
+def play_queue(queue, on_start):
+    """
+    Play queue items ({'video_id', 'title', ...}) back to back in one player.
+    on_start(item) runs as each video starts (mpv only). Returns the number
+    of videos reported as started, or None if no player/progress is available.
+    """
+    player = find_player()
+    if not player or not queue:
+        return None
+    kind, path = player
+    if kind == "mpv":
+        return _play_mpv(path, queue, on_start)
+    _play_vlc(path, queue)
+    return None
@@ -0,0 +1,114 @@
+import math
+import os
+import time
+from archive import channels_for, parse_published
+from focus_manager import HISTORY_FILE, LEARNING_LOG_PLACEHOLDER, get_watch_history
+from learning_log import LOG_CACHE_FILE, cached_entries
+
+# How much each signal contributes to a video's score (sums to 1).
+WEIGHTS = {
+    "affinity": 0.45,    # how much you watch this channel, recent watches count more
+    "recency": 0.30,     # how new the video is
+    "completion": 0.15,  # share of this channel's Learning Log items you finished
+    "category": 0.10     # this channel's share of what you watch in the category
+}
+
+RECENCY_HALF_LIFE_DAYS = 7
+AFFINITY_HALF_LIFE_DAYS = 60
+
+# Per-channel/category signals, rebuilt only when history or the log cache change.
+_model = {"key": None, "affinity": {}, "completion": {}, "category": {}}
+
+# Scores per (video_id, category), valid for one model key and hour.
+_scores = {"key": None, "values": {}}
+
+def _file_key(path):
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+def _decay(age_seconds, half_life_days):
+    return 0.5 ** (max(age_seconds, 0) / (half_life_days * 86400))
+
+def _build_model():
+    key = (_file_key(HISTORY_FILE), _file_key(LOG_CACHE_FILE))
+    if key == _model["key"]:
+        return _model
+
+    now = time.time()
+    history = get_watch_history()
+    affinity, category_counts, channel_of = {}, {}, {}
+    in_category = {}
+    for item in history:
+        if item.get("category") == LEARNING_LOG_PLACEHOLDER:
+            continue
+        channel = item.get("channel")
+        watched_at = parse_published(item.get("timestamp"))
+        weight = _decay(now - watched_at, AFFINITY_HALF_LIFE_DAYS) if watched_at else 0.5
+        affinity[channel] = affinity.get(channel, 0.0) + weight
+        cat = item.get("category", "Unknown")
+        category_counts[cat] = category_counts.get(cat, 0) + 1
+        in_category[(cat, channel)] = in_category.get((cat, channel), 0) + 1
+        if item.get("video_id"):
+            channel_of[item["video_id"]] = channel
+
+    # Normalise to 0..1 on a log scale so one binge doesn't dominate.
+    top = max(affinity.values(), default=0.0)
+    affinity = {ch: math.log1p(v) / math.log1p(top) for ch, v in affinity.items()} if top else {}
+    category = {(cat, ch): count / category_counts[cat] for (cat, ch), count in in_category.items()}
+
+    entries = [e for e in cached_entries() if e["video_id"]]
+    missing = [e["video_id"] for e in entries if e["video_id"] not in channel_of]
+    if missing:
+        channel_of.update(channels_for(missing))
+    finished, saved = {}, {}
+    for e in entries:
+        channel = channel_of.get(e["video_id"])
+        if channel:
+            saved[channel] = saved.get(channel, 0) + 1
+            finished[channel] = finished.get(channel, 0) + (1 if e["completed"] else 0)
+    completion = {ch: finished[ch] / saved[ch] for ch in saved}
+
+    _model.update(key=key, affinity=affinity, completion=completion, category=category)
+    return _model
+
+def score_videos(videos, category):
+    """
+    Scores for a batch of videos in `category`, cached per video.
+    The channel signals are summed once per channel, so each new video only
+    adds its recency.
+    """
+    model = _build_model()
+    now = time.time()
+    cache_key = (model["key"], int(now // 3600))
+    if _scores["key"] != cache_key:
+        _scores.update(key=cache_key, values={})
+    cached = _scores["values"]
+
+    affinity, completion, in_category = model["affinity"], model["completion"], model["category"]
+    channel_part = {}
+    scores = []
+    for v in videos:
+        key = (v.video_id, category)
+        score = cached.get(key)
+        if score is None:
+            base = channel_part.get(v.channel)
+            if base is None:
+                base = channel_part[v.channel] = (
+                    WEIGHTS["affinity"] * affinity.get(v.channel, 0.0)
+                    + WEIGHTS["completion"] * completion.get(v.channel, 0.0)
+                    + WEIGHTS["category"] * in_category.get((category, v.channel), 0.0)
+                )
+            published = parse_published(v.published)
+            recency = _decay(now - published, RECENCY_HALF_LIFE_DAYS) if published else 0.0
+            score = cached[key] = base + WEIGHTS["recency"] * recency
+        scores.append(score)
+    return scores
+
+def rank_videos(videos, category):
+    """Videos sorted best-first for `category`."""
+    scores = score_videos(videos, category)
+    order = sorted(range(len(videos)), key=scores.__getitem__, reverse=True)
+    return [videos[i] for i in order]
@@ -0,0 +1,307 @@
+"""
+`gh focus serve`: a small local dashboard backed by the feed cache.
+
+Every browser tab or terminal (curl) talks to one FetchEngine, so refreshes
+are shared instead of each client hitting YouTube on its own. Pages render
+from the local cache; refreshes run in the background and push updates over
+Server-Sent Events.
+"""
+
+import argparse
+import html
+import json
+import queue
+import subprocess
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import quote, unquote, urlparse
+from rich import print
+from catalog import load_merged_config
+from feed_cache import get_cached_videos, last_fetched
+from fetcher import get_videos
+from focus_manager import get_gist_id, get_watch_stats
+from learning_log import fetch_log_content, parse_entries
+from unread import unread_counts
+from videos import VideoIndex
+
+# Refresh target for the Learning Log (category keys can't contain ':').
+LOG_TARGET = ":log"
+
+class FetchEngine:
+    """Runs refreshes one at a time on a background thread and fans out events."""
+
+    def __init__(self):
+        self.queue = queue.Queue()
+        self.pending = set()
+        self.subscribers = []
+        self.lock = threading.Lock()
+        self.learning_log = None
+        self.learning_log_fetched = None
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def request_refresh(self, target):
+        """Queue a refresh (LOG_TARGET or a category). Returns False if already queued."""
+        with self.lock:
+            if target in self.pending:
+                return False
+            self.pending.add(target)
+        self.queue.put(target)
+        self.publish("refresh-queued", {"target": target})
+        return True
+
+    def subscribe(self):
+        q = queue.Queue()
+        with self.lock:
+            self.subscribers.append(q)
+        return q
+
+    def unsubscribe(self, q):
+        with self.lock:
+            if q in self.subscribers:
+                self.subscribers.remove(q)
+
+    def publish(self, event, data):
+        with self.lock:
+            subscribers = list(self.subscribers)
+        for q in subscribers:
+            q.put((event, data))
+
+    def _run(self):
+        while True:
+            target = self.queue.get()
+            self.publish("refresh-start", {"target": target})
+            try:
+                if target == LOG_TARGET:
+                    self._refresh_log()
+                    self.publish("log-updated", {"entries": len(self.learning_log or [])})
+                else:
+                    channels = load_merged_config().get(target, [])
+                    videos = get_videos(channels) if channels else []
+                    self.publish("category-updated", {"category": target, "videos": len(videos)})
+            except Exception as e:
+                self.publish("refresh-failed", {"target": target, "error": str(e)})
+            finally:
+                with self.lock:
+                    self.pending.discard(target)
+
+    def _refresh_log(self):
+        gist_id = get_gist_id()
+        if not gist_id:
+            self.learning_log = []
+        else:
+            try:
+                self.learning_log = parse_entries(fetch_log_content(gist_id))
+            except (OSError, subprocess.CalledProcessError):
+                return
+        self.learning_log_fetched = time.time()
+
+PAGE = """<!doctype html>
+<html><head><meta charset="utf-8"><title>gh focus · {title}</title>
+<style>
+body {{ font-family: system-ui, sans-serif; max-width: 860px; margin: 2em auto; color: #222; }}
+nav a {{ margin-right: 1em; }} li {{ margin: .3em 0; }} .dim {{ color: #888; }}
+#status {{ position: fixed; top: .5em; right: 1em; color: #888; font-size: .9em; }}
+</style></head>
+<body>
+<nav><a href="/">🎯 Categories</a><a href="/log">📚 Learning Log</a><a href="/stats">📊 Stats</a></nav>
+<div id="status"></div>
+<h1>{title}</h1>
+{body}
+<script>
+const watching = {watching};
+const events = new EventSource("/events");
+const status = document.getElementById("status");
+["refresh-queued", "refresh-start", "refresh-failed"].forEach(name =>
+  events.addEventListener(name, e => {{ status.textContent = name + ": " + JSON.parse(e.data).target; }}));
+events.addEventListener("category-updated", e => {{
+  const data = JSON.parse(e.data);
+  status.textContent = "updated: " + data.category;
+  if (watching.includes(data.category)) location.reload();
+}});
+events.addEventListener("log-updated", () => {{ if (watching.includes(":log")) location.reload(); }});
+function refresh(target) {{ fetch("/refresh/" + encodeURIComponent(target), {{method: "POST"}}); }}
+</script>
+</body></html>
+"""
+
+def _age(timestamp):
+    if not timestamp:
+        return "never fetched"
+    minutes = int((time.time() - timestamp) // 60)
+    return f"fetched {minutes} min ago" if minutes else "fetched just now"
+
+def render_page(title, body, watching=()):
+    return PAGE.format(title=html.escape(title), body=body, watching=json.dumps(list(watching)))
+
+def categories_payload():
+    config = load_merged_config()
+    new_counts = unread_counts()
+    return [
+        {"name": cat, "channels": len(channels), "new": new_counts.get(cat, 0), "fetched_at": last_fetched(channels)}
+        for cat, channels in config.items() if isinstance(channels, list)
+    ]
+
+def category_payload(category):
+    channels = load_merged_config().get(category)
+    if not isinstance(channels, list):
+        return None
+    index = VideoIndex(get_cached_videos(channels))
+    return {
+        "category": category,
+        "fetched_at": last_fetched(channels),
+        "videos": [index[offset].to_dict() for offset in index.rows]
+    }
+
+def render_categories():
+    categories = categories_payload()
+    items = "".join(
+        f'<li><a href="/category/{html.escape(quote(c["name"], safe=""))}">{html.escape(c["name"])}</a> '
+        + (f'<b>({c["new"]} new)</b> ' if c["new"] else "")
+        + f'<span class="dim">{c["channels"]} channels · {_age(c["fetched_at"])}</span></li>'
+        for c in categories
+    )
+    return render_page("Your Learning Categories", f"<ul>{items}</ul>", [c["name"] for c in categories])
+
+def render_category(category):
+    data = category_payload(category)
+    if data is None:
+        return None
+    rows = "".join(
+        f'<li><a href="{html.escape(v["link"])}">{html.escape(v["title"])}</a> '
+        f'<span class="dim">{html.escape(v["channel"])} · {html.escape(v["published"][:10])}</span></li>'
+        for v in data["videos"]
+    ) or '<li class="dim">Nothing cached yet — refresh to fetch.</li>'
+    body = (
+        f'<p class="dim">{_age(data["fetched_at"])} · '
+        f'<button onclick="refresh({html.escape(json.dumps(category))})">Refresh</button></p>'
+        f"<ul>{rows}</ul>"
+    )
+    return render_page(category, body, [category])
+
+def render_log(engine):
+    if engine.learning_log is None:
+        engine.request_refresh(LOG_TARGET)
+        return render_page("Learning Log", '<p class="dim">Loading from your gist…</p>', [LOG_TARGET])
+    done = sum(1 for e in engine.learning_log if e["completed"])
+    rows = "".join(
+        f'<li>{"✓" if e["completed"] else "○"} <a href="{html.escape(e["url"])}">{html.escape(e["title"])}</a></li>'
+        for e in engine.learning_log
+    ) or '<li class="dim">Your Learning Log is empty.</li>'
+    body = (
+        f'<p class="dim">{done}/{len(engine.learning_log)} completed · {_age(engine.learning_log_fetched)} · '
+        f'<button onclick="refresh(\':log\')">Refresh</button></p><ul>{rows}</ul>'
+    )
+    return render_page("Learning Log", body, [LOG_TARGET])
+
+def render_stats():
+    stats = get_watch_stats()
+    cats = "".join(
+        f"<li>{html.escape(cat)}: {count}</li>"
+        for cat, count in sorted(stats["categories"].items(), key=lambda x: x[1], reverse=True)
+    )
+    recent = "".join(f"<li>{html.escape(v['title'])}</li>" for v in reversed(stats.get("recent", [])))
+    body = (
+        f"<p>🎥 {stats['total_videos']} videos · ⏱️ {stats['total_time']}</p>"
+        f"<h3>Category Breakdown</h3><ul>{cats}</ul><h3>Recent Learning</h3><ul>{recent}</ul>"
+    )
+    return render_page("Your Progress", body)
+
+def make_handler(engine):
+    """Request handler bound to the shared engine."""
+
+    class DashboardHandler(BaseHTTPRequestHandler):
+        def _send(self, status, body, content_type="text/html; charset=utf-8"):
+            data = body.encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _send_json(self, payload, status=200):
+            self._send(status, json.dumps(payload), "application/json")
+
+        def do_GET(self):
+            # Names are unquoted after the route prefix is split off, so an encoded '/' stays in the name.
+            path = urlparse(self.path).path
+            if path == "/":
+                self._send(200, render_categories())
+            elif path.startswith("/category/"):
+                page = render_category(unquote(path[len("/category/"):]))
+                self._send(200, page) if page else self._send(404, render_page("Not found", ""))
+            elif path == "/log":
+                self._send(200, render_log(engine))
+            elif path == "/stats":
+                self._send(200, render_stats())
+            elif path == "/api/categories":
+                self._send_json(categories_payload())
+            elif path.startswith("/api/category/"):
+                data = category_payload(unquote(path[len("/api/category/"):]))
+                self._send_json(data) if data else self._send_json({"error": "unknown category"}, 404)
+            elif path == "/api/stats":
+                self._send_json(get_watch_stats())
+            elif path == "/events":
+                self._stream_events()
+            else:
+                self._send(404, render_page("Not found", ""))
+
+        def do_POST(self):
+            path = urlparse(self.path).path
+            if path.startswith("/refresh/"):
+                target = unquote(path[len("/refresh/"):])
+                queued = engine.request_refresh(target)
+                self._send_json({"target": target, "queued": queued}, 202)
+            else:
+                self._send_json({"error": "not found"}, 404)
+
+        def _stream_events(self):
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Cache-Control", "no-cache")
+            self.end_headers()
+            q = engine.subscribe()
+            try:
+                while True:
+                    try:
+                        event, data = q.get(timeout=15)
+                        self.wfile.write(f"event: {event}\ndata: {json.dumps(data)}\n\n".encode("utf-8"))
+                    except queue.Empty:
+                        self.wfile.write(b": keep-alive\n\n")
+                    self.wfile.flush()
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+            finally:
+                engine.unsubscribe(q)
+
+        def log_message(self, format, *args):
+            pass
+
+    return DashboardHandler
+
+def serve(args):
+    """Entry point for `gh focus serve [--port N] [--interval SECONDS]`."""
+    parser = argparse.ArgumentParser(prog="gh focus serve", description="Local dashboard backed by the feed cache.")
+    parser.add_argument("--port", type=int, default=8787)
+    parser.add_argument("--interval", type=int, default=0, help="Refresh every category every N seconds (0 = only on demand)")
+    options = parser.parse_args(args)
+
+    engine = FetchEngine()
+    server = ThreadingHTTPServer(("127.0.0.1", options.port), make_handler(engine))
+    server.daemon_threads = True
+
+    if options.interval > 0:
+        def refresh_all():
+            while True:
+                for cat in (c["name"] for c in categories_payload()):
+                    engine.request_refresh(cat)
+                time.sleep(options.interval)
+        threading.Thread(target=refresh_all, daemon=True).start()
+
+    print(f"[bold green]🎯 gh focus dashboard on http://127.0.0.1:{options.port}[/bold green] [dim](Ctrl+C to stop)[/dim]")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
@@ -0,0 +1,24 @@
+"""Shared setup: the app modules live next to this folder, not in a package."""
+
+import os
+import sys
+import tempfile
+import unittest
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+sys.path.insert(0, APP_DIR)
+
+
+class WorkdirTestCase(unittest.TestCase):
+    """Runs each test in an empty directory, since state files live in the cwd."""
+
+    def setUp(self):
+        self._original_cwd = os.getcwd()
+        self._workdir = tempfile.TemporaryDirectory(prefix="gh-focus-test-")
+        os.chdir(self._workdir.name)
+
+    def tearDown(self):
+        os.chdir(self._original_cwd)
+        self._workdir.cleanup()
@@ -0,0 +1,44 @@
+import sqlite3
+import unittest
+from tests.helpers import WorkdirTestCase
+
+import archive
+from videos import Video
+
+CHANNEL = {"name": "Chan", "id": "UCcccccccccccccccccccccc"}
+
+
+class ConnectionTest(WorkdirTestCase):
+    def test_connections_are_closed(self):
+        opened = []
+        real_connect = sqlite3.connect
+
+        def tracking_connect(*args, **kwargs):
+            conn = real_connect(*args, **kwargs)
+            opened.append(conn)
+            return conn
+
+        archive.sqlite3.connect = tracking_connect
+        try:
+            archive.record({CHANNEL["id"]: [Video("T", "Chan", "2026-10-01T00:00:00+00:00", "vid00000001")]})
+            self.assertEqual([v["video_id"] for v in archive.query()], ["vid00000001"])
+            self.assertEqual(archive.channels_for(["vid00000001"]), {"vid00000001": "Chan"})
+        finally:
+            archive.sqlite3.connect = real_connect
+        self.assertEqual(len(opened), 3)
+        for conn in opened:
+            with self.assertRaises(sqlite3.ProgrammingError):
+                conn.execute("SELECT 1")
+
+    def test_failed_write_is_rolled_back(self):
+        with self.assertRaises(RuntimeError):
+            with archive.connect() as conn:
+                conn.execute("INSERT INTO backfills VALUES ('x', 0, 0)")
+                raise RuntimeError
+        self.assertEqual(archive.query(), [])
+        with archive.connect() as conn:
+            self.assertEqual(conn.execute("SELECT COUNT(*) FROM backfills").fetchone(), (0,))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+import json
+import unittest
+from tests.helpers import WorkdirTestCase
+
+import catalog
+
+A = {"name": "A", "id": "UCaaaaaaaaaaaaaaaaaaaaaa"}
+B = {"name": "B", "id": "UCbbbbbbbbbbbbbbbbbbbbbb"}
+C = {"name": "C", "id": "UCcccccccccccccccccccccc"}
+
+# Each step is what the publisher has when they publish again.
+STEPS = [
+    {"coding": [A], "business": []},
+    {"coding": [A, B], "business": [], "science": []},
+    {"coding": [B], "science": []},
+    {"coding": [B], "math": [C]},
+    {"coding": [], "math": [C, A]},
+]
+
+
+def non_empty(categories):
+    return {cat: sorted(ch["id"] for ch in channels) for cat, channels in categories.items() if channels}
+
+
+class PublishSyncTest(WorkdirTestCase):
+    def setUp(self):
+        super().setUp()
+        with open("config.json", "w") as f:
+            json.dump({"local": []}, f)
+        catalog._merged_memo.clear()
+
+    def test_round_trip_across_deltas_with_empty_categories(self):
+        for step, categories in enumerate(STEPS):
+            version = catalog.publish(catalog.CATALOG_FILENAME, categories)
+            self.assertEqual(version, step + 1)
+            if step == 0:
+                catalog.subscribe(catalog.CATALOG_FILENAME)
+            else:
+                catalog.sync()
+            state = catalog.load_catalog_state()
+            self.assertEqual(state["version"], version)
+            self.assertEqual(non_empty(state["categories"]), non_empty(categories))
+
+    def test_late_subscriber_replays_every_delta(self):
+        for categories in STEPS:
+            catalog.publish(catalog.CATALOG_FILENAME, categories)
+        self.assertEqual(catalog.subscribe(catalog.CATALOG_FILENAME), (0, len(STEPS)))
+        self.assertEqual(non_empty(catalog.load_catalog_state()["categories"]), non_empty(STEPS[-1]))
+
+    def test_republishing_the_same_content_adds_no_delta(self):
+        catalog.publish(catalog.CATALOG_FILENAME, STEPS[1])
+        self.assertEqual(catalog.publish(catalog.CATALOG_FILENAME, dict(STEPS[1], empty=[])), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,51 @@
+import json
+import os
+import unittest
+from tests.helpers import FIXTURES_DIR, WorkdirTestCase
+
+from channel_io import parse_opml, read_channel_file, resolve_entries, import_channels
+
+YOUTUBE_EXPORT = os.path.join(FIXTURES_DIR, "youtube_subscriptions.opml")
+
+
+class ParseOpmlTest(unittest.TestCase):
+    def test_youtube_export_wrapper_is_not_a_category(self):
+        entries = read_channel_file(YOUTUBE_EXPORT)
+        self.assertEqual([e["name"] for e in entries], ["Fireship", "3Blue1Brown", "Computerphile"])
+        self.assertEqual({e["category"] for e in entries}, {None})
+
+    def test_nested_folders_become_categories(self):
+        text = (
+            '<opml version="1.1"><body>'
+            '<outline text="coding"><outline text="A" xmlUrl="https://www.youtube.com/feeds/videos.xml?channel_id=UCaaaaaaaaaaaaaaaaaaaaaa"/></outline>'
+            '<outline text="math"><outline text="B" xmlUrl="https://www.youtube.com/feeds/videos.xml?channel_id=UCbbbbbbbbbbbbbbbbbbbbbb"/></outline>'
+            '</body></opml>'
+        )
+        self.assertEqual([(e["name"], e["category"]) for e in parse_opml(text)], [("A", "coding"), ("B", "math")])
+
+
+class ImportChannelsTest(WorkdirTestCase):
+    def setUp(self):
+        super().setUp()
+        with open("config.json", "w") as f:
+            json.dump({"coding": []}, f)
+        self.resolved, failed = resolve_entries(read_channel_file(YOUTUBE_EXPORT))
+        self.assertEqual(failed, [])
+
+    def config(self):
+        with open("config.json") as f:
+            return json.load(f)
+
+    def test_youtube_export_goes_to_default_category(self):
+        added, _ = import_channels(self.resolved)
+        self.assertEqual({cat for cat, _ in added}, {"imported"})
+        self.assertNotIn("youtube_subscriptions", self.config())
+
+    def test_explicit_category_overrides_the_file(self):
+        import_channels([dict(e, category="math") for e in self.resolved], category="coding")
+        self.assertEqual(len(self.config()["coding"]), 3)
+        self.assertNotIn("math", self.config())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,50 @@
+import json
+import os
+import shutil
+import subprocess
+import sys
+import unittest
+from tests.helpers import APP_DIR, WorkdirTestCase
+
+SCRIPT = os.path.join(APP_DIR, "gh-focus.py")
+
+
+def run_app(*args):
+    env = dict(os.environ, GH_FOCUS_OFFLINE="1")
+    return subprocess.run([sys.executable, SCRIPT, *args], capture_output=True, text=True, env=env, timeout=60)
+
+
+class FetchOutputTest(WorkdirTestCase):
+    """stdout of `fetch` must be nothing but the data, even on a first run."""
+
+    def test_json_from_an_empty_directory(self):
+        result = run_app("fetch", "all", "--format", "json")
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(json.loads(result.stdout), [])
+
+    def test_json_on_first_run_with_the_sample_config(self):
+        shutil.copy(os.path.join(APP_DIR, "config.json.sample"), "config.json.sample")
+        result = run_app("fetch", "all", "--format", "json")
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertIsInstance(json.loads(result.stdout), list)
+        self.assertIn("Initialized with sample channels", result.stderr)
+
+    def test_ndjson_lines_are_all_json(self):
+        shutil.copy(os.path.join(APP_DIR, "config.json.sample"), "config.json.sample")
+        result = run_app("fetch", "all")
+        self.assertEqual(result.returncode, 0, result.stderr)
+        for line in result.stdout.splitlines():
+            json.loads(line)
+
+
+class ExportOutputTest(WorkdirTestCase):
+    def test_export_to_stdout_on_first_run(self):
+        shutil.copy(os.path.join(APP_DIR, "config.json.sample"), "config.json.sample")
+        result = run_app("export", "--format", "list")
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertNotIn("Initialized", result.stdout)
+        self.assertTrue(result.stdout.strip())
+
+
+if __name__ == "__main__":
+    unittest.main()
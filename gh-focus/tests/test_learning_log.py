@@ -0,0 +1,95 @@
+import json
+import subprocess
+import unittest
+from unittest import mock
+from tests.helpers import WorkdirTestCase
+
+import learning_log
+
+
+class FakeGist:
+    """In-memory gist standing in for the gh calls learning_log makes."""
+
+    def __init__(self, files):
+        self.files = dict(files)
+        self.fail_views = False
+
+    def view(self, gist_id, filename):
+        if self.fail_views or filename not in self.files:
+            raise subprocess.CalledProcessError(1, ["gh", "gist", "view"])
+        return self.files[filename]
+
+    def names(self, gist_id):
+        return list(self.files)
+
+    def patch(self, gist_id, files):
+        for name, data in files.items():
+            self.files[name] = data["content"]
+
+    def install(self, test):
+        for target, fake in (("_view_file", self.view), ("_gist_files", self.names), ("patch_gist", self.patch)):
+            patcher = mock.patch.object(learning_log, target, fake)
+            patcher.start()
+            test.addCleanup(patcher.stop)
+
+
+def sharded_gist():
+    shards = {
+        "focus_learning_log_2026_09.md": "# September\n\n- [ ] **Old** - [Watch](https://www.youtube.com/watch?v=old00000000)\n",
+        "focus_learning_log_2026_10.md": "# October\n\n- [ ] **New** - [Watch](https://www.youtube.com/watch?v=new00000000)\n",
+    }
+    manifest = {
+        "version": learning_log.MANIFEST_VERSION,
+        "shards": {name: {"hash": learning_log.content_hash(text), "entries": 1} for name, text in shards.items()},
+    }
+    return FakeGist(dict(shards, **{learning_log.MANIFEST_FILENAME: json.dumps(manifest)}))
+
+
+class ManifestTest(WorkdirTestCase):
+    def test_missing_manifest_means_pre_sharding_log(self):
+        FakeGist({learning_log.LOG_FILENAME: learning_log.LOG_HEADER}).install(self)
+        self.assertIsNone(learning_log.fetch_manifest("gist"))
+
+    def test_other_failures_are_raised(self):
+        gist = sharded_gist()
+        gist.install(self)
+        gist.fail_views = True
+        with self.assertRaises(subprocess.CalledProcessError):
+            learning_log.fetch_manifest("gist")
+
+    def test_toggle_keeps_every_shard_in_the_manifest(self):
+        gist = sharded_gist()
+        gist.install(self)
+        log = learning_log.load_log("gist")
+        index = next(i for i, e in enumerate(log.entries) if e["title"] == "New")
+        log.toggle(index)
+        # A failing manifest download must not matter: the loaded one is reused.
+        gist.fail_views = True
+        learning_log.push_shards("gist", log, [log[index]["shard"]], log.manifest)
+        manifest = json.loads(gist.files[learning_log.MANIFEST_FILENAME])
+        self.assertEqual(sorted(manifest["shards"]), ["focus_learning_log_2026_09.md", "focus_learning_log_2026_10.md"])
+        self.assertIn("- [x] **New**", gist.files["focus_learning_log_2026_10.md"])
+
+    def test_set_completed_updates_only_its_shard(self):
+        gist = sharded_gist()
+        gist.install(self)
+        learning_log.set_completed("gist", "https://www.youtube.com/watch?v=old00000000", True)
+        manifest = json.loads(gist.files[learning_log.MANIFEST_FILENAME])
+        self.assertEqual(len(manifest["shards"]), 2)
+        self.assertIn("- [x] **Old**", gist.files["focus_learning_log_2026_09.md"])
+        self.assertIn("- [ ] **New**", gist.files["focus_learning_log_2026_10.md"])
+
+
+class FindTest(unittest.TestCase):
+    def test_find_by_video_id(self):
+        log = learning_log.LearningLog(
+            learning_log.LOG_HEADER
+            + learning_log.format_entry("One", "https://www.youtube.com/watch?v=one00000000")
+            + learning_log.format_entry("Two", "https://www.youtube.com/watch?v=two00000000")
+        )
+        self.assertEqual(log[log.find("two00000000")]["title"], "Two")
+        self.assertIsNone(log.find("missing0000"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+"""Retry and throttle rules of net.get, checked against the fault-injecting stub server."""
+
+import os
+import sys
+import threading
+import time
+import unittest
+import urllib.error
+from unittest import mock
+from tests.helpers import APP_DIR
+
+sys.path.insert(0, os.path.join(APP_DIR, "benchmarks"))
+
+import fetcher
+import net
+from stub_server import StubSettings, start_server
+
+
+class StubServerTestCase(unittest.TestCase):
+    """One stub server per class; knobs and host buckets are reset before each test."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.settings = StubSettings()
+        cls.server, cls.feed_url = start_server(cls.settings)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+
+    def setUp(self):
+        self.settings.__init__()
+        net._buckets.clear()
+        # Keep backoff sleeps short; the rules, not the delays, are under test.
+        patcher = mock.patch.object(net, "BACKOFF_BASE", 0.001)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def url(self, channel_id="UCtest0000000000000000000"):
+        return f"{self.feed_url}?channel_id={channel_id}"
+
+
+class NetRulesTest(StubServerTestCase):
+    def test_404_is_tried_once(self):
+        with self.assertRaises(urllib.error.HTTPError) as caught:
+            net.get(self.feed_url.replace("/feeds/videos.xml", "/missing"))
+        self.assertEqual(caught.exception.code, 404)
+        self.assertEqual(self.settings.requests, 1)
+
+    def test_5xx_is_retried_up_to_max_attempts(self):
+        self.settings.error_rate, self.settings.error_status = 1.0, 503
+        with self.assertRaises(urllib.error.HTTPError) as caught:
+            net.get(self.url())
+        self.assertEqual(caught.exception.code, 503)
+        self.assertEqual(self.settings.requests, net.MAX_ATTEMPTS)
+
+    def test_429_is_retried_up_to_max_attempts(self):
+        self.settings.rate_limit, self.settings.burst, self.settings.retry_after = 0.001, 0, 0
+        self.settings.tokens = 0.0
+        with self.assertRaises(urllib.error.HTTPError) as caught:
+            net.get(self.url())
+        self.assertEqual(caught.exception.code, 429)
+        self.assertEqual(self.settings.requests, net.MAX_ATTEMPTS)
+
+    def test_retry_after_holds_back_the_next_request_to_that_host(self):
+        # The stub refills quickly, so only the client-side pause can delay the second request.
+        self.settings.rate_limit, self.settings.burst, self.settings.retry_after = 20, 2, 1
+        self.settings.tokens = 0.0
+        started = time.monotonic()
+        first = threading.Thread(target=net.get, args=(self.url("UCfirst000000000000000000"),))
+        first.start()
+        bucket = net.bucket_for(self.feed_url)
+        while bucket.paused_until <= time.monotonic():
+            time.sleep(0.01)
+        net.get(self.url("UCsecond00000000000000000"))
+        elapsed = time.monotonic() - started
+        first.join()
+        self.assertGreaterEqual(elapsed, 0.9)
+        self.assertEqual(self.settings.throttled, 1)
+
+
+class FetchFallbackTest(StubServerTestCase):
+    def setUp(self):
+        super().setUp()
+        for name, value in (("FEED_URL", self.feed_url), ("console", fetcher.PlainConsole())):
+            patcher = mock.patch.object(fetcher, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        fetcher.console.quiet = True
+        patcher = mock.patch.object(fetcher, "fetch_videos_yt_dlp", return_value=["fallback"])
+        self.ytdlp = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def channel(self):
+        return {"name": "Test", "id": "UCtest0000000000000000000"}
+
+    def test_429_returns_empty_without_ytdlp(self):
+        self.settings.rate_limit, self.settings.burst, self.settings.retry_after = 0.001, 0, 0
+        self.settings.tokens = 0.0
+        self.assertEqual(fetcher.fetch_single_channel(self.channel()), [])
+        self.ytdlp.assert_not_called()
+
+    def test_other_errors_fall_back_to_ytdlp(self):
+        self.settings.error_rate, self.settings.error_status = 1.0, 500
+        self.assertEqual(fetcher.fetch_single_channel(self.channel()), ["fallback"])
+        self.ytdlp.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
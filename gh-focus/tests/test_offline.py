@@ -0,0 +1,46 @@
+import io
+import threading
+import unittest
+from unittest import mock
+from tests.helpers import WorkdirTestCase
+
+import offline
+
+
+class FlushTest(WorkdirTestCase):
+    def test_concurrent_flushes_replay_each_write_once(self):
+        for i in range(30):
+            offline.queue_write("log", {"title": f"Video {i}", "url": f"u{i}"})
+        replayed = []
+
+        def save(payload):
+            replayed.append(payload["url"])
+            return True
+
+        threads = [threading.Thread(target=offline.flush, args=({"log": save},)) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(sorted(replayed), sorted(f"u{i}" for i in range(30)))
+        self.assertEqual(offline.pending(), [])
+
+    def test_failed_write_stays_first_in_the_queue(self):
+        offline.queue_write("log", {"url": "u0"})
+        offline.queue_write("complete", {"url": "u0", "completed": True})
+        self.assertEqual(offline.flush({"log": lambda payload: False}), 0)
+        self.assertEqual([item["kind"] for item in offline.pending()], ["log", "complete"])
+
+    def test_unknown_kind_is_dropped_and_the_rest_replayed(self):
+        offline.queue_write("mystery", {"url": "u0"})
+        offline.queue_write("log", {"url": "u1"})
+        replayed = []
+        with mock.patch("sys.stderr", new_callable=io.StringIO) as stderr:
+            done = offline.flush({"log": lambda payload: replayed.append(payload["url"]) or True})
+        self.assertEqual((done, replayed), (1, ["u1"]))
+        self.assertEqual(offline.pending(), [])
+        self.assertIn("mystery", stderr.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,42 @@
+import json
+import unittest
+from tests.helpers import WorkdirTestCase
+
+import ranking
+from focus_manager import HISTORY_FILE
+from videos import Video
+
+PUBLISHED = "2026-01-01T00:00:00+00:00"
+
+
+class CategoryAffinityTest(WorkdirTestCase):
+    def setUp(self):
+        super().setUp()
+        ranking._model.update(key=None, affinity={}, completion={}, category={})
+        ranking._scores.update(key=None, values={})
+
+    def write_history(self, watches):
+        history = [
+            {"title": "t", "channel": channel, "video_id": f"{channel}{i}", "category": category, "timestamp": PUBLISHED}
+            for i, (channel, category) in enumerate(watches)
+        ]
+        with open(HISTORY_FILE, "w") as f:
+            json.dump(history, f)
+
+    def test_channel_central_to_the_category_ranks_first(self):
+        # Both channels are watched equally overall, but only "core" is watched for coding.
+        self.write_history([("core", "coding")] * 3 + [("side", "business")] * 3)
+        videos = [Video("Side video", "side", PUBLISHED, "side1"), Video("Core video", "core", PUBLISHED, "core1")]
+        self.assertEqual([v.channel for v in ranking.rank_videos(videos, "coding")], ["core", "side"])
+        self.assertEqual([v.channel for v in ranking.rank_videos(videos, "business")], ["side", "core"])
+
+
+    def test_learning_log_placeholder_watches_are_ignored(self):
+        self.write_history([("Learning Log", "learning_log")] * 5 + [("core", "coding")])
+        model = ranking._build_model()
+        self.assertNotIn("Learning Log", model["affinity"])
+        self.assertEqual(model["category"], {("coding", "core"): 1.0})
+
+
+if __name__ == "__main__":
+    unittest.main()
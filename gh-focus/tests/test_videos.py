@@ -0,0 +1,19 @@
+import unittest
+from tests.helpers import WorkdirTestCase
+
+from videos import Video, VideoIndex
+
+
+class SearchIndexTest(WorkdirTestCase):
+    def test_search_index_is_built_once_per_menu(self):
+        index = VideoIndex([
+            Video("Rust ownership explained", "Chan", "2026-10-01T00:00:00+00:00", "aaaaaaaaaaa"),
+            Video("Python packaging", "Chan", "2026-10-02T00:00:00+00:00", "bbbbbbbbbbb"),
+        ])
+        search = index.search_index()
+        self.assertIs(index.search_index(), search)
+        self.assertEqual(search.search("packag"), [1])
+
+
+if __name__ == "__main__":
+    unittest.main()
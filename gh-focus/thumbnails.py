@@ -0,0 +1,272 @@
+"""
+Video thumbnails: a size-capped, content-addressed disk cache filled in the
+background during fetches, and inline rendering for terminals that speak
+the kitty, iTerm2 or sixel image protocols.
+
+Pillow is optional. Without it iTerm2-style terminals still get the original
+JPEG (the terminal scales it); kitty and sixel need Pillow to convert.
+"""
+
+import base64
+import hashlib
+import http.client
+import io
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from focus_manager import write_json_atomic
+import net
+
+# Thumbnail location; overridable so benchmarks can point at a local stand-in.
+# mqdefault is 320x180 without the letterboxing of the feed's hqdefault.
+THUMBNAIL_URL = os.environ.get("GH_FOCUS_THUMBNAIL_URL", "https://i.ytimg.com/vi/{video_id}/mqdefault.jpg")
+
+THUMBNAIL_DIR = "thumbnail_cache"
+THUMBNAIL_INDEX = os.path.join(THUMBNAIL_DIR, "index.json")
+THUMBNAIL_INDEX_VERSION = 1
+
+# Least recently shown images are evicted beyond this many bytes.
+THUMBNAIL_CACHE_LIMIT = 64 * 1024 * 1024
+
+# Parallel thumbnail downloads during a background prefetch.
+DOWNLOAD_WORKERS = 8
+
+# Preview size: terminal columns, and pixel width of the cached variant.
+PREVIEW_COLUMNS = 40
+PREVIEW_WIDTH = 320
+
+# Process-level copy of the index; guarded because prefetch runs on a thread.
+_index = {"data": None}
+_lock = threading.Lock()
+
+def detect_protocol():
+    """'kitty', 'iterm', 'sixel' or None. GH_FOCUS_IMAGES=kitty|iterm|sixel|off overrides."""
+    forced = os.environ.get("GH_FOCUS_IMAGES")
+    if forced:
+        return None if forced == "off" else forced
+    if not sys.stdout.isatty():
+        return None
+    term = os.environ.get("TERM", "")
+    program = os.environ.get("TERM_PROGRAM", "")
+    if os.environ.get("KITTY_WINDOW_ID") or "kitty" in term or "ghostty" in term or program == "ghostty":
+        return "kitty"
+    if program in ("iTerm.app", "WezTerm"):
+        return "iterm"
+    if term.startswith(("foot", "mlterm", "contour")) or "sixel" in term:
+        return "sixel"
+    return None
+
+def _load_index():
+    if _index["data"] is None:
+        data = {}
+        if os.path.exists(THUMBNAIL_INDEX):
+            with open(THUMBNAIL_INDEX, "r", encoding="utf-8") as f:
+                try:
+                    data = json.load(f)
+                except json.JSONDecodeError:
+                    data = {}
+        if data.get("version") != THUMBNAIL_INDEX_VERSION:
+            data = {"version": THUMBNAIL_INDEX_VERSION, "videos": {}, "objects": {}}
+        _index["data"] = data
+    return _index["data"]
+
+def _save_index():
+    os.makedirs(THUMBNAIL_DIR, exist_ok=True)
+    write_json_atomic(THUMBNAIL_INDEX, _index["data"])
+
+def _object_path(digest, variant="jpg"):
+    return os.path.join(THUMBNAIL_DIR, digest[:2], f"{digest}.{variant}")
+
+def _write_object(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.tmp{threading.get_ident()}"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+def _store(video_id, data):
+    """Add downloaded bytes; identical images (e.g. placeholders) are stored once."""
+    digest = hashlib.sha256(data).hexdigest()
+    path = _object_path(digest)
+    with _lock:
+        index = _load_index()
+        known = digest in index["objects"]
+    if not known:
+        _write_object(path, data)
+    with _lock:
+        index["videos"][video_id] = digest
+        index["objects"].setdefault(digest, {"size": len(data), "used": time.time(), "variants": {}})
+    return digest
+
+def _evict():
+    """Drop least recently used images (and their variants) until under the cap."""
+    index = _load_index()
+    objects = index["objects"]
+    total = sum(o["size"] + sum(o["variants"].values()) for o in objects.values())
+    if total <= THUMBNAIL_CACHE_LIMIT:
+        return
+    gone = set()
+    for digest in sorted(objects, key=lambda d: objects[d]["used"]):
+        if total <= THUMBNAIL_CACHE_LIMIT:
+            break
+        entry = objects.pop(digest)
+        total -= entry["size"] + sum(entry["variants"].values())
+        for variant in ["jpg", *entry["variants"]]:
+            try:
+                os.remove(_object_path(digest, variant))
+            except FileNotFoundError:
+                pass
+        gone.add(digest)
+    index["videos"] = {vid: d for vid, d in index["videos"].items() if d not in gone}
+
+def _download(video_id, timeout=10):
+    return net.get(THUMBNAIL_URL.format(video_id=video_id), timeout=timeout, attempts=2)
+
+def fetch_missing(video_ids, protocol=None):
+    """Download thumbnails not in the cache yet (and their preview variants). Returns the count added."""
+    with _lock:
+        known = _load_index()["videos"]
+        missing = [vid for vid in dict.fromkeys(video_ids) if vid not in known]
+    if not missing:
+        return 0
+
+    def fetch(video_id):
+        try:
+            digest = _store(video_id, _download(video_id))
+        except (OSError, http.client.HTTPException, ValueError):
+            # Dropped connections, truncated bodies or a bad URL: skip this one quietly.
+            return False
+        if protocol in ("kitty", "sixel"):
+            try:
+                _variant(digest, protocol)
+            except (ImportError, OSError, ValueError):
+                pass
+        return True
+
+    with ThreadPoolExecutor(max_workers=min(DOWNLOAD_WORKERS, len(missing))) as pool:
+        added = sum(pool.map(fetch, missing))
+    with _lock:
+        _evict()
+        _save_index()
+    return added
+
+def prefetch(videos):
+    """Start downloading thumbnails for `videos` in the background (no-op without image support)."""
+    protocol = detect_protocol()
+    if not protocol or not videos:
+        return None
+    thread = threading.Thread(target=fetch_missing, args=([v.video_id for v in videos], protocol), daemon=True)
+    thread.start()
+    return thread
+
+def _variant(digest, protocol):
+    """Preview bytes for `protocol`, downscaled once and cached next to the original."""
+    name = f"{PREVIEW_WIDTH}.{'png' if protocol == 'kitty' else 'six'}"
+    path = _object_path(digest, name)
+    if os.path.exists(path):
+        with open(path, "rb") as f:
+            return f.read()
+
+    from PIL import Image
+
+    with Image.open(_object_path(digest)) as image:
+        image = image.convert("RGB")
+        if image.width > PREVIEW_WIDTH:
+            image = image.resize((PREVIEW_WIDTH, round(image.height * PREVIEW_WIDTH / image.width)))
+        if protocol == "kitty":
+            out = io.BytesIO()
+            image.save(out, format="PNG", optimize=True)
+            data = out.getvalue()
+        else:
+            data = encode_sixel(image)
+
+    _write_object(path, data)
+    with _lock:
+        entry = _load_index()["objects"].get(digest)
+        if entry is not None:
+            entry["variants"][name] = len(data)
+    return data
+
+def encode_sixel(image, colors=64):
+    """Encode an RGB Pillow image as a sixel escape sequence."""
+    quantized = image.quantize(colors=colors)
+    width, height = quantized.size
+    palette = quantized.getpalette()[:colors * 3]
+    pixels = quantized.load()
+
+    out = [f'\x1bPq"1;1;{width};{height}']
+    for i in range(len(palette) // 3):
+        r, g, b = palette[i * 3:i * 3 + 3]
+        out.append(f"#{i};2;{r * 100 // 255};{g * 100 // 255};{b * 100 // 255}")
+
+    for top in range(0, height, 6):
+        band = range(top, min(top + 6, height))
+        rows = {}
+        for x in range(width):
+            for bit, y in enumerate(band):
+                color = pixels[x, y]
+                rows.setdefault(color, [0] * width)[x] |= 1 << bit
+        for color, bits in rows.items():
+            out.append(f"#{color}")
+            run_char, run_length = None, 0
+            for value in bits:
+                char = chr(63 + value)
+                if char == run_char:
+                    run_length += 1
+                    continue
+                if run_char:
+                    out.append(f"!{run_length}{run_char}" if run_length > 3 else run_char * run_length)
+                run_char, run_length = char, 1
+            out.append(f"!{run_length}{run_char}" if run_length > 3 else run_char * run_length)
+            out.append("$")
+        out.append("-")
+    out.append("\x1b\\")
+    return "".join(out).encode("ascii")
+
+def _kitty_sequence(png, columns):
+    payload = base64.standard_b64encode(png).decode("ascii")
+    chunks = [payload[i:i + 4096] for i in range(0, len(payload), 4096)]
+    parts = []
+    for i, chunk in enumerate(chunks):
+        more = 1 if i < len(chunks) - 1 else 0
+        header = f"a=T,f=100,c={columns},m={more}" if i == 0 else f"m={more}"
+        parts.append(f"\x1b_G{header};{chunk}\x1b\\")
+    return "".join(parts)
+
+def _iterm_sequence(data, columns):
+    payload = base64.standard_b64encode(data).decode("ascii")
+    return f"\x1b]1337;File=inline=1;size={len(data)};width={columns};preserveAspectRatio=1:{payload}\a"
+
+def show(video_id, columns=PREVIEW_COLUMNS):
+    """Draw a cached thumbnail inline. Returns False if there's nothing to show."""
+    protocol = detect_protocol()
+    if not protocol:
+        return False
+    with _lock:
+        index = _load_index()
+        digest = index["videos"].get(video_id)
+    if not digest or not os.path.exists(_object_path(digest)):
+        return False
+
+    try:
+        if protocol == "iterm":
+            with open(_object_path(digest), "rb") as f:
+                sequence = _iterm_sequence(f.read(), columns)
+        elif protocol == "kitty":
+            sequence = _kitty_sequence(_variant(digest, "kitty"), columns)
+        else:
+            sequence = _variant(digest, "sixel").decode("ascii")
+    except (ImportError, OSError, ValueError):
+        return False
+
+    sys.stdout.write(sequence + "\n")
+    sys.stdout.flush()
+    with _lock:
+        entry = index["objects"].get(digest)
+        if entry is not None:
+            entry["used"] = time.time()
+        _save_index()
+    return True
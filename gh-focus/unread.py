@@ -0,0 +1,115 @@
+import json
+import os
+import threading
+import time
+from archive import parse_published
+from catalog import load_merged_config
+from focus_manager import write_json_atomic
+
+# Seen/watched video IDs, per-category "last seen" watermarks and unread sets.
+SEEN_STATE_FILE = "seen_state.json"
+
+# Oldest seen IDs are forgotten beyond this many.
+SEEN_LIMIT = 20000
+
+# Process-level copy of the state plus the file stamp it was read at.
+# `serve` updates it from its fetch thread while request threads read it,
+# so every public function holds the lock while it touches the state.
+_state = {"stamp": None, "data": None}
+_lock = threading.Lock()
+
+def _stamp():
+    try:
+        st = os.stat(SEEN_STATE_FILE)
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+def _load():
+    stamp = _stamp()
+    if stamp != _state["stamp"] or _state["data"] is None:
+        raw = {}
+        if stamp is not None:
+            with open(SEEN_STATE_FILE, "r", encoding="utf-8") as f:
+                try:
+                    raw = json.load(f)
+                except json.JSONDecodeError:
+                    raw = {}
+        # Dicts keep insertion order, so the oldest seen IDs are trimmed first.
+        _state.update(stamp=stamp, data={
+            "seen": dict.fromkeys(raw.get("seen", [])),
+            "watched": set(raw.get("watched", [])),
+            "watermarks": raw.get("watermarks", {}),
+            "unread": {cat: dict.fromkeys(ids) for cat, ids in raw.get("unread", {}).items()}
+        })
+    return _state["data"]
+
+def _save(data):
+    seen = list(data["seen"])[-SEEN_LIMIT:]
+    data["seen"] = dict.fromkeys(seen)
+    write_json_atomic(SEEN_STATE_FILE, {
+        "seen": seen,
+        "watched": sorted(data["watched"]),
+        "watermarks": data["watermarks"],
+        "unread": {cat: list(ids) for cat, ids in data["unread"].items() if ids}
+    })
+    _state["stamp"] = _stamp()
+
+def unread_counts():
+    """{category: number of new videos} straight from the saved state."""
+    with _lock:
+        return {cat: len(ids) for cat, ids in _load()["unread"].items() if ids}
+
+def record_fetch(by_channel):
+    """
+    Fold freshly fetched videos into every category that holds their channel.
+    A video is new for a category if it hasn't been seen or watched and was
+    published after the category's last visit.
+    """
+    if not by_channel:
+        return
+    categories_by_channel = {}
+    for cat, channels in load_merged_config().items():
+        if isinstance(channels, list):
+            for ch in channels:
+                categories_by_channel.setdefault(ch["id"], []).append(cat)
+
+    with _lock:
+        data = _load()
+        changed = False
+        for channel_id, videos in by_channel.items():
+            for cat in categories_by_channel.get(channel_id, []):
+                watermark = data["watermarks"].get(cat)
+                unread = data["unread"].setdefault(cat, {})
+                for v in videos:
+                    if v.video_id in data["seen"] or v.video_id in data["watched"] or v.video_id in unread:
+                        continue
+                    published = parse_published(v.published)
+                    if watermark and published and published <= watermark:
+                        continue
+                    unread[v.video_id] = None
+                    changed = True
+        if changed:
+            _save(data)
+
+def mark_seen(category, video_ids):
+    """The user opened `category`: its videos are seen and its watermark moves to now."""
+    with _lock:
+        data = _load()
+        for video_id in video_ids:
+            data["seen"][video_id] = None
+            for unread in data["unread"].values():
+                unread.pop(video_id, None)
+        data["unread"].pop(category, None)
+        data["watermarks"][category] = time.time()
+        _save(data)
+
+def mark_watched(video_id):
+    """A watched video is no longer new anywhere."""
+    with _lock:
+        data = _load()
+        data["watched"].add(video_id)
+        data["seen"][video_id] = None
+        for unread in data["unread"].values():
+            unread.pop(video_id, None)
+        _save(data)
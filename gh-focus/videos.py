@@ -0,0 +1,79 @@
+import sys
+
+WATCH_URL = "https://www.youtube.com/watch?v="
+
+class Video:
+    """
+    One fetched video.
+    Slotted and with the channel name interned, so large libraries stay small.
+    """
+    __slots__ = ("title", "channel", "published", "video_id")
+
+    def __init__(self, title, channel, published, video_id):
+        self.title = title
+        self.channel = sys.intern(channel)
+        self.published = published
+        self.video_id = video_id
+
+    @property
+    def link(self):
+        return f"{WATCH_URL}{self.video_id}"
+
+    def to_dict(self):
+        """Plain dict view (history, JSON output)."""
+        return {
+            "title": self.title,
+            "link": self.link,
+            "channel": self.channel,
+            "published": self.published,
+            "video_id": self.video_id
+        }
+
+    def __repr__(self):
+        return f"Video({self.video_id!r}, {self.channel!r}, {self.title!r})"
+
+def is_short(video):
+    """Shorts are filtered out of every menu."""
+    title = video.title.lower()
+    return "#shorts" in title or "short" in title
+
+class VideoIndex:
+    """
+    Menu rows for one fetch.
+    `rows` holds offsets into `videos`, so menus never copy the records.
+    Labels and the search index are built on first use and kept by the
+    index, not the records, so they live only as long as the menu does.
+    """
+    __slots__ = ("videos", "rows", "_labels", "_search_index")
+
+    def __init__(self, videos):
+        self.videos = videos
+        self.rows = [i for i, v in enumerate(videos) if not is_short(v)]
+        self._labels = None
+        self._search_index = None
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __getitem__(self, offset):
+        return self.videos[offset]
+
+    def same_videos(self, videos):
+        """True if `videos` are the very records this index was built on."""
+        return len(videos) == len(self.videos) and all(a is b for a, b in zip(videos, self.videos))
+
+    def labels(self):
+        """[(offset, display label)] for every visible row."""
+        if self._labels is None:
+            self._labels = [
+                (offset, f"[{self.videos[offset].channel}] {self.videos[offset].title[:50]}")
+                for offset in self.rows
+            ]
+        return self._labels
+
+    def search_index(self):
+        """FuzzyIndex over labels(), built on the first search and reused after."""
+        if self._search_index is None:
+            from fuzzy import FuzzyIndex
+            self._search_index = FuzzyIndex(self.labels())
+        return self._search_index